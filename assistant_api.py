@@ -1,3 +1,6 @@
+import importlib.util
+from pathlib import Path
+
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import Optional
@@ -6,13 +9,26 @@ from fastapi.responses import StreamingResponse
 
 from assistant_core import ChatInitializationError, build as core_build, chat as core_chat, decode
 
+
+def _load_fastjson():
+    """The FAST_JSON route layer shared with the resonance service (cynthia-resonance/fastjson.py)."""
+    path = Path(__file__).resolve().parent / "cynthia-resonance" / "fastjson.py"
+    spec = importlib.util.spec_from_file_location("fastjson", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+fastjson = _load_fastjson()
 app = FastAPI(title="Synthia Assistant")
+fastjson.install(app)
 
 
 class BuildRequest(BaseModel):
     """Parameters for invoking the builder engine."""
     uploads: str = "uploads"
     output: str = "generated_app"
+    full: bool = False  # rebuild everything instead of only changed uploads
 
 
 class OracleRequest(BaseModel):
@@ -30,7 +46,7 @@ class ChatRequest(BaseModel):
 @app.post("/build")
 def build(req: BuildRequest):
     """Run the builder engine on the provided directories."""
-    return core_build(req.uploads, req.output)
+    return core_build(req.uploads, req.output, req.full)
 
 
 @app.post("/oracle")
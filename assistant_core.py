@@ -74,9 +74,9 @@ def decode(text: str, gate_line: str | None = None) -> dict:
     return result
 
 
-def build(uploads: str = "uploads", output: str = "generated_app"):
-    """Run the builder engine and return its summary."""
-    return run_builder(uploads, output)
+def build(uploads: str = "uploads", output: str = "generated_app", full: bool = False):
+    """Run the builder engine (incremental unless ``full``) and return its summary."""
+    return run_builder(uploads, output, incremental=not full)
 
 
 def chat(prompt: str, max_tokens: int = 128) -> str:
@@ -0,0 +1,78 @@
+# Builder throughput on a synthetic uploads tree: serial vs parallel, cold vs incremental
+#
+#   python bench/builder_bench.py [--files 3000] [--workers 1 2 4] [--keep DIR]
+#
+# Generates --files uploads (chart and store specs, plus some .py/.html/.md),
+# then for each worker count runs a cold full build into a fresh output dir and
+# reports seconds and files/sec. Also times a no-op incremental rebuild and a
+# rebuild after editing one upload, and checks that every worker count
+# produced byte-identical layout.json. Prints one JSON object.
+import argparse, hashlib, json, os, random, shutil, sys, tempfile, time
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+def make_uploads(path: str, n: int, seed: int = 3):
+    rnd = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    for i in range(n):
+        kind = i % 10
+        if kind < 5:
+            body = f"Module: Chart{i}\n" + "".join(f"- Metric {j} at {rnd.random():.3f}\n" for j in range(rnd.randint(4, 24)))
+            name = f"chart_{i:05d}.txt"
+        elif kind < 8:
+            body = f"Module: Store{i}\n" + "".join(f"user{j} assigns Bot{j} with {rnd.randint(1, 500)} credits\n"
+                                                 for j in range(rnd.randint(3, 16)))
+            name = f"store_{i:05d}.txt"
+        elif kind == 8:
+            body, name = f"def f{i}():\n    return {i}\n" * 20, f"script_{i:05d}.py"
+        else:
+            body, name = f"<section id='s{i}'><p>{'lorem ipsum ' * 40}</p></section>\n", f"page_{i:05d}.html"
+        with open(os.path.join(path, name), "w", encoding="utf-8") as f:
+            f.write(body)
+
+def _timed(fn):
+    t = time.perf_counter()
+    out = fn()
+    return round(time.perf_counter() - t, 4), out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=3000)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--keep", help="build in this directory instead of a temp dir (left in place)")
+    a = ap.parse_args()
+
+    base = a.keep or tempfile.mkdtemp(prefix="builder-bench-")
+    cwd = os.getcwd()
+    os.chdir(base)                       # builder logs and .build_cache stay inside the bench dir
+    try:
+        from builder_engine import run_builder
+        make_uploads("uploads", a.files)
+        result = {"files": a.files, "cpus": os.cpu_count(), "cold": {}}
+        digests = set()
+        for w in a.workers:
+            out = f"out_w{w}"
+            shutil.rmtree(out, ignore_errors=True)
+            secs, summary = _timed(lambda: run_builder("uploads", out, incremental=False, workers=w))
+            result["cold"][w] = {"seconds": secs, "uploads_per_s": round(a.files / secs, 1),
+                                 "outputs": len(summary["files_written"])}
+            with open(os.path.join(out, "layout.json"), "rb") as f:
+                digests.add(hashlib.sha256(f.read()).hexdigest())
+        w = max(a.workers)
+        out = f"out_w{w}"
+        result["noop_incremental_s"], _ = _timed(lambda: run_builder("uploads", out, workers=w))
+        with open(os.path.join("uploads", "chart_00000.txt"), "a", encoding="utf-8") as f:
+            f.write("- Edited at 0.5\n")
+        result["one_edit_incremental_s"], s = _timed(lambda: run_builder("uploads", out, workers=w))
+        result["one_edit_changed"] = s["changed"]
+        base_cold = result["cold"][a.workers[0]]["seconds"]
+        result["speedup_vs_first"] = {k: round(base_cold / v["seconds"], 2) for k, v in result["cold"].items()}
+        result["identical_layout"] = len(digests) == 1
+        print(json.dumps(result, indent=2))
+    finally:
+        os.chdir(cwd)
+        if not a.keep:
+            shutil.rmtree(base, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
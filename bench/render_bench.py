@@ -0,0 +1,88 @@
+# Time-to-render for chart/store specs: per-build Environment vs the shared one
+#
+#   python bench/render_bench.py [--specs 5000] [--batch 1] [--repeat 3]
+#
+# Renders --specs synthetic text specs (half charts, half stores) through
+# layout_organizer.generate_layout, --batch specs per call (the builder lays out
+# one upload per call), three ways:
+#   fresh    a new Environment per call, as the builder used to build one for
+#            every run (templates parsed + compiled each time)
+#   shared   the long-lived layout_organizer environment (parsed once)
+# and checks both produce identical layouts. Then times a cold process (import
+# + first render) with an empty and with a warm bytecode cache. Prints one JSON
+# object.
+import argparse, json, os, random, shutil, subprocess, sys, tempfile, time
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+def make_specs(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    specs = []
+    for i in range(n):
+        if i % 2:
+            specs.append({"type": "text", "module": f"Chart{i}", "intents": [],
+                          "pairs": [(f"Metric {j}", round(rnd.random(), 3)) for j in range(rnd.randint(4, 24))]})
+        else:
+            specs.append({"type": "text", "module": f"Store{i}", "pairs": [],
+                          "intents": [{"user": f"user{j}", "bot": f"Bot{j}", "credits": rnd.randint(1, 500)}
+                                      for j in range(rnd.randint(3, 16))]})
+    return specs
+
+def _render_all(lo, specs, batch, fresh: bool):
+    out, shared = [], lo.env
+    for i in range(0, len(specs), batch):
+        if fresh:
+            lo.env = lo.Environment(loader=lo.FileSystemLoader(shared.loader.searchpath))
+        out.append(lo.generate_layout(specs[i:i + batch]))
+    lo.env = shared
+    return out
+
+_COLD = """
+import sys, time
+t = time.perf_counter()
+sys.path.insert(0, {root!r})
+import layout_organizer as lo
+lo.generate_layout({specs!r})
+print(time.perf_counter() - t)
+"""
+
+def cold_process(specs, cache_dir: str) -> float:
+    code = _COLD.format(root=os.path.abspath(ROOT), specs=specs)
+    env = {**os.environ, "JINJA_CACHE_DIR": cache_dir}
+    return float(subprocess.run([sys.executable, "-c", code], env=env, capture_output=True,
+                                text=True, check=True).stdout.strip().splitlines()[-1])
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--specs", type=int, default=5000)
+    ap.add_argument("--batch", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=3)
+    a = ap.parse_args()
+
+    import layout_organizer as lo
+    specs = make_specs(a.specs)
+    result = {"specs": a.specs, "batch": a.batch}
+    layouts = {}
+    for mode in ("fresh", "shared"):
+        best = float("inf")
+        for _ in range(a.repeat):
+            t = time.perf_counter()
+            layouts[mode] = _render_all(lo, specs, a.batch, fresh=(mode == "fresh"))
+            best = min(best, time.perf_counter() - t)
+        result[mode] = {"seconds": round(best, 4), "specs_per_s": round(a.specs / best)}
+    result["identical"] = layouts["fresh"] == layouts["shared"]
+    result["speedup"] = round(result["fresh"]["seconds"] / result["shared"]["seconds"], 1)
+
+    tmp = tempfile.mkdtemp(prefix="jinja_bcc_")
+    try:
+        sample = make_specs(2)
+        result["cold_process_s"] = {"empty_cache": round(cold_process(sample, tmp), 4),
+                                    "warm_cache": round(min(cold_process(sample, tmp) for _ in range(a.repeat)), 4)}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    print(json.dumps(result, indent=2))
+    if not result["identical"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# build_watcher.py
+import os
+import time
+import json
+import queue
+import select
+import struct
+import logging
+import threading
+import ctypes
+import ctypes.util
+
+try:
+    from builder_engine import run_builder, SUPPORTED_EXTS
+except ModuleNotFoundError:  # fallback to package-style layout
+    from parser.builder_engine import run_builder, SUPPORTED_EXTS
+
+# ── change sources ─────────────────────────────────────────────
+# Both watchers expose wait(timeout) -> set of upload names that changed (empty
+# on timeout; RESCAN when the kernel dropped events and everything must be
+# looked at again) and close(). uploads/ is flat (the builder doesn't recurse),
+# so one non-recursive watch is enough.
+RESCAN = "*"
+POLL_INTERVAL = float(os.getenv("BUILDER_POLL_INTERVAL", "1.0"))
+
+def _relevant(name: str) -> bool:
+    """Uploads the builder would pick up; editor temp/swap files are ignored."""
+    return not name.startswith(".") and os.path.splitext(name)[1].lower() in SUPPORTED_EXTS
+
+class InotifyWatcher:
+    """Linux inotify through ctypes (no extra dependency)."""
+
+    IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+    IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x40, 0x80, 0x100, 0x200
+    IN_DELETE_SELF, IN_MOVE_SELF, IN_Q_OVERFLOW = 0x400, 0x800, 0x4000
+    IN_NONBLOCK, IN_CLOEXEC = 0o4000, 0o2000000
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+            | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+    _EVENT = struct.Struct("iIII")   # wd, mask, cookie, len (+ NUL-padded name)
+
+    def __init__(self, path: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed for {path}")
+
+    def wait(self, timeout: float) -> set:
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        names, off = set(), 0
+        while off < len(buf):
+            _, mask, _, length = self._EVENT.unpack_from(buf, off)
+            off += self._EVENT.size
+            name = os.fsdecode(buf[off:off + length].rstrip(b"\0"))
+            off += length
+            if mask & (self.IN_Q_OVERFLOW | self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                names.add(RESCAN)
+            elif name and _relevant(name):
+                names.add(name)
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+class PollWatcher:
+    """Portable fallback: compares (size, mtime_ns) snapshots every `interval` seconds."""
+
+    def __init__(self, path: str, interval: float = POLL_INTERVAL):
+        self.path, self.interval = path, interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> dict:
+        snap = {}
+        try:
+            with os.scandir(self.path) as it:
+                for e in it:
+                    if _relevant(e.name) and e.is_file():
+                        st = e.stat()
+                        snap[e.name] = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        return snap
+
+    def wait(self, timeout: float) -> set:
+        deadline = time.monotonic() + timeout
+        while True:
+            time.sleep(max(0.0, min(self.interval, deadline - time.monotonic())))
+            snap = self._scan()
+            changed = {n for n in snap.keys() | self.snapshot.keys() if snap.get(n) != self.snapshot.get(n)}
+            self.snapshot = snap
+            if changed or time.monotonic() >= deadline:
+                return changed
+
+    def close(self):
+        pass
+
+def make_watcher(path: str, poll: bool = False):
+    """inotify where available, polling otherwise (or when `poll`)."""
+    if not poll:
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError) as e:   # non-Linux libc has no inotify_* symbols
+            logging.info("inotify unavailable (%s), polling %s every %.1fs", e, path, POLL_INTERVAL)
+    return PollWatcher(path)
+
+# ── build events ───────────────────────────────────────────────
+class BuildEvents:
+    """
+    Fan-out of build notifications to any number of listeners (SSE clients).
+    Each subscriber gets its own bounded queue; a slow one loses its oldest
+    events rather than holding anyone up.
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self._lock = threading.Lock()
+        self._subs = set()
+        self._maxsize = maxsize
+        self.seq = 0
+        self.last = None
+
+    def subscribe(self) -> queue.Queue:
+        q = queue.Queue(self._maxsize)
+        with self._lock:
+            self._subs.add(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            self._subs.discard(q)
+
+    def publish(self, event: dict) -> dict:
+        with self._lock:
+            self.seq += 1
+            event = {"seq": self.seq, "time": time.time(), **event}
+            self.last = event
+            subs = list(self._subs)
+        for q in subs:
+            while True:
+                try:
+                    q.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        q.get_nowait()
+                    except queue.Empty:
+                        pass
+        return event
+
+events = BuildEvents()
+
+def build_event(summary: dict, paths=()) -> dict:
+    """Event payload for a finished build (what the preview needs to refresh)."""
+    if "error" in summary:
+        return {"type": "build", "paths": sorted(paths), "error": summary["error"], "changed": []}
+    return {"type": "build", "paths": sorted(paths), "changed": summary.get("changed", []),
+            "inputs_rebuilt": summary.get("inputs_rebuilt", 0)}
+
+def format_sse(event: dict) -> str:
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+# ── watch loop ─────────────────────────────────────────────────
+DEBOUNCE = float(os.getenv("BUILDER_DEBOUNCE", "0.3"))   # quiet time before a build starts
+MAX_DELAY = 3.0                                          # ...but never hold a build back longer than this
+
+def watch(upload_dir: str = "uploads", generated_dir: str = "generated_app", debounce: float = DEBOUNCE,
+          poll: bool = False, stop: threading.Event = None, on_build=None, bus: BuildEvents = events):
+    """
+    Rebuild (incrementally) whenever uploads change, until `stop` is set.
+    A burst of changes is coalesced: the build starts once `debounce` seconds
+    pass without a new event, or `MAX_DELAY` after the first one. Every build is
+    published on `bus` and passed to `on_build(summary, paths)`.
+    """
+    stop = stop or threading.Event()
+    os.makedirs(upload_dir, exist_ok=True)
+    watcher = make_watcher(upload_dir, poll)
+    logging.info("Watching %s (%s)", os.path.abspath(upload_dir), type(watcher).__name__)
+    try:
+        # catch up on anything that changed while nobody was watching
+        pending = {RESCAN}
+        while not stop.is_set():
+            if not pending:
+                pending = watcher.wait(1.0)
+                continue
+            first = time.monotonic()
+            while time.monotonic() - first < MAX_DELAY and not stop.is_set():
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                pending |= more
+            summary = run_builder(upload_dir, generated_dir)
+            paths = pending - {RESCAN}
+            pending = set()
+            bus.publish(build_event(summary, paths))
+            if on_build:
+                on_build(summary, paths)
+    finally:
+        watcher.close()
+
+def start_watch(upload_dir: str = "uploads", generated_dir: str = "generated_app", **kwargs):
+    """Run `watch` on a daemon thread → (thread, stop event)."""
+    stop = threading.Event()
+    thread = threading.Thread(target=watch, args=(upload_dir, generated_dir), kwargs={"stop": stop, **kwargs},
+                              name="build-watcher", daemon=True)
+    thread.start()
+    return thread, stop
+
+if __name__ == "__main__":
+    import sys
+    try:
+        watch(poll="--poll" in sys.argv[1:])
+    except KeyboardInterrupt:
+        pass
@@ -2,21 +2,28 @@
 import os
 import logging
 import json
+import hashlib
+import inspect
+import zlib
+import tempfile
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
-# ── resilient imports: root or parser/ ─────────────────────────
 try:
-    from spec_extractor import extract_specs
-    from layout_organizer import generate_layout
-except ModuleNotFoundError:  # fallback to package-style layout
-    from parser.spec_extractor import extract_specs
-    from parser.layout_organizer import generate_layout
+    import fcntl
+except ImportError:  # Windows: builds are only serialized within one process
+    fcntl = None
 
+# ── resilient imports: root or parser/ ─────────────────────────
 try:
-    from jinja2 import Environment, FileSystemLoader
-    _HAS_JINJA = True
-except Exception:
-    _HAS_JINJA = False
+    from spec_extractor import extract_specs, iter_ref_chunks
+    from layout_organizer import generate_layout, get_env, reset_templates, env as _layout_env
+except ModuleNotFoundError:  # fallback to package-style layout
+    from parser.spec_extractor import extract_specs, iter_ref_chunks
+    from parser.layout_organizer import generate_layout, get_env, reset_templates, env as _layout_env
 
 # ── logging ────────────────────────────────────────────────────
 os.makedirs("logs", exist_ok=True)
@@ -34,53 +41,253 @@ SUPPORTED_EXTS = {
     ".json": "json",
 }
 
-def _collect_specs(upload_dir: Path):
-    """Walk uploads/ and extract specs for supported files."""
-    specs = []
-    if not upload_dir.exists():
-        logging.warning("Upload directory %s not found. Creating it now.", upload_dir)
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        return specs
-
-    for entry in upload_dir.iterdir():
-        if not entry.is_file():
-            continue
-        ftype = SUPPORTED_EXTS.get(entry.suffix.lower())
-        if not ftype:
-            logging.info("Skipping unsupported file: %s", entry.name)
-            continue
+# ── incremental build state ────────────────────────────────────
+# Kept next to (not inside) the output dir, so it is never served or shipped:
+#   .build_cache/<output name>/manifest.json      inputs (size, mtime_ns, sha256,
+#                                                 fragment key) + output hashes
+#   .build_cache/<output name>/fragments/<key>.json   layout fragment of one input
+# A fragment key covers the input bytes, its file type, the templates and the
+# extractor/layout code, so an input is re-extracted and re-rendered only when
+# one of those changes (an upgrade never reuses fragments of older code).
+# Bump MANIFEST_VERSION when the manifest or fragment format changes.
+STATE_DIR = ".build_cache"
+MANIFEST_VERSION = 2
+
+def _code_digest() -> str:
+    """Fingerprint of the modules whose output ends up in fragments and streamed outputs."""
+    h = hashlib.sha256()
+    for fn in (extract_specs, generate_layout):
+        with open(inspect.getfile(fn), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+CODE_DIGEST = _code_digest()
+
+def _state_dir(out_dir: Path) -> Path:
+    out = out_dir.resolve()
+    return out.parent / STATE_DIR / out.name
+
+def manifest_path(out_dir) -> Path:
+    """Build manifest of an output dir; rewritten by every build that changes anything."""
+    return _state_dir(Path(out_dir)) / "manifest.json"
+
+def _sha256_file(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _atomic_write(path: Path, data):
+    """
+    Write via a temp file in the same directory + os.replace (readers never see a
+    partial file). `data` is bytes or an iterable of byte chunks.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    tmp = Path(tmp)
+    try:
+        os.chmod(tmp, 0o666 & ~_UMASK)   # mkstemp creates 0600; outputs get the usual mode
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(data, (bytes, bytearray)):
+                f.write(data)
+            else:
+                for chunk in data:
+                    f.write(chunk)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+_BUILD_LOCKS = {}
+_BUILD_LOCKS_GUARD = threading.Lock()
+
+@contextlib.contextmanager
+def _build_lock(out_dir: Path):
+    """
+    One build at a time per output dir: a thread lock for callers in this
+    process (watcher, web requests) plus an flock on the state dir for other
+    processes (CLI next to the web app).
+    """
+    state = _state_dir(out_dir)
+    with _BUILD_LOCKS_GUARD:
+        lock = _BUILD_LOCKS.setdefault(str(state), threading.Lock())
+    with lock:
+        state.mkdir(parents=True, exist_ok=True)
+        with open(state / "build.lock", "a") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+def _template_digest() -> str:
+    """Fingerprint (name, size, mtime) of every template the layout and index depend on."""
+    dirs = [*getattr(_layout_env.loader, "searchpath", []), "templates"]
+    parts = []
+    for d in dict.fromkeys(os.path.abspath(x) for x in dirs):
+        for p in sorted(Path(d).glob("*.j2")):
+            st = p.stat()
+            parts.append(f"{p}:{st.st_size}:{st.st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+_SEEN_TEMPLATES = None
+
+def _refresh_templates(digest: str):
+    """Long-lived processes (watch mode, the web app) reparse templates only when they changed on disk."""
+    global _SEEN_TEMPLATES
+    if _SEEN_TEMPLATES is not None and digest != _SEEN_TEMPLATES:
+        reset_templates()
+    _SEEN_TEMPLATES = digest
+
+def _load_manifest(state: Path) -> dict:
+    try:
+        with (state / "manifest.json").open(encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {}
+
+def _upload_entries(upload_dir: Path):
+    """Supported files in uploads/ as (path str, file type, stat), sorted by name so builds are deterministic."""
+    entries = []
+    with os.scandir(upload_dir) as it:
+        for entry in sorted(it, key=lambda e: e.name):
+            if not entry.is_file():
+                continue
+            ftype = SUPPORTED_EXTS.get(os.path.splitext(entry.name)[1].lower())
+            if not ftype:
+                logging.info("Skipping unsupported file: %s", entry.name)
+                continue
+            entries.append((entry.path, ftype, entry.stat()))
+    return entries
+
+def _dir_mtimes(out_dir: Path, dirs) -> dict:
+    """mtime_ns of the output directories `dirs`: adding, removing or replacing a file in one changes it."""
+    out = {}
+    for rel in dirs:
         try:
-            specs.append(extract_specs(str(entry), ftype))
-        except Exception as e:
-            logging.exception("Failed to extract specs from %s: %s", entry.name, e)
-    return specs
+            out[rel] = os.stat(os.path.join(out_dir, rel)).st_mtime_ns
+        except OSError:
+            out[rel] = None
+    return out
+
+def _merge(fragments) -> dict:
+    """Concatenate per-input layouts in input order (same result as generate_layout over all specs)."""
+    layout = {"folders": [], "files": {}}
+    for frag in fragments:
+        layout["folders"].extend(frag.get("folders") or [])
+        layout["files"].update(frag.get("files") or {})
+    return layout
+
+# ── precompression ─────────────────────────────────────────────
+# Large text artifacts are compressed once at build time (x.html → x.html.gz,
+# x.html.br) so the preview server can send them as-is to clients that accept
+# the encoding. Brotli is optional (pip install brotli).
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PRECOMPRESS_MIN_BYTES = 8 << 10
+PRECOMPRESS_EXTS = {".html", ".htm", ".js", ".css", ".json", ".txt", ".md", ".py", ".svg", ".xml"}
+_ENCODERS = ("gz", "br") if brotli else ("gz",)
+
+def _compressed_chunks(path: Path, enc: str):
+    """`path` compressed as gzip (fixed header, so output is reproducible) or brotli, in chunks."""
+    if enc == "gz":
+        comp = zlib.compressobj(9, zlib.DEFLATED, 31)
+        flush = comp.flush
+    else:
+        comp = brotli.Compressor()
+        flush = comp.finish
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            out = comp.compress(block) if enc == "gz" else comp.process(block)
+            if out:
+                yield out
+    yield flush()
+
+_FALLBACK_INDEX = """<!doctype html>
+<html lang="en"><meta charset="utf-8"><title>Generated App</title>
+<body style="font-family: system-ui, sans-serif; padding: 24px;">
+<h1>Generated App</h1>
+<p>This is a fallback index. Add <code>templates/index.html.j2</code> for custom rendering.</p>
+<pre id="summary" style="white-space: pre-wrap; background:#f6f6f6; padding:12px; border-radius:8px;"></pre>
+<script>
+fetch('layout.json').then(r=>r.json()).then(j=>{summary.textContent = JSON.stringify(j, null, 2)})
+.catch(()=>{summary.textContent = 'layout.json not found';});
+</script>
+</body></html>"""
 
-def _render_output(layout: dict, out_dir: Path):
-    """Write files to generated_app/ and optionally render index.html via Jinja2."""
+def _render_output(layout: dict, out_dir: Path, previous: dict = None, rewrite: bool = False, workers: int = 1,
+                   upload_dir: Path = Path(".")):
+    """
+    Write files to generated_app/ and optionally render index.html via Jinja2.
+    `previous` maps output paths to the sha256 they were last written with:
+    outputs whose bytes are unchanged are not rewritten (unless `rewrite`), and
+    ones no longer produced are removed. Large text outputs also get .gz/.br
+    siblings (tracked like any other output). Streamed content refs are read
+    from `upload_dir`. Writes run on up to `workers` * 2 threads. Returns
+    (hashes, written), both in layout order.
+    """
+    previous = previous or {}
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    def emit(item):
+        rel, data = item
+        if isinstance(data, dict):
+            # streamed upload: identify it by its reference (path, range, mtime) and copy it
+            # through in chunks instead of holding the text
+            digest = "ref:" + hashlib.sha256((json.dumps(data, sort_keys=True) + CODE_DIGEST).encode()).hexdigest()
+            size, data = None, (t.encode("utf-8") for t in iter_ref_chunks(data["ref"], upload_dir))
+        else:
+            digest, size = hashlib.sha256(data).hexdigest(), len(data)
+        fpath = out_dir / rel
+        if not rewrite and previous.get(rel) == digest and fpath.is_file():
+            entries = [(rel, digest, False)]
+        else:
+            try:
+                _atomic_write(fpath, data)
+                entries = [(rel, digest, True)]
+            except Exception as e:
+                logging.exception("Failed writing %s: %s", fpath, e)
+                return [(rel, None, False)]
+        if os.path.splitext(rel)[1].lower() in PRECOMPRESS_EXTS and (
+                size if size is not None else fpath.stat().st_size) >= PRECOMPRESS_MIN_BYTES:
+            for enc in _ENCODERS:
+                side, sdigest = f"{rel}.{enc}", f"{digest}:{enc}"
+                spath = out_dir / side
+                if not rewrite and previous.get(side) == sdigest and spath.is_file():
+                    entries.append((side, sdigest, False))
+                    continue
+                try:
+                    _atomic_write(spath, _compressed_chunks(fpath, enc))
+                    entries.append((side, sdigest, True))
+                except Exception as e:
+                    logging.exception("Failed compressing %s: %s", spath, e)
+        return entries
+
     # Create folders listed by the generator
-    for folder in layout.get("folders", []):
+    for folder in dict.fromkeys(layout.get("folders", [])):
         (out_dir / folder).mkdir(parents=True, exist_ok=True)
 
-    # Write generated files
-    for fname, content in (layout.get("files") or {}).items():
-        fpath = out_dir / fname
-        fpath.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with fpath.open("w", encoding="utf-8") as f:
-                f.write(content if content is not None else "")
-        except Exception as e:
-            logging.exception("Failed writing %s: %s", fpath, e)
+    # Generated files, then index.html and the layout.json snapshot
+    items = [(fname, content if isinstance(content, dict) else (content if content is not None else "").encode("utf-8"))
+             for fname, content in (layout.get("files") or {}).items()]
 
     # Optional: Jinja template → index.html
-    if _HAS_JINJA and Path("templates/index.html.j2").exists():
+    if Path("templates/index.html.j2").exists():
         try:
-            env = Environment(loader=FileSystemLoader("templates"))
-            template = env.get_template("index.html.j2")
-            html = template.render(layout=layout)
-            with (out_dir / "index.html").open("w", encoding="utf-8") as f:
-                f.write(html)
+            template = get_env("templates").get_template("index.html.j2")
+            items.append(("index.html", template.render(layout=layout).encode("utf-8")))
         except Exception as e:
             logging.exception("Jinja render failed: %s", e)
     else:
@@ -88,54 +295,182 @@ def _render_output(layout: dict, out_dir: Path):
         fallback = out_dir / "index.html"
         if not fallback.exists():
             try:
-                with fallback.open("w", encoding="utf-8") as f:
-                    f.write("""<!doctype html>
-<html lang="en"><meta charset="utf-8"><title>Generated App</title>
-<body style="font-family: system-ui, sans-serif; padding: 24px;">
-<h1>Generated App</h1>
-<p>This is a fallback index. Add <code>templates/index.html.j2</code> for custom rendering.</p>
-<pre id="summary" style="white-space: pre-wrap; background:#f6f6f6; padding:12px; border-radius:8px;"></pre>
-<script>
-fetch('layout.json').then(r=>r.json()).then(j=>{summary.textContent = JSON.stringify(j, null, 2)})
-.catch(()=>{summary.textContent = 'layout.json not found';});
-</script>
-</body></html>""")
+                _atomic_write(fallback, _FALLBACK_INDEX.encode("utf-8"))
             except Exception as e:
                 logging.exception("Failed writing fallback index.html: %s", e)
 
     # Write JSON snapshot for debugging/preview
+    items.append(("layout.json", json.dumps(layout, indent=2, ensure_ascii=False).encode("utf-8")))
+
+    hashes, written = {}, []
+    for rel, digest, wrote in (e for entries in _thread_map(emit, items, workers * 2) for e in entries):
+        if digest:
+            hashes[rel] = digest
+        if wrote:
+            written.append(rel)
+
+    # Outputs of the previous build that nothing produces any more
+    for rel in sorted(previous.keys() - hashes.keys()):
+        try:
+            (out_dir / rel).unlink()
+            written.append(rel)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.exception("Failed removing stale %s: %s", rel, e)
+    return hashes, written
+
+# ── parallel helpers ───────────────────────────────────────────
+# Reads, hashes and writes are I/O (hashlib and file I/O release the GIL), so
+# they go to threads; extracting + rendering a spec is pure Python, so changed
+# uploads go to worker processes once there are enough of them to pay for the
+# pool. Results always come back in input order.
+BUILDER_WORKERS = int(os.getenv("BUILDER_WORKERS", "0")) or (os.cpu_count() or 1)
+PROCESS_MIN_JOBS = 64   # fewer changed uploads than this are built in-process
+STREAM_MIN_BYTES = 4 << 20   # uploads this large are extracted in streaming mode (content by reference)
+_THREAD_MIN_JOBS = 16
+
+def _thread_map(fn, items, threads: int):
+    if threads <= 1 or len(items) < _THREAD_MIN_JOBS:
+        return [fn(x) for x in items]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(fn, items))
+
+def _fragment_job(job):
+    """Extract + lay out one upload (runs in a worker process). Returns (fragment, error)."""
+    path, ftype, stream = job
     try:
-        with (out_dir / "layout.json").open("w", encoding="utf-8") as f:
-            json.dump(layout, f, indent=2, ensure_ascii=False)
+        return generate_layout([extract_specs(path, ftype, stream=stream)]), None
     except Exception as e:
-        logging.exception("Failed writing layout.json: %s", e)
+        return None, f"{type(e).__name__}: {e}"
 
-def run_builder(upload_dir: str = "uploads", generated_dir: str = "generated_app"):
-    """Main build runner. Returns a dict summary for CLI wrappers."""
-    upload_path = Path(upload_dir)
-    out_path = Path(generated_dir)
+# Builds run on Flask request threads and the watcher thread, so workers must not
+# be forked from this process (a fork copies whatever locks other threads hold).
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
 
-    try:
-        specs = _collect_specs(upload_path)
-        if not specs:
+def _build_fragments(jobs, workers: int):
+    if workers <= 1 or len(jobs) < PROCESS_MIN_JOBS:
+        return [_fragment_job(j) for j in jobs]
+    workers = min(workers, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT) as pool:
+        return list(pool.map(_fragment_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+def _read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _build_incremental(upload_path: Path, out_path: Path, force: bool = False, workers: int = 1) -> dict:
+    """
+    Re-extract and re-render only inputs whose content (or the templates) changed,
+    reusing cached layout fragments for the rest; when nothing changed and every
+    output is in place, no layout is assembled at all.
+    """
+    if not upload_path.exists():
+        logging.warning("Upload directory %s not found. Creating it now.", upload_path)
+        upload_path.mkdir(parents=True, exist_ok=True)
+    state = _state_dir(out_path)
+    frag_dir = state / "fragments"
+    manifest = _load_manifest(state)
+    old_inputs = {} if force else manifest.get("inputs", {})
+    tdigest = _template_digest()
+    _refresh_templates(tdigest)
+    cached = {p[:-5] for p in os.listdir(frag_dir)} if frag_dir.is_dir() else set()
+
+    # 1. hash uploads whose stat changed (threads)
+    entries = _upload_entries(upload_path)
+    def digest(e):
+        old = old_inputs.get(os.path.basename(e[0]))
+        if old and (old["size"], old["mtime_ns"], old["ftype"]) == (e[2].st_size, e[2].st_mtime_ns, e[1]):
+            return old["sha256"]   # same stat → trust the recorded hash
+        return _sha256_file(e[0])
+    shas = _thread_map(digest, entries, workers * 2)
+
+    # 2. extract + lay out uploads without a cached fragment (processes)
+    inputs, todo = {}, []
+    for (entry, ftype, st), sha in zip(entries, shas):
+        name = os.path.basename(entry)
+        key = hashlib.sha256(f"{sha}:{ftype}:{tdigest}:{CODE_DIGEST}".encode()).hexdigest()
+        inputs[name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ftype": ftype, "sha256": sha, "key": key}
+        old = old_inputs.get(name)
+        if not (old and old.get("key") == key and key in cached):
+            todo.append(name)
+    fresh, failed = {}, 0
+    jobs = [(os.path.join(upload_path, n), inputs[n]["ftype"], inputs[n]["size"] >= STREAM_MIN_BYTES) for n in todo]
+    for name, (frag, err) in zip(todo, _build_fragments(jobs, workers)):
+        if err:
+            logging.error("Failed to extract specs from %s: %s", name, err)
+            del inputs[name]
+            failed += 1
+        else:
+            fresh[inputs[name]["key"]] = frag
+    _thread_map(lambda kv: _atomic_write(frag_dir / f"{kv[0]}.json", json.dumps(kv[1], ensure_ascii=False).encode("utf-8")),
+                list(fresh.items()), workers * 2)
+    rebuilt = len(todo) - failed   # per upload: identical uploads share one fragment key but both were rebuilt
+    stats = {"inputs_reused": len(inputs) - rebuilt, "inputs_rebuilt": rebuilt, "inputs_failed": failed}
+
+    outputs, dirs = manifest.get("outputs", {}), manifest.get("dirs", {})
+    dirs_same = dirs == _dir_mtimes(out_path, dirs)
+    unchanged = (not force and not fresh and [i["key"] for i in inputs.values()] == [i["key"] for i in old_inputs.values()]
+                 and manifest.get("templates") == tdigest
+                 and (dirs_same or all(os.path.isfile(os.path.join(out_path, rel)) for rel in outputs)))
+    written = []
+    if unchanged and dirs_same and inputs == old_inputs:
+        return {"files_written": manifest.get("files", []), "folders_created": manifest.get("folders", []),
+                "changed": [], **stats}
+    if unchanged:
+        files, folders = manifest.get("files", []), manifest.get("folders", [])
+    else:
+        # 3. merge fragments in upload order (cached ones read on threads) and write what changed
+        if inputs:
+            keys = [rec["key"] for rec in inputs.values()]
+            frags = _thread_map(lambda k: fresh[k] if k in fresh else _read_json(frag_dir / f"{k}.json"),
+                                keys, workers * 2)
+            layout = _merge(frags)
+        else:
             msg = f"No specs found in {upload_path.resolve()}. Place .txt/.py/.html/.md/.json files there."
             logging.warning(msg)
             print(f"⚠️  {msg}")
-            # still produce a minimal layout so the pipeline doesn’t die
             layout = {"folders": [], "files": {"README.txt": "No specs found.\nAdd files to uploads/ and re-run."}}
-        else:
-            layout = generate_layout(specs)
+        outputs, written = _render_output(layout, out_path, outputs, rewrite=force, workers=workers,
+                                          upload_dir=upload_path)
+        files, folders = list(layout.get("files") or {}), list(layout.get("folders") or [])
+        live = {rec["key"] for rec in inputs.values()}
+        for p in frag_dir.glob("*.json"):
+            if p.stem not in live:
+                p.unlink()
+
+    _atomic_write(state / "manifest.json", json.dumps({
+        "version": MANIFEST_VERSION, "templates": tdigest, "inputs": inputs, "outputs": outputs,
+        "files": files, "folders": folders, "dirs": _dir_mtimes(out_path, {os.path.dirname(r) for r in outputs}),
+    }, ensure_ascii=False).encode("utf-8"))
+    return {"files_written": files, "folders_created": folders, "changed": written, **stats}
 
-        _render_output(layout, out_path)
+def run_builder(upload_dir: str = "uploads", generated_dir: str = "generated_app", incremental: bool = True,
+                workers: int = None):
+    """
+    Main build runner. Returns a dict summary for CLI wrappers.
+    With `incremental` (the default) only changed uploads are rebuilt and only
+    changed outputs rewritten; pass incremental=False for a full rebuild.
+    `workers` (default BUILDER_WORKERS: $BUILDER_WORKERS or the CPU count)
+    bounds the extraction processes and I/O threads; 1 builds serially.
+    Concurrent runs into the same output dir wait for each other.
+    """
+    upload_path = Path(upload_dir)
+    out_path = Path(generated_dir)
+
+    try:
+        with _build_lock(out_path):
+            result = _build_incremental(upload_path, out_path, force=not incremental,
+                                        workers=max(1, workers or BUILDER_WORKERS))
 
         summary = {
             "uploads": str(upload_path.resolve()),
             "output": str(out_path.resolve()),
-            "files_written": list((layout.get("files") or {}).keys()),
-            "folders_created": list(layout.get("folders") or []),
+            **result,
         }
-        logging.info("Builder run complete: %s", summary)
-        print(f"✅ Build complete → {summary['output']}")
+        logging.info("Builder run complete: %s", {k: v for k, v in summary.items() if k != "files_written"})
+        print(f"✅ Build complete → {summary['output']} ({len(summary['changed'])} changed)")
         return summary
 
     except Exception as e:
@@ -144,4 +479,5 @@ def run_builder(upload_dir: str = "uploads", generated_dir: str = "generated_app
         return {"error": str(e)}
 
 if __name__ == "__main__":
-    run_builder()
\ No newline at end of file
+    import sys
+    run_builder(incremental="--full" not in sys.argv[1:])
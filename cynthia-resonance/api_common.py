@@ -0,0 +1,246 @@
+# Request schemas and response helpers shared by server.py and server_async.py
+import os, json, asyncio, codecs, threading
+from datetime import datetime, timezone
+from fastapi import HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
+from engine.birthcalc import Birth, calc_birth, calc_chart
+from engine.composite import rank
+from engine.agent_state import AgentStateStore
+from engine.transits import MAX_DAYS, MAX_POINTS
+from engine.interference import calc_interference, chart_interference_at
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:   # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+MAX_LINE = 64 * 1024                  # longer pasted lines are truncated in /api/parse/stream
+
+# ----- Schemas -----
+class BirthIn(BaseModel):
+    dateISO: str
+    time: str | None = None
+    tzOffset: float | None = None
+    lat: float | None = None
+    lon: float | None = None
+
+class InterfIn(BirthIn):
+    dateTodayISO: str | None = None   # if you want a different transit date than "now"
+    full: bool = False                # all bodies: natal × transit aspect matrix instead of Sun-only
+
+class PlanIn(InterfIn):
+    narrate: bool = False
+    mode: str | None = None           # Venom / Echo / Prime / Dream / Softcore (affects style for narration)
+
+class RangeIn(BirthIn):
+    startISO: str | None = None       # default: now
+    days: float = Field(90, ge=0, le=MAX_DAYS)
+    points: int = Field(96, ge=2, le=MAX_POINTS)   # samples in the downsampled harmony curve
+
+class FieldIn(InterfIn):
+    userId: str
+
+class AgentChange(BaseModel):
+    city: str                         # "Mind"|"Heart"|"Body"
+    gate: int
+    state: str | None = None          # "unlocked"|"dormant"|"locked"
+    level: int | None = None
+
+MAX_COMPAT_OTHERS = 20_000
+
+class CompatIn(BaseModel):
+    birth: BirthIn
+    others: list[BirthIn] = Field(max_length=MAX_COMPAT_OTHERS)   # candidates, ranked by harmony with `birth`
+    k: int = 10
+    full: bool = False                # all bodies instead of the natal Sun only
+
+class ParseIn(BaseModel):
+    field: str | None = None          # "Mind"|"Heart"|"Body"
+    planet: str | None = None
+    astro: str | None = None          # e.g. "15° 32' Leo H7"
+    hd: str | None = None             # e.g. "Gate 6.3, Color 4 Tone 2 Base 6"
+
+def to_birth(inp: BirthIn) -> Birth:
+    return Birth(dateISO=inp.dateISO, time=inp.time, tzOffset=inp.tzOffset, lat=inp.lat, lon=inp.lon)
+
+def when_utc(dateISO: str | None) -> datetime | None:
+    return datetime.fromisoformat(dateISO).replace(tzinfo=timezone.utc) if dateISO else None
+
+def interference_for(inp: InterfIn, birth, astro=None):
+    """
+    Sun-only interference for `birth` (reusing `astro` from calc_birth when the
+    caller has it), or the full-chart matrix when `inp.full`.
+    """
+    if inp.full:
+        chart, _ = calc_chart(birth)
+        return chart_interference_at(chart, when_utc(inp.dateTodayISO) or datetime.now(timezone.utc))
+    if astro is None:
+        astro, _, _ = calc_birth(birth)
+    return calc_interference(astro, None, None, inp.dateTodayISO)
+
+def compat_for(inp: CompatIn):
+    """Top-k of `inp.others` for `inp.birth`; `index` points into `others`."""
+    try:
+        matches = rank(to_birth(inp.birth), [to_birth(o) for o in inp.others], max(1, min(inp.k, 1000)), inp.full)
+    except ValueError as e:
+        raise HTTPException(422, str(e))
+    return {"matches": matches, "candidates": len(inp.others)}
+
+_AGENTS: "AgentStateStore | None" = None
+_AGENTS_LOCK = threading.Lock()
+
+def agent_store() -> AgentStateStore:
+    """The per-user agent state store, opened on first use (AGENT_STATE_DB, default agent_state.db)."""
+    global _AGENTS
+    if _AGENTS is None:
+        with _AGENTS_LOCK:
+            if _AGENTS is None:
+                _AGENTS = AgentStateStore(os.getenv("AGENT_STATE_DB", "agent_state.db"))
+    return _AGENTS
+
+def close_agent_store() -> None:
+    """Flush and close the store if it was ever opened."""
+    global _AGENTS
+    with _AGENTS_LOCK:
+        if _AGENTS is not None:
+            _AGENTS.close()
+            _AGENTS = None
+
+def health_payload():
+    return {
+        "ok": True,
+        "ollama": os.getenv("OLLAMA_BASE", None),
+        "models": {
+            "coach": os.getenv("COACH_MODEL","phi"),
+            "mind":  os.getenv("MIND_MODEL","mistral"),
+            "heart": os.getenv("HEART_MODEL","tinyllama"),
+            "body":  os.getenv("BODY_MODEL","tinyllama"),
+        }
+    }
+
+def roster_response(svc, request: Request, city=None, limit=None, **params):
+    if city and city not in svc.cities:
+        raise HTTPException(404, f"unknown city {city!r}")
+    if limit is not None:
+        limit = max(1, min(limit, 1000))
+    try:
+        etag, raw = svc.render(city=city, limit=limit, **params)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(raw, media_type="application/json", headers=headers)
+
+async def field_events(fields, user_id: str, request: Request):
+    """SSE frames for one FieldTracker user until disconnect (see /api/field/{user_id}/events)."""
+    for ev in fields.drain_events(user_id):
+        yield f"event: {ev['type']}\ndata: {json.dumps(ev)}\n\n"
+    while not await request.is_disconnected():
+        until = fields.valid_until(user_id)
+        if until is None:
+            return
+        wait = (until - datetime.now(timezone.utc)).total_seconds()
+        if wait > 0:
+            await asyncio.sleep(min(wait, 15.0))
+            yield ": ping\n\n"
+            continue
+        fields.refresh(user_id)
+        for ev in fields.drain_events(user_id):
+            yield f"event: {ev['type']}\ndata: {json.dumps(ev)}\n\n"
+
+class DuplexNDJSON(StreamingResponse):
+    """
+    Streams packets while the request body is still being read. The body reader
+    owns `receive` (and sees disconnects), so skip Starlette's disconnect listener,
+    which would otherwise consume the body messages.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+async def duplex_ndjson(packets) -> DuplexNDJSON:
+    """
+    Answer with `packets` once the first one (or the end) is in, so a body that is
+    rejected up front still gets its 400. A later error ends the stream with an
+    {"error": ...} packet, since the 200 has gone out by then.
+    """
+    it = packets.__aiter__()
+    try:
+        first = [await it.__anext__()]
+    except StopAsyncIteration:
+        first = []
+    async def stream():
+        for pkt in first:
+            yield pkt
+        try:
+            async for pkt in it:
+                yield pkt
+        except HTTPException as e:
+            yield json.dumps({"error": e.detail}).encode() + b"\n"
+    return DuplexNDJSON(stream())
+
+class _Lines:
+    """Incremental UTF-8 line splitter; lines past MAX_LINE are truncated, never buffered."""
+    def __init__(self):
+        self.dec = codecs.getincrementaldecoder("utf-8")("replace")
+        self.buf = ""
+
+    def feed(self, data: bytes) -> list:
+        *lines, self.buf = (self.buf + self.dec.decode(data)).split("\n")
+        self.buf = self.buf[:MAX_LINE]
+        return [l[:MAX_LINE].rstrip("\r") for l in lines]
+
+    def close(self) -> list:
+        tail = (self.buf + self.dec.decode(b"", final=True)).rstrip("\r")
+        return [tail[:MAX_LINE]] if tail else []
+
+def _multipart_lines(ctype: str):
+    """
+    (parser, out, done): feed body chunks to `parser.write` and take the lines of
+    every part, text fields and files alike, from `out`; `done` is set once the
+    closing boundary is seen. Nothing is spooled or held per part.
+    """
+    _, opts = parse_options_header(ctype)
+    boundary = opts.get(b"boundary")
+    if not boundary:
+        raise HTTPException(400, "multipart body without a boundary")
+    out, part, done = [], [None], []
+    def on_part_begin():
+        part[0] = _Lines()
+    def on_part_data(data, start, end):
+        out.extend(part[0].feed(data[start:end]))
+    def on_part_end():
+        out.extend(part[0].close())
+    callbacks = {"on_part_begin": on_part_begin, "on_part_data": on_part_data,
+                 "on_part_end": on_part_end, "on_end": lambda: done.append(True)}
+    return MultipartParser(boundary, callbacks), out, done
+
+async def body_lines(request: Request):
+    """
+    Decode a streamed request body into lines without buffering the upload:
+    text/plain as is, multipart/form-data part by part through python-multipart's
+    incremental parser (so nothing is spooled and the loop never blocks on part files).
+    """
+    ctype = request.headers.get("content-type", "")
+    if ctype.startswith("multipart/form-data"):
+        parser, out, done = _multipart_lines(ctype)
+        async for chunk in request.stream():
+            try:
+                parser.write(chunk)
+            except ValueError as e:   # python-multipart's parse errors
+                raise HTTPException(400, f"malformed multipart body: {e}")
+            for line in out:
+                yield line
+            out.clear()
+        if not done:
+            raise HTTPException(400, "truncated multipart body")
+        return
+    lines = _Lines()
+    async for chunk in request.stream():
+        for line in lines.feed(chunk):
+            yield line
+    for line in lines.close():
+        yield line
@@ -0,0 +1,45 @@
+# Scaling benchmark for `python -m engine bulk --workers N`
+#
+#   python bench/bulk_scaling.py [--rows 2000000] [--chunk 100000] [--workers 1 2 4 8]
+#
+# Generates a synthetic births CSV once, runs the bulk path at each worker count
+# into a fresh output dir and prints rows/sec and speedup vs 1 worker as JSON.
+import argparse, csv, json, os, random, shutil, sys, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from engine.bulk import run_bulk
+
+def make_births(path: str, rows: int, seed: int = 7) -> None:
+    rnd = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["id", "dateISO", "time", "tzOffset"])
+        for i in range(rows):
+            w.writerow([f"u{i}", f"{rnd.randint(1900, 2030)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+                        f"{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}", rnd.choice(["", -4, 0, 5.5, 9])])
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2_000_000)
+    ap.add_argument("--chunk", type=int, default=100_000)
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    a = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bulk-bench-")
+    try:
+        src = os.path.join(tmp, "births.csv")
+        make_births(src, a.rows)
+        results, base = [], None
+        with open(os.devnull, "w") as quiet:
+            for w in a.workers:
+                out = os.path.join(tmp, f"out-{w}")
+                r = run_bulk(src, out, a.chunk, "npz", resume=False, workers=w, log=quiet)
+                base = base or r["rows_per_sec"]
+                results.append({"workers": w, "seconds": r["seconds"], "rows_per_sec": r["rows_per_sec"],
+                                "speedup": round(r["rows_per_sec"] / base, 2)})
+                shutil.rmtree(out)
+        print(json.dumps({"rows": a.rows, "chunk": a.chunk, "cpus": os.cpu_count(), "results": results}, indent=2))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Compatibility top-k: accuracy of the harmonic series and pairs/sec vs block size
+#
+#   python bench/compat_bench.py [--n 20000] [--k 10] [--bodies 13]
+#
+# Checks engine.composite against the direct double sum of _aspect_score on a
+# small cohort (max |error|, top-k agreement and the direct sum's speed), then
+# ranks an n × n cohort against itself at several block sizes and reports
+# pairs/sec and peak traced memory, next to what the dense n × n score matrix
+# alone would take.
+import argparse, os, sys, time, tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy as np
+from engine import composite
+
+def check(rng, bodies: int, k: int) -> dict:
+    a = rng.uniform(0, 360, (400, bodies))
+    a[::9, -1] = np.nan                                                # some charts miss a body
+    t = time.perf_counter()
+    direct = composite.pair_scores(a, a)
+    direct_rate = len(a) ** 2 / (time.perf_counter() - t)
+    series = composite.features(a, scaled=True) @ composite.features(a).T
+    np.fill_diagonal(direct, -np.inf)
+    idx, score = composite.top_k(a, k=k, block=64)
+    ref = np.argsort(-direct, axis=1, kind="stable")[:, :k]
+    return {"max_abs_error": float(np.abs(direct - series)[np.isfinite(direct)].max()),
+            "topk_index_agreement": float((idx == ref).mean()),
+            "topk_score_error": float(np.abs(score - np.take_along_axis(direct, ref, axis=1)).max()),
+            "direct_sum_M_pairs_per_s": round(direct_rate / 1e6, 3)}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20_000)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--bodies", type=int, default=13)
+    ap.add_argument("--blocks", type=int, nargs="+", default=[256, 512, 1024, 2048])
+    a = ap.parse_args()
+
+    rng = np.random.default_rng(5)
+    print("check", check(rng, a.bodies, a.k))
+    lons = rng.uniform(0, 360, (a.n, a.bodies))
+    print(f"dense {a.n}x{a.n} float64 matrix would be {a.n * a.n * 8 / 2**20:.0f} MB")
+    for block in a.blocks:
+        tracemalloc.start()
+        t = time.perf_counter()
+        composite.top_k(lons, k=a.k, block=block)
+        dt = time.perf_counter() - t
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"block {block:5d}  {dt:7.2f} s  {a.n * (a.n - 1) / dt / 1e6:7.1f} M pairs/s  peak {peak / 2**20:6.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Per-lookup cost and memory of the gate table vs the old dict-of-dicts
+#
+#   python bench/gate_table_bench.py [--n 1000000]
+import argparse, copy, json, os, sys, timeit, tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from engine import dataset
+from engine.dataset import GateTable, GATE_TABLE, GATE_NAME
+
+def _ns(stmt, glb, n):
+    return round(min(timeit.repeat(stmt, globals=glb, number=n, repeat=5)) / n * 1e9, 1)
+
+def _alloc(build):
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=1_000_000)
+    a = ap.parse_args()
+
+    rows = {g: dict(r) for g, r in dataset._GATE_ROWS.items()}
+    old, old_bytes = _alloc(lambda: copy.deepcopy(rows))
+    new, new_bytes = _alloc(lambda: GateTable(rows))
+    g = {"old": old, "view": GATE_TABLE, "names": GATE_NAME, "gate": 37}
+    lookups = {
+        "dict_of_dicts .get(g, {}).get('name')": _ns("old.get(gate, {}).get('name')", g, a.n),
+        "GATE_META[g]['name'] (view)": _ns("view[gate]['name']", g, a.n),
+        "GATE_TABLE.get(g).name": _ns("view.get(gate).name", g, a.n),
+        "GATE_NAME[g]": _ns("names[gate]", g, a.n),
+    }
+    out = {"ns_per_lookup": lookups, "bytes": {"dict_of_dicts": old_bytes, "gate_table": new_bytes}}
+    try:
+        import numpy as np
+        gates = np.random.default_rng(0).integers(1, 65, size=a.n)
+        code = GATE_TABLE.columns()["element_code"]
+        t = min(timeit.repeat(lambda: code[gates], number=5, repeat=3)) / 5
+        t_py = min(timeit.repeat(lambda: [old[x]["element"] for x in gates[:100_000].tolist()], number=1, repeat=3))
+        out["ns_per_row_join"] = {"numpy element_code[gates]": round(t / a.n * 1e9, 2),
+                                  "python dict join": round(t_py / 100_000 * 1e9, 1)}
+    except ImportError:
+        pass
+    print(json.dumps(out, indent=2))
+
+if __name__ == "__main__":
+    main()
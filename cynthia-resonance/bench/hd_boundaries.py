@@ -0,0 +1,89 @@
+# Exhaustive boundary check and per-call cost of the fixed-point HD resolver
+#
+#   python bench/hd_boundaries.py [--n 200000]
+#
+# Walks every one of the 64 * 1080 base boundaries and checks, for the scalar
+# and the NumPy resolver, that the boundary itself (as exact mas, as the float
+# k * base_arc and as that float ± 1 ulp) resolves to the base starting there,
+# and that 1 mas below resolves to the previous base. Then compares
+# gate/line with the old float-modulo mapping away from boundaries and times
+# both. Exits 1 on any mismatch.
+import argparse, math, os, random, sys, timeit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import numpy as np
+from engine import hd
+
+N_BASES = hd.CIRCLE_MAS // hd.BASE_MAS
+
+def _expected(k: int):
+    """(gate, line, color, tone, base) of base index k (0-based, wraps)."""
+    k %= N_BASES
+    g, r = divmod(k, 1080)
+    return g + 1, r // 180 + 1, r % 180 // 30 + 1, r % 30 // 5 + 1, r % 5 + 1
+
+def _float_gate_line(lon: float):
+    """The pre-fixed-point mapping, for comparison."""
+    gate = max(1, min(64, int(lon / 5.625) + 1))
+    line = max(1, min(6, int(lon % 5.625 / (5.625 / 6.0)) + 1))
+    return gate, line
+
+def check_boundaries() -> list:
+    base_deg = hd.BASE_MAS / hd.MAS_PER_DEG
+    ks = np.arange(N_BASES)
+    probes = {   # label → (longitudes, base index they must resolve to)
+        "exact": (ks * hd.BASE_MAS / hd.MAS_PER_DEG, ks),
+        "k*arc": (ks * base_deg, ks),
+        "k*arc-ulp": (np.nextafter(ks * base_deg, -np.inf), ks),
+        "k*arc+ulp": (np.nextafter(ks * base_deg, np.inf), ks),
+        "-1mas": ((ks * hd.BASE_MAS - 1) / hd.MAS_PER_DEG, ks - 1),
+        "+360": (ks * base_deg + 360.0, ks),
+        "-360": (ks * base_deg - 360.0, ks),
+    }
+    bad = []
+    for label, (lons, want_k) in probes.items():
+        want = [_expected(int(k)) for k in want_k]
+        got_arr = list(zip(*(a.tolist() for a in hd.resolve_array(lons))))
+        gl_arr = list(zip(*(a.tolist() for a in hd.sun_to_gate_line_array(lons))))
+        for lon, w, ga, gla in zip(lons.tolist(), want, got_arr, gl_arr):
+            r = hd.resolve(lon)
+            got = (r["gate"], r["line"], r["color"], r["tone"], r["base"])
+            if not (got == w == ga and hd.sun_to_gate_line(lon) == w[:2] == gla):
+                bad.append(f"{label} lon={lon!r}: want {w}, scalar {got}, array {ga}")
+    for k in range(0, N_BASES, 180):   # every line boundary: next_line_boundary is strictly ahead
+        lon = k * base_deg
+        if not math.isclose(hd.next_line_boundary(lon), ((k + 180) % N_BASES) * base_deg, abs_tol=1e-12):
+            bad.append(f"next_line_boundary({lon!r}) = {hd.next_line_boundary(lon)!r}")
+    return bad
+
+def check_float_parity(n: int) -> list:
+    """Gate/line agree with the old float mapping wherever the longitude is > 1 mas from a line boundary."""
+    rnd = random.Random(7)
+    lons = [rnd.uniform(0, 360) for _ in range(n)]
+    return [f"lon={x!r}: old {_float_gate_line(x)}, new {hd.sun_to_gate_line(x)}" for x in lons
+            if abs(x * hd.MAS_PER_DEG / hd.LINE_MAS - round(x * hd.MAS_PER_DEG / hd.LINE_MAS)) * hd.LINE_MAS > 1
+            and _float_gate_line(x) != hd.sun_to_gate_line(x)]
+
+def _ns(stmt, glb, n):
+    return round(min(timeit.repeat(stmt, globals=glb, number=n, repeat=5)) / n * 1e9, 1)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=200_000)
+    a = ap.parse_args()
+
+    bad = check_boundaries() + check_float_parity(a.n)
+    print(f"{N_BASES} bases, {N_BASES * 7} boundary probes, {a.n} random longitudes: {len(bad)} mismatches")
+    for msg in bad[:20]:
+        print("MISMATCH", msg, file=sys.stderr)
+
+    arr = np.random.default_rng(3).uniform(0, 360, a.n)
+    g = {"hd": hd, "old": _float_gate_line, "x": 123.456789, "arr": arr}
+    n = 200_000
+    print(f"old float gate/line      {_ns('old(x)', g, n):8.1f} ns/call")
+    print(f"sun_to_gate_line         {_ns('hd.sun_to_gate_line(x)', g, n):8.1f} ns/call")
+    print(f"resolve                  {_ns('hd.resolve(x)', g, n):8.1f} ns/call")
+    print(f"resolve_array            {_ns('hd.resolve_array(arr)', g, 5) / a.n:8.1f} ns/row")
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
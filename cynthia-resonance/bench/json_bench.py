@@ -0,0 +1,56 @@
+# Requests/sec with and without FAST_JSON, measured in-process over ASGI
+#
+#   python bench/json_bench.py [--seconds 3]
+#
+# Each mode runs in a fresh interpreter (FAST_JSON is read at import time) and
+# drives the app through httpx's ASGI transport, so the numbers isolate the
+# handler + serialization cost from sockets and uvicorn.
+import argparse, asyncio, json, os, subprocess, sys, time
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+BIRTH = {"dateISO": "1994-07-01", "time": "08:25", "tzOffset": -4}
+CASES = [
+    ("GET", "/health", None),
+    ("GET", "/api/agents", None),
+    ("POST", "/api/birth", BIRTH),
+    ("POST", "/api/plan", BIRTH),
+    ("POST", "/api/interference/range", {**BIRTH, "startISO": "2025-01-01", "days": 90}),
+    ("POST", "/api/parse/many", [{"astro": "15° 32' Leo H7", "hd": "Gate 6.3, Color 4 Tone 2 Base 6"}] * 200),
+]
+
+async def _child(seconds: float):
+    import httpx
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault("AGENT_STATE_DB", ":memory:")
+    from server import app
+    out = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as c:
+        for method, path, body in CASES:
+            for _ in range(20):   # warmup
+                await c.request(method, path, json=body)
+            n, t0 = 0, time.perf_counter()
+            while time.perf_counter() - t0 < seconds:
+                r = await c.request(method, path, json=body)
+                r.raise_for_status(); n += 1
+            out[path] = round(n / (time.perf_counter() - t0), 1)
+    print(json.dumps(out))
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=3.0)
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    a = ap.parse_args()
+    if a.child:
+        asyncio.run(_child(a.seconds))
+        return
+    res = {}
+    for mode, flag in (("default", "0"), ("fast_json", "1")):
+        env = {**os.environ, "FAST_JSON": flag}
+        p = subprocess.run([sys.executable, __file__, "--child", "--seconds", str(a.seconds)],
+                           env=env, capture_output=True, text=True, check=True)
+        res[mode] = json.loads(p.stdout.strip().splitlines()[-1])
+    res["speedup"] = {k: round(res["fast_json"][k] / res["default"][k], 2) for k in res["default"]}
+    print(json.dumps(res, indent=2))
+
+if __name__ == "__main__":
+    main()
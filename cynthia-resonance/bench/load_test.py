@@ -0,0 +1,219 @@
+# HTTP load test for the resonance API against a real uvicorn process
+#
+#   python bench/load_test.py [--app server:app] [--concurrency 32] [--seconds 10] [--out run.json]
+#   python bench/load_test.py --compare baseline.json [--threshold 0.10]
+#
+# Starts a stub Ollama (instant canned /api/generate replies) and the server on
+# free local ports, then drives each endpoint in turn with `--concurrency`
+# in-flight requests drawn from a randomized payload mix. Per endpoint it
+# reports requests, errors, RPS, p50/p95/p99 latency (ms), server CPU% and peak
+# RSS (MB) as JSON. With --compare the run is checked against a saved result
+# and the script exits 1 if any endpoint's RPS drops, or p95/p99 grows, by more
+# than --threshold (fraction).
+import argparse, asyncio, json, os, random, socket, subprocess, sys, tempfile, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio", "Sagittarius",
+         "Capricorn", "Aquarius", "Pisces"]
+
+def _birth(rnd: random.Random) -> dict:
+    return {"dateISO": f"{rnd.randint(1940, 2015)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+            "time": f"{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}",
+            "tzOffset": rnd.choice([None, -8, -5, -4, 0, 1, 5.5, 9]),
+            "lat": round(rnd.uniform(-60, 60), 4), "lon": round(rnd.uniform(-180, 180), 4)}
+
+def _today(rnd: random.Random) -> str:
+    return f"{rnd.randint(2024, 2027)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+
+def _parse_body(rnd: random.Random) -> dict:
+    return {"field": rnd.choice([None, "Mind", "Heart", "Body"]), "planet": rnd.choice([None, "Sun", "Moon", "Mars"]),
+            "astro": f"{rnd.randint(0, 29)}° {rnd.randint(0, 59)}' {rnd.choice(SIGNS)} H{rnd.randint(1, 12)}",
+            "hd": f"Gate {rnd.randint(1, 64)}.{rnd.randint(1, 6)}, Color {rnd.randint(1, 6)} Tone {rnd.randint(1, 6)}"}
+
+def _agents_query(rnd: random.Random) -> dict:
+    # mostly the cached full roster, sometimes a filtered page
+    if rnd.random() < 0.7:
+        return {}
+    return {k: v for k, v in {"city": rnd.choice([None, "Mind", "Heart", "Body"]),
+                              "state": rnd.choice([None, "unlocked", "dormant"]),
+                              "limit": rnd.choice([None, 16, 64])}.items() if v is not None}
+
+# endpoint → request factory (method, path, json body, query params)
+MIX = {
+    "/api/birth": lambda r: ("POST", "/api/birth", _birth(r), None),
+    "/api/interference": lambda r: ("POST", "/api/interference", {**_birth(r), "dateTodayISO": _today(r)}, None),
+    "/api/plan": lambda r: ("POST", "/api/plan", {**_birth(r), "dateTodayISO": _today(r),
+                                                  "narrate": r.random() < 0.2, "mode": r.choice(["Prime", "Echo"])}, None),
+    "/api/parse": lambda r: ("POST", "/api/parse", _parse_body(r), None),
+    "/api/agents": lambda r: ("GET", "/api/agents", None, _agents_query(r)),
+}
+
+class _StubOllama(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        body = json.dumps({"response": json.dumps({"text": "Take one concrete step today."})}).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class _ProcStats:
+    """CPU seconds and RSS of a pid from /proc (psutil when available)."""
+    def __init__(self, pid: int):
+        try:
+            import psutil
+            self._p = psutil.Process(pid)
+        except ImportError:
+            self._p = None
+        self.pid = pid
+        self._tick = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+    def cpu_seconds(self) -> float:
+        if self._p is not None:
+            t = self._p.cpu_times()
+            return t.user + t.system
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self._tick
+
+    def rss_mb(self) -> float:
+        if self._p is not None:
+            return self._p.memory_info().rss / 2**20
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+        return 0.0
+
+def _pct(sorted_ms, q: float) -> float:
+    if not sorted_ms:
+        return 0.0
+    return round(sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))], 3)
+
+async def _drive(client, stats: _ProcStats, make, seconds: float, concurrency: int, seed: int) -> dict:
+    rnd = random.Random(seed)
+    lat, errors, peak = [], 0, stats.rss_mb()
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            method, path, body, params = make(rnd)
+            t = time.perf_counter()
+            try:
+                r = await client.request(method, path, json=body, params=params)
+                if r.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            lat.append((time.perf_counter() - t) * 1000)
+
+    cpu0, t0 = stats.cpu_seconds(), time.perf_counter()
+    tasks = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    while not all(t.done() for t in tasks):
+        await asyncio.sleep(0.2)
+        peak = max(peak, stats.rss_mb())
+    await asyncio.gather(*tasks)
+    wall, cpu = time.perf_counter() - t0, stats.cpu_seconds() - cpu0
+    lat.sort()
+    return {"requests": len(lat), "errors": errors, "rps": round(len(lat) / wall, 1),
+            "p50_ms": _pct(lat, 0.50), "p95_ms": _pct(lat, 0.95), "p99_ms": _pct(lat, 0.99),
+            "cpu_pct": round(100 * cpu / wall, 1), "rss_mb": round(peak, 1)}
+
+async def _run(base: str, stats: _ProcStats, endpoints, seconds: float, concurrency: int, warmup: float) -> dict:
+    import httpx
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=30) as c:
+        out = {}
+        for i, ep in enumerate(endpoints):
+            await _drive(c, stats, MIX[ep], warmup, concurrency, seed=1000 + i)
+            out[ep] = await _drive(c, stats, MIX[ep], seconds, concurrency, seed=i)
+        return out
+
+def _start_server(app: str, port: int, env: dict) -> subprocess.Popen:
+    import httpx
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port),
+                             "--log-level", "warning", "--no-access-log"], cwd=ROOT, env=env)
+    ready = "/ready" if app.startswith("server_async") else "/health"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"server exited with {proc.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}{ready}", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("server did not become ready within 60s")
+
+def compare(result: dict, baseline: dict, threshold: float) -> list:
+    """Regression messages for endpoints worse than `baseline` by more than `threshold`."""
+    bad = []
+    for ep, cur in result["endpoints"].items():
+        ref = baseline.get("endpoints", {}).get(ep)
+        if not ref:
+            continue
+        if ref["rps"] and cur["rps"] < ref["rps"] * (1 - threshold):
+            bad.append(f"{ep}: rps {cur['rps']} < {ref['rps']} (-{1 - cur['rps'] / ref['rps']:.0%})")
+        for k in ("p95_ms", "p99_ms"):
+            if ref[k] and cur[k] > ref[k] * (1 + threshold):
+                bad.append(f"{ep}: {k} {cur[k]} > {ref[k]} (+{cur[k] / ref[k] - 1:.0%})")
+        if cur["errors"] > ref.get("errors", 0):
+            bad.append(f"{ep}: {cur['errors']} errors (baseline {ref.get('errors', 0)})")
+    return bad
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--app", default="server:app", help="uvicorn app path, e.g. server_async:app")
+    ap.add_argument("--endpoints", nargs="+", default=list(MIX), choices=list(MIX))
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--seconds", type=float, default=10.0, help="measured seconds per endpoint")
+    ap.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds per endpoint")
+    ap.add_argument("--out", help="also write the JSON result here (e.g. to use as a baseline)")
+    ap.add_argument("--compare", help="baseline JSON from an earlier --out")
+    ap.add_argument("--threshold", type=float, default=0.10, help="allowed regression fraction for --compare")
+    a = ap.parse_args(argv)
+
+    stub = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    port = _free_port()
+    with tempfile.TemporaryDirectory(prefix="load-test-") as tmp:
+        env = {**os.environ, "OLLAMA_BASE": f"http://127.0.0.1:{stub.server_address[1]}",
+               "AGENT_STATE_DB": os.path.join(tmp, "agent_state.db")}
+        proc = _start_server(a.app, port, env)
+        try:
+            endpoints = asyncio.run(_run(f"http://127.0.0.1:{port}", _ProcStats(proc.pid), a.endpoints,
+                                         a.seconds, a.concurrency, a.warmup))
+        finally:
+            proc.terminate()
+            proc.wait(10)
+            stub.shutdown()
+
+    result = {"app": a.app, "concurrency": a.concurrency, "seconds": a.seconds, "cpus": os.cpu_count(),
+              "python": sys.version.split()[0], "endpoints": endpoints}
+    print(json.dumps(result, indent=2))
+    if a.out:
+        with open(a.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if a.compare:
+        with open(a.compare, encoding="utf-8") as f:
+            bad = compare(result, json.load(f), a.threshold)
+        for msg in bad:
+            print("REGRESSION", msg, file=sys.stderr)
+        return 1 if bad else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+# Micro-benchmarks for engine hot functions, with a JSON history
+#
+#   python bench/micro.py [-k parse] [--samples 20] [--min-time 0.05] [--fail-threshold 0.15]
+#   python bench/micro.py --list
+#
+# Each benchmark calls one function over a fixed set of representative inputs.
+# Like pyperf: the loop count is calibrated until one sample takes --min-time,
+# --warmups samples are discarded, then --samples timed samples are taken with
+# GC disabled and reduced to ns/call (median, mean, stdev, min).
+#
+# Every run is appended as one JSON line to --history (default
+# bench/history/micro.jsonl, local and gitignored) with the git commit,
+# interpreter and per-function stats, and is compared with the previous entry
+# for the same interpreter.
+# --fail-threshold exits 1 when any median is slower by more than that fraction.
+import argparse, gc, json, os, platform, random, statistics, subprocess, sys, time
+from datetime import datetime, timezone
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+
+from engine.astro import sun_longitude, sun_longitude_approx, lon_to_sign_dms
+from engine.birthcalc import Birth, _dt_utc, calc_birth, calc_chart
+from engine.hd import resolve, sun_to_gate_line
+from engine.interference import (_aspect_score, _triad_weights, calc_interference, chart_interference_at,
+                                 interference_at, plan_from_interference)
+from engine.parsers import parse_astro_text, parse_hd_text, parse_unified, LineParser
+
+SIGNS = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo", "Libra", "Scorpio", "Sagittarius",
+         "Capricorn", "Aquarius", "Pisces"]
+
+def _inputs(n: int = 256, seed: int = 11):
+    """name → (function, [args tuple, ...]). Inputs are seeded so runs are comparable."""
+    rnd = random.Random(seed)
+    births = [Birth(dateISO=f"{rnd.randint(1940, 2015)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+                    time=f"{rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}",
+                    tzOffset=rnd.choice([None, -5, -4, 0, 5.5, 9])) for _ in range(n)]
+    dts = [_dt_utc(b) for b in births]
+    lons = [rnd.uniform(0, 360) for _ in range(n)]
+    charts = [calc_birth(b) for b in births]
+    today = [f"{rnd.randint(2024, 2027)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}" for _ in range(n)]
+    inters = [(calc_interference(a, h, au, t), au) for (a, h, au), t in zip(charts, today)]
+    full = [calc_chart(b)[0] for b in births[:32]]
+    now = datetime(2025, 6, 1, 12, tzinfo=timezone.utc)
+    astro_txt = [f"{rnd.randint(0, 29)}° {rnd.randint(0, 59)}' {rnd.choice(SIGNS)} H{rnd.randint(1, 12)}"
+                 for _ in range(n)]
+    hd_txt = [f"Gate {rnd.randint(1, 64)}.{rnd.randint(1, 6)}, Color {rnd.randint(1, 6)} Tone {rnd.randint(1, 6)} "
+              f"Base {rnd.randint(1, 5)}" for _ in range(n)]
+    lines = [f"{rnd.choice(['Sun', 'Moon', 'Mars'])} {a}   {h}" for a, h in zip(astro_txt, hd_txt)]
+    lp = LineParser("Mind")
+    return {
+        "_dt_utc": (_dt_utc, [(b,) for b in births]),
+        "sun_longitude_approx": (sun_longitude_approx, [(d,) for d in dts]),
+        "sun_longitude": (sun_longitude, [(d,) for d in dts]),
+        "lon_to_sign_dms": (lon_to_sign_dms, [(x,) for x in lons]),
+        "sun_to_gate_line": (sun_to_gate_line, [(x,) for x in lons]),
+        "hd.resolve": (resolve, [(x,) for x in lons]),
+        "_aspect_score": (_aspect_score, [(rnd.uniform(-360, 360),) for _ in range(n)]),
+        "_triad_weights": (_triad_weights, [(rnd.uniform(-1, 1),) for _ in range(n)]),
+        "calc_birth": (calc_birth, [(b,) for b in births]),
+        "calc_interference": (calc_interference, [(a, h, au, t) for (a, h, au), t in zip(charts, today)]),
+        "plan_from_interference": (plan_from_interference, inters),
+        "calc_chart": (calc_chart, [(b,) for b in births[:32]]),
+        "interference_at": (interference_at, [(a, now) for a, _, _ in charts]),
+        "chart_interference_at": (chart_interference_at, [(c, now) for c in full]),
+        "parse_astro_text": (parse_astro_text, [(s,) for s in astro_txt]),
+        "parse_hd_text": (parse_hd_text, [(s,) for s in hd_txt]),
+        "parse_unified": (parse_unified, [("Heart", "Sun", a, h) for a, h in zip(astro_txt, hd_txt)]),
+        "LineParser.feed": (lp.feed, [(s,) for s in lines]),
+    }
+
+def _sample(fn, args, loops: int) -> float:
+    """Seconds for `loops` passes over `args`."""
+    gc_was = gc.isenabled()
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            for a in args:
+                fn(*a)
+        return time.perf_counter() - t0
+    finally:
+        if gc_was:
+            gc.enable()
+
+def calibrate(fn, args, min_time: float) -> int:
+    loops = 1
+    while _sample(fn, args, loops) < min_time:
+        loops *= 2
+    return loops
+
+def bench(fn, args, samples: int, warmups: int, min_time: float) -> dict:
+    loops = calibrate(fn, args, min_time)
+    for _ in range(warmups):
+        _sample(fn, args, loops)
+    calls = loops * len(args)
+    ns = [_sample(fn, args, loops) / calls * 1e9 for _ in range(samples)]
+    return {"median_ns": round(statistics.median(ns), 1), "mean_ns": round(statistics.fmean(ns), 1),
+            "stdev_ns": round(statistics.stdev(ns), 1) if len(ns) > 1 else 0.0, "min_ns": round(min(ns), 1),
+            "loops": loops, "calls_per_sample": calls, "samples": samples}
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def _previous(history: str, python: str):
+    """Latest history entry recorded with the same interpreter version, if any."""
+    if not os.path.exists(history):
+        return None
+    last = None
+    with open(history, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                if entry.get("python") == python:
+                    last = entry
+    return last
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-k", dest="filter", help="only benchmarks whose name contains this")
+    ap.add_argument("--list", action="store_true")
+    ap.add_argument("--samples", type=int, default=20)
+    ap.add_argument("--warmups", type=int, default=2)
+    ap.add_argument("--min-time", type=float, default=0.05, help="seconds per calibrated sample")
+    ap.add_argument("--history", default=os.path.join(HERE, "history", "micro.jsonl"))
+    ap.add_argument("--no-save", action="store_true", help="don't append this run to --history")
+    ap.add_argument("--fail-threshold", type=float, help="exit 1 if a median regresses by more than this fraction")
+    a = ap.parse_args(argv)
+
+    cases = _inputs()
+    names = [n for n in cases if not a.filter or a.filter in n]
+    if a.list:
+        print("\n".join(names))
+        return 0
+
+    python = f"{platform.python_implementation()} {platform.python_version()}"
+    prev = _previous(a.history, python)
+    prev_results = prev["results"] if prev else {}
+    results, regressions = {}, []
+    for name in names:
+        fn, args = cases[name]
+        r = results[name] = bench(fn, args, a.samples, a.warmups, a.min_time)
+        line = f"{name:24s} {r['median_ns']:>10.1f} ns/call  ±{r['stdev_ns']:.1f}"
+        old = prev_results.get(name)
+        if old:
+            delta = r["median_ns"] / old["median_ns"] - 1
+            line += f"   {delta:+.1%} vs {prev.get('commit') or 'previous'}"
+            if a.fail_threshold is not None and delta > a.fail_threshold:
+                regressions.append(f"{name}: {old['median_ns']} → {r['median_ns']} ns/call ({delta:+.1%})")
+        print(line, flush=True)
+
+    entry = {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"), "commit": _git_commit(),
+             "python": python, "machine": platform.machine(), "cpus": os.cpu_count(), "results": results}
+    if not a.no_save:
+        os.makedirs(os.path.dirname(os.path.abspath(a.history)), exist_ok=True)
+        with open(a.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    for msg in regressions:
+        print("REGRESSION", msg, file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# Throughput of engine.parsers vs the pre-tokenizer implementation
+#
+#   python bench/parse_bench.py [--n 20000] [--repeat 5]
+#
+# Builds a corpus of realistic pasted chart strings, checks that both
+# implementations return identical packets, then prints parses/sec as JSON.
+import argparse, json, os, random, sys, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from engine import parsers
+from engine.dataset import SIGNS
+import _legacy_parsers as legacy
+
+PLANETS = ["Sun", "Earth", "Moon", "North Node", "South Node", "Mercury", "Venus", "Mars",
+           "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto"]
+ABBR = ["Ar", "Ta", "Ge", "Cn", "Le", "Vi", "Li", "Sc", "Sg", "Cp", "Aq", "Pi"]
+
+def corpus(n: int, seed: int = 11):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        sign = rnd.choice(SIGNS) if rnd.random() < 0.8 else rnd.choice(ABBR)
+        astro = rnd.choice([
+            f"{rnd.randint(0,29)}° {rnd.randint(0,59)}' {rnd.randint(0,59)}\" {sign} H{rnd.randint(1,12)}",
+            f"{rnd.choice(PLANETS)}: {rnd.randint(0,29)} deg {rnd.randint(0,59)}' {sign}",
+            f"{rnd.randint(0,29)}°{rnd.randint(0,59)}' {sign}, house {rnd.randint(1,12)}",
+            f"{sign} {rnd.randint(0,29)}°  H {rnd.randint(1,12)}",
+        ])
+        g, l = rnd.randint(1, 64), rnd.randint(1, 6)
+        c, t, b = rnd.randint(1, 6), rnd.randint(1, 6), rnd.randint(1, 5)
+        hd = rnd.choice([
+            f"Gate {g}.{l}, Color {c} Tone {t} Base {b}",
+            f"{g}.{l}",
+            f"{rnd.choice(PLANETS)} {g}.{l} C{c} T{t} B{b}",
+            f"gate {g} line {l} color {c}",
+        ])
+        out.append({"field": rnd.choice(["Mind", "Heart", "Body"]), "planet": rnd.choice(PLANETS),
+                    "astro": astro, "hd": hd})
+    return out
+
+def _rate(fn, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter(); fn(items); best = min(best, time.perf_counter() - t)
+    return len(items) / best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    a = ap.parse_args()
+    items = corpus(a.n)
+
+    def old(xs):
+        return [legacy.parse_unified(x["field"], x["planet"], x["astro"], x["hd"]) for x in xs]
+    def new_each(xs):
+        return [parsers.parse_unified(x["field"], x["planet"], x["astro"], x["hd"]) for x in xs]
+
+    mismatches = sum(1 for p, q in zip(old(items), parsers.parse_many(items)) if p != q)
+    r_old, r_each, r_many = (_rate(f, items, a.repeat) for f in (old, new_each, parsers.parse_many))
+    print(json.dumps({
+        "corpus": a.n, "mismatches": mismatches,
+        "legacy_per_sec": round(r_old), "parse_unified_per_sec": round(r_each), "parse_many_per_sec": round(r_many),
+        "speedup": round(r_many / r_old, 2),
+    }, indent=2))
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
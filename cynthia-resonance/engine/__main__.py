@@ -1,9 +1,12 @@
-# Handy CLI for quick checks
+# Handy CLI for quick checks (`python -m engine bulk --help` for batch files)
 import json, sys
 from .birthcalc import Birth, calc_birth
 from .interference import calc_interference, plan_from_interference
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["bulk"]:
+        from .bulk import main
+        sys.exit(main(sys.argv[2:]))
     b = Birth(dateISO=sys.argv[1], time=sys.argv[2] if len(sys.argv)>2 else "12:00", tzOffset=float(sys.argv[3]) if len(sys.argv)>3 else 0)
     astro, hd, auric = calc_birth(b)
     inter = calc_interference(astro, hd, auric, None)
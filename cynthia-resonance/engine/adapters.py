@@ -5,6 +5,7 @@ OLLAMA = os.getenv("OLLAMA_BASE")
 COACH_MODEL = os.getenv("COACH_MODEL","phi")
 
 JSON_RE = re.compile(r"\{.*\}", re.S)
+_ASYNC_CLIENT: "httpx.AsyncClient | None" = None
 
 def _ollama_generate(model: str, prompt: str, timeout: float = 60.0) -> str:
     if not OLLAMA:
@@ -16,13 +17,23 @@ def _ollama_generate(model: str, prompt: str, timeout: float = 60.0) -> str:
         r.raise_for_status()
         return r.json().get("response","").strip()
 
-def maybe_narrate(plan: dict, mode: str = "Prime") -> dict:
-    """
-    Optional: turn plan JSON into a short coaching note.
-    Returns { text, model } or {} if Ollama not set.
-    """
+async def _ollama_generate_async(model: str, prompt: str, timeout: float = 60.0) -> str:
     if not OLLAMA:
-        return {}
+        return ""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        _ASYNC_CLIENT = httpx.AsyncClient(timeout=timeout)   # pooled connections, reused across requests
+    r = await _ASYNC_CLIENT.post(f"{OLLAMA}/api/generate", json={"model": model, "prompt": prompt, "stream": False})
+    r.raise_for_status()
+    return r.json().get("response","").strip()
+
+async def aclose() -> None:
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is not None:
+        await _ASYNC_CLIENT.aclose()
+        _ASYNC_CLIENT = None
+
+def _narration_prompt(plan: dict, mode: str) -> str:
     style = {
         "Venom":"Cut the fluff. Be sharp, honest, brief.",
         "Prime":"Action-forward, concrete step, confident.",
@@ -32,7 +43,9 @@ def maybe_narrate(plan: dict, mode: str = "Prime") -> dict:
     }.get(mode,"Prime")
     sys = f"You are Cynthia, a resonance coach. Style: {style}. Reply ONLY as JSON: {{\"text\":\"...\"}}."
     user = f"PLAN_JSON:\n{json.dumps(plan, ensure_ascii=False)}"
-    raw = _ollama_generate(COACH_MODEL, sys + "\n\n" + user)
+    return sys + "\n\n" + user
+
+def _narration(raw: str) -> dict:
     if not raw:
         return {}
     try:
@@ -41,3 +54,18 @@ def maybe_narrate(plan: dict, mode: str = "Prime") -> dict:
         return {"text": obj.get("text", raw).strip(), "model": COACH_MODEL}
     except Exception:
         return {"text": raw, "model": COACH_MODEL}
+
+def maybe_narrate(plan: dict, mode: str = "Prime") -> dict:
+    """
+    Optional: turn plan JSON into a short coaching note.
+    Returns { text, model } or {} if Ollama not set.
+    """
+    if not OLLAMA:
+        return {}
+    return _narration(_ollama_generate(COACH_MODEL, _narration_prompt(plan, mode)))
+
+async def maybe_narrate_async(plan: dict, mode: str = "Prime") -> dict:
+    """`maybe_narrate` on a shared httpx.AsyncClient, for async handlers."""
+    if not OLLAMA:
+        return {}
+    return _narration(await _ollama_generate_async(COACH_MODEL, _narration_prompt(plan, mode)))
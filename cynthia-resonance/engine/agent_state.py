@@ -0,0 +1,195 @@
+# Per-user Little Guys state: unlocked/dormant bitsets + level bytes per city,
+# backed by SQLite with batched writes.
+from __future__ import annotations
+import sqlite3, threading, time
+from array import array
+from collections import OrderedDict
+from threading import RLock
+from typing import Dict, Any, Iterable, List, Optional
+from .dataset import FIELDS
+from .little_guys import RosterService, STATES, _agent
+
+MAX_LEVEL = 255
+
+def _default_masks():
+    unlocked = dormant = 0
+    for g in range(1, 65):
+        if g % 4 == 0:
+            dormant |= 1 << (g - 1)
+        else:
+            unlocked |= 1 << (g - 1)
+    return unlocked, dormant
+
+_UNLOCKED0, _DORMANT0 = _default_masks()
+_LEVELS0 = bytes(1 + (g % 3) for g in range(1, 65))
+
+class UserAgents:
+    """
+    One user's agents. Bit g-1 of `unlocked[c]` / `dormant[c]` is gate g in city c
+    (dormant wins; neither bit = locked); `levels[c*64 + g-1]` is its level.
+    Defaults reproduce the shared roster's g%4 / g%3 rule.
+    """
+    __slots__ = ("cities", "unlocked", "dormant", "levels")
+
+    def __init__(self, cities: List[str], unlocked: Optional[bytes] = None, dormant: Optional[bytes] = None,
+                 levels: Optional[bytes] = None):
+        n = len(cities)
+        self.cities = cities
+        self.unlocked = array("Q", unlocked) if unlocked is not None else array("Q", [_UNLOCKED0] * n)
+        self.dormant = array("Q", dormant) if dormant is not None else array("Q", [_DORMANT0] * n)
+        self.levels = bytearray(levels) if levels is not None else bytearray(_LEVELS0 * n)
+
+    def state_index(self, ci: int, g: int) -> int:
+        bit = 1 << (g - 1)
+        return 1 if self.dormant[ci] & bit else (0 if self.unlocked[ci] & bit else 2)
+
+    def set_state(self, ci: int, g: int, state: str) -> None:
+        bit = 1 << (g - 1)
+        if state == "unlocked":
+            self.unlocked[ci] |= bit; self.dormant[ci] &= ~bit
+        elif state == "dormant":
+            self.unlocked[ci] |= bit; self.dormant[ci] |= bit
+        elif state == "locked":
+            self.unlocked[ci] &= ~bit; self.dormant[ci] &= ~bit
+        else:
+            raise ValueError(f"state must be one of {STATES}")
+
+    def compact(self) -> Dict[str, Any]:
+        """The whole roster state as three array reads (hex masks + level lists)."""
+        return {
+            "cities": self.cities,
+            "unlocked": [f"{m:016x}" for m in self.unlocked],
+            "dormant": [f"{m:016x}" for m in self.dormant],
+            "levels": [list(self.levels[i*64:(i+1)*64]) for i in range(len(self.cities))],
+        }
+
+class _UserCity:
+    """Roster view of one city of a `UserAgents` (see little_guys.RosterService)."""
+    __slots__ = ("name", "_ua", "_ci")
+
+    def __init__(self, ua: UserAgents, ci: int):
+        self.name, self._ua, self._ci = ua.cities[ci], ua, ci
+
+    def state_of(self, g: int) -> int:
+        return self._ua.state_index(self._ci, g)
+
+    def level_of(self, g: int) -> int:
+        return self._ua.levels[self._ci * 64 + g - 1]
+
+    def agent(self, g: int) -> Dict[str, Any]:
+        return _agent(self, g)
+
+class AgentStateStore:
+    """
+    In-memory `UserAgents` per user with a SQLite backing. Mutations mark users
+    dirty; dirty rows are written in one transaction every `batch` mutations or
+    `interval` seconds (a background thread, started with the first mutation,
+    covers writes that no later mutation follows), and on `flush()` / `close()`.
+    """
+    def __init__(self, path: str = ":memory:", cities: Iterable[str] = FIELDS, batch: int = 256,
+                 interval: float = 2.0, max_users: int = 50_000):
+        self.cities = list(cities)
+        self.batch, self.interval, self.max_users = batch, interval, max_users
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS agent_state ("
+                         "user TEXT PRIMARY KEY, unlocked BLOB, dormant BLOB, levels BLOB)")
+        self._users: "OrderedDict[str, UserAgents]" = OrderedDict()
+        self._rosters: Dict[str, RosterService] = {}
+        self._dirty: set = set()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = RLock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def get(self, user: str) -> UserAgents:
+        with self._lock:
+            ua = self._users.get(user)
+            if ua is None:
+                row = self._db.execute("SELECT unlocked, dormant, levels FROM agent_state WHERE user=?",
+                                       (user,)).fetchone()
+                ua = UserAgents(self.cities, *row) if row else UserAgents(self.cities)
+                self._users[user] = ua
+                self._evict()
+            self._users.move_to_end(user)
+            return ua
+
+    def roster(self, user: str) -> RosterService:
+        """ETag-cached roster service over this user's state (invalidated on mutation)."""
+        with self._lock:
+            svc = self._rosters.get(user)
+            if svc is None:
+                ua = self.get(user)
+                svc = self._rosters[user] = RosterService(self.cities, source=lambda name: _UserCity(ua, self.cities.index(name)))
+            return svc
+
+    def apply(self, user: str, changes: Iterable[Dict[str, Any]]) -> UserAgents:
+        """Apply [{city, gate, state?, level?}, ...] atomically for `user` (ValueError on bad input)."""
+        with self._lock:
+            ua = self.get(user)
+            ops = []
+            for ch in changes:
+                city, g = ch.get("city"), ch.get("gate")
+                if city not in self.cities:
+                    raise ValueError(f"unknown city {city!r}")
+                if not isinstance(g, int) or not 1 <= g <= 64:
+                    raise ValueError(f"gate must be 1..64, got {g!r}")
+                if ch.get("state") is not None and ch["state"] not in STATES:
+                    raise ValueError(f"state must be one of {STATES}")
+                lvl = ch.get("level")
+                if lvl is not None and not (isinstance(lvl, int) and 0 <= lvl <= MAX_LEVEL):
+                    raise ValueError(f"level must be 0..{MAX_LEVEL}")
+                ops.append((self.cities.index(city), g, ch.get("state"), lvl))
+            for ci, g, state, lvl in ops:
+                if state is not None:
+                    ua.set_state(ci, g, state)
+                if lvl is not None:
+                    ua.levels[ci * 64 + g - 1] = lvl
+            if ops:
+                self._start_flusher()
+                self._dirty.add(user)
+                self._pending += len(ops)
+                if user in self._rosters:
+                    self._rosters[user].invalidate()
+                if self._pending >= self.batch or time.monotonic() - self._last_flush >= self.interval:
+                    self.flush()
+            return ua
+
+    def flush(self) -> int:
+        """Write all dirty users in one transaction; returns how many rows were written."""
+        with self._lock:
+            rows = [(u, self._users[u].unlocked.tobytes(), self._users[u].dormant.tobytes(), bytes(self._users[u].levels))
+                    for u in self._dirty]
+            if rows:
+                with self._db:
+                    self._db.executemany("INSERT OR REPLACE INTO agent_state VALUES (?,?,?,?)", rows)
+            self._dirty.clear()
+            self._pending = 0
+            self._last_flush = time.monotonic()
+            return len(rows)
+
+    def _start_flusher(self) -> None:
+        if self._flusher is None and self.interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="agent-state-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.interval / 2):
+            with self._lock:
+                if self._dirty and time.monotonic() - self._last_flush >= self.interval:
+                    self.flush()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        self._db.close()
+
+    def _evict(self) -> None:
+        while len(self._users) > self.max_users:
+            user = next(iter(self._users))
+            if user in self._dirty:
+                self.flush()
+            self._users.popitem(last=False)
+            self._rosters.pop(user, None)
@@ -1,6 +1,17 @@
-# Lightweight astro helpers (fallback Sun position by date)
-from datetime import datetime, timezone
+# Lightweight astro helpers: Sun position by date (Chebyshev ephemeris, or the
+# legacy linear fallback with SUN_MODEL=approx) and sign/DMS formatting.
+import os
+from datetime import datetime, timedelta, timezone
 from .dataset import SIGNS
+from . import ephemeris
+
+try:
+    import numpy as np
+except ImportError:  # vectorized helpers fall back to per-item loops
+    np = None
+
+SUN_RATE = 360.0/365.2422   # deg/day of the fallback model
+SUN_MODEL = os.getenv("SUN_MODEL", "ephemeris")   # "approx" → legacy Mar 20 linear model
 
 def sun_longitude_approx(dt_utc: datetime) -> float:
     """
@@ -10,9 +21,46 @@ def sun_longitude_approx(dt_utc: datetime) -> float:
     year = dt_utc.year
     spring = datetime(year, 3, 20, tzinfo=timezone.utc)  # ~ Aries 0°
     days = (dt_utc - spring).total_seconds() / 86400.0
-    lon = (days * (360.0/365.2422)) % 360.0
+    lon = (days * SUN_RATE) % 360.0
     return (lon + 360.0) % 360.0
 
+def sun_longitude_approx_array(ts):
+    """
+    `sun_longitude_approx` over a sequence of UTC unix timestamps (seconds).
+    Returns a NumPy array when NumPy is available, else a list.
+    """
+    if np is None:
+        return [sun_longitude_approx(datetime.fromtimestamp(t, timezone.utc)) for t in ts]
+    t = np.asarray(ts, dtype=np.float64)
+    year = t.astype("datetime64[s]").astype("datetime64[Y]")
+    spring = (year.astype("datetime64[M]") + 2).astype("datetime64[D]") + 19   # Mar 20
+    days = (t - spring.astype("datetime64[s]").astype(np.float64)) / 86400.0
+    return np.mod(days * SUN_RATE, 360.0)
+
+def sun_crossing_approx(target_lon: float, after: datetime) -> datetime:
+    """
+    First UTC moment >= `after` at which the fallback Sun reaches `target_lon`.
+    The model re-anchors its equinox every Jan 1, so the answer is capped at the
+    next New Year: callers re-evaluate from there.
+    """
+    delta = (target_lon - sun_longitude_approx(after)) % 360.0
+    hit = after + timedelta(days=delta / SUN_RATE)
+    year_end = datetime(after.year + 1, 1, 1, tzinfo=timezone.utc)
+    return min(hit, year_end)
+
+def _ephemeris_array(ts):
+    if np is None:
+        return [ephemeris.sun_longitude(datetime.fromtimestamp(t, timezone.utc)) for t in ts]
+    return ephemeris.sun_longitude_ts_array(ts)
+
+# Model dispatch, bound once at import:
+#   sun_longitude(dt_utc) → deg, sun_longitude_array(unix_seconds) → array,
+#   sun_crossing_utc(target_lon, after) → first datetime >= after at target_lon
+if SUN_MODEL == "approx":
+    sun_longitude, sun_longitude_array, sun_crossing_utc = sun_longitude_approx, sun_longitude_approx_array, sun_crossing_approx
+else:
+    sun_longitude, sun_longitude_array, sun_crossing_utc = ephemeris.sun_longitude, _ephemeris_array, ephemeris.sun_crossing
+
 def lon_to_sign_dms(lon: float) -> tuple[str, int, int, int]:
     sign_i = int(lon // 30)
     sign = SIGNS[sign_i]
@@ -26,3 +74,17 @@ def lon_to_sign_dms(lon: float) -> tuple[str, int, int, int]:
     if deg == 30: deg, sign_i = 0, (sign_i + 1) % 12
     sign = SIGNS[sign_i]
     return sign, deg, minute, second
+
+def lon_to_sign_dms_array(lon):
+    """`lon_to_sign_dms` over a NumPy array → (sign_index, deg, minute, second) int arrays."""
+    lon = np.asarray(lon, dtype=np.float64)
+    sign_i = (lon // 30).astype(np.int64)
+    deg_total = np.mod(lon, 30.0)
+    deg = deg_total.astype(np.int64)
+    minutes_f = (deg_total - deg) * 60.0
+    minute = minutes_f.astype(np.int64)
+    second = np.round((minutes_f - minute) * 60.0).astype(np.int64)
+    c = second == 60; second[c] = 0; minute[c] += 1
+    c = minute == 60; minute[c] = 0; deg[c] += 1
+    c = deg == 30; deg[c] = 0; sign_i[c] += 1
+    return np.mod(sign_i, 12), deg, minute, second
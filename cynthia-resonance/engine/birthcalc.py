@@ -1,10 +1,9 @@
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from dateutil import tz
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional, Tuple, Dict, Any
-from .astro import sun_longitude_approx, lon_to_sign_dms
-from .hd import sun_to_gate_line
-from .dataset import GATE_META
+from .astro import sun_longitude, lon_to_sign_dms, sun_longitude_array, lon_to_sign_dms_array
+from .hd import sun_to_gate_line, sun_to_gate_line_array
+from .dataset import GATE_NAME, GATE_ELEMENT
 
 @dataclass
 class Birth:
@@ -14,17 +13,81 @@ class Birth:
     lat: Optional[float] = None
     lon: Optional[float] = None
 
+_UTC = timezone.utc
+_OFFSETS: Dict[float, timedelta] = {}     # tzOffset hours → interned timedelta
+
+def _offset_seconds(hours):
+    """tzOffset hours → whole seconds, rounded (-4.3 * 3600 is -15479.999...); scalar or array."""
+    if isinstance(hours, (int, float)):
+        return int(round(hours * 3600))
+    import numpy as np
+    return np.round(np.asarray(hours, dtype=np.float64) * 3600).astype(np.int64)
+
+def _offset(hours: float) -> timedelta:
+    td = _OFFSETS.get(hours)
+    if td is None:
+        td = timedelta(seconds=_offset_seconds(hours))
+        if len(_OFFSETS) < 1024:
+            _OFFSETS[hours] = td
+    return td
+
 def _dt_utc(b: Birth) -> datetime:
-    # Best effort: date + time + tzOffset → UTC
-    date_str = b.dateISO.strip()
-    time_str = (b.time or "12:00").strip()
-    hh, mm = [int(x) for x in time_str.split(":")]
-    if b.tzOffset is not None:
-        tzinfo = tz.tzoffset(None, int(b.tzOffset * 3600))
-    else:
-        tzinfo = timezone.utc
-    local_dt = datetime.fromisoformat(f"{date_str}T{hh:02d}:{mm:02d}:00").replace(tzinfo=tzinfo)
-    return local_dt.astimezone(timezone.utc)
+    # Best effort: date + time + tzOffset → UTC. Civil fields go straight into a
+    # UTC datetime and the offset is subtracted; no tzinfo objects per call.
+    d = date.fromisoformat(b.dateISO.strip())
+    hh, mm = [int(x) for x in (b.time or "12:00").strip().split(":")]
+    dt = datetime(d.year, d.month, d.day, hh, mm, tzinfo=_UTC)
+    return dt - _offset(b.tzOffset) if b.tzOffset else dt
+
+_MDAYS = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def _parts(b: Birth) -> Optional[Tuple[int,int,int,int,int,float]]:
+    """(y, m, d, hh, mm, tzOffset) from a Birth, or None if it does not parse."""
+    try:
+        y, m, d = (int(x) for x in b.dateISO.strip()[:10].split("-"))
+        hh, mm = (int(x) for x in (b.time or "12:00").strip().split(":"))
+        off = float(b.tzOffset or 0.0)
+    except (ValueError, AttributeError):
+        return None
+    if not (1 <= m <= 12 and 1 <= d <= _MDAYS[m] and 0 <= hh < 24 and 0 <= mm < 60):
+        return None
+    if m == 2 and d == 29 and not (y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)):
+        return None
+    return y, m, d, hh, mm, off
+
+def _epoch_columns(y, m, d, hh, mm, off):
+    """UTC unix seconds from integer civil date/time arrays (days-from-civil, proleptic Gregorian)."""
+    import numpy as np
+    y = np.asarray(y, dtype=np.int64); m = np.asarray(m, dtype=np.int64); d = np.asarray(d, dtype=np.int64)
+    y = y - (m <= 2)
+    era = np.floor_divide(y, 400)
+    yoe = y - era * 400
+    doy = (153 * (m + np.where(m > 2, -3, 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+    return (days * 86400 + np.asarray(hh, dtype=np.int64) * 3600 + np.asarray(mm, dtype=np.int64) * 60
+            - _offset_seconds(off))
+
+def calc_birth_columns(births) -> Dict[str,Any]:
+    """
+    Batch `calc_birth` for the natal Sun as NumPy columns (needs NumPy).
+    Rows that fail to parse get ok=False and zeroed values.
+    """
+    import numpy as np
+    parts = [_parts(b) for b in births]
+    ok = np.array([p is not None for p in parts], dtype=bool)
+    cols = list(zip(*[p or (1970, 1, 1, 0, 0, 0.0) for p in parts])) or [()] * 6
+    utc = _epoch_columns(*cols)
+    lon = np.asarray(sun_longitude_array(utc), dtype=np.float64)
+    sign, deg, minute, second = lon_to_sign_dms_array(lon)
+    gate, line = sun_to_gate_line_array(lon)
+    out = {"ok": ok, "utc": utc, "sun_lon": lon, "sign": sign.astype(np.int8), "degree": deg.astype(np.int8),
+           "minute": minute.astype(np.int8), "second": second.astype(np.int8),
+           "gate": gate.astype(np.int8), "line": line.astype(np.int8)}
+    for k, v in out.items():
+        if k != "ok":
+            v[~ok] = 0
+    return out
 
 def _today_utc(dateISO: Optional[str] = None) -> datetime:
     return (datetime.fromisoformat(dateISO).replace(tzinfo=timezone.utc)
@@ -33,19 +96,19 @@ def _today_utc(dateISO: Optional[str] = None) -> datetime:
 def calc_birth(b: Birth) -> Tuple[Dict[str,Any], Dict[str,Any], Dict[str,Any]]:
     """
     Returns (astro, hd, auric) for the natal Sun, minutes/seconds included.
-    Fallback model; replace later with SharpAstrology + HDKit adapters if desired.
+    Sun from the Chebyshev ephemeris (SUN_MODEL=approx for the legacy linear model);
+    swap in SharpAstrology + HDKit adapters for other bodies if desired.
     """
     dt_utc = _dt_utc(b)
-    ecl = sun_longitude_approx(dt_utc)
+    ecl = sun_longitude(dt_utc)
     sign, deg, minute, second = lon_to_sign_dms(ecl)
     astro = {"placements":[{"planet":"Sun","sign":sign,"degree":deg,"minute":minute,"second":second,"house":None}]}
     gate, line = sun_to_gate_line(ecl)
     hd = {"sun":{"gate":gate,"line":line}}
-    meta = GATE_META.get(gate, {})
     auric = {
         "archetype":{
-            "gate":gate,"line":line,"name":meta.get("name"),
-            "element":meta.get("element")
+            "gate":gate,"line":line,"name":GATE_NAME[gate],
+            "element":GATE_ELEMENT[gate]
         },
         "utility":{
             "plane":"Body","stance":"personal","expression":"action"
@@ -58,3 +121,19 @@ def calc_birth(b: Birth) -> Tuple[Dict[str,Any], Dict[str,Any], Dict[str,Any]]:
         "coherence":{"score":9,"mode":"Prime","sparkle":False}
     }
     return astro, hd, auric
+
+_HD_KEYS = ("gate", "line", "color", "tone", "base")
+
+def calc_chart(b: Birth) -> Tuple[Dict[str,Any], Dict[str,Any]]:
+    """(astro, hd) with every body in planets.BODIES (Sun first); needs NumPy."""
+    from .planets import placements_at
+    placements = placements_at(_dt_utc(b))
+    hd = {p["planet"]: {k: p[k] for k in _HD_KEYS} for p in placements}
+    return {"placements": placements}, hd
+
+def calc_design(b: Birth) -> Tuple[str, Dict[str,Any], Dict[str,Any]]:
+    """(design_utc ISO, astro, hd) at the Design moment, 88° of solar arc before birth; needs NumPy."""
+    from .design import design_placements
+    d = design_placements(_dt_utc(b))
+    hd = {p["planet"]: {k: p[k] for k in _HD_KEYS} for p in d["placements"]}
+    return d["utc"], {"placements": d["placements"]}, hd
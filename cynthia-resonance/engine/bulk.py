@@ -0,0 +1,209 @@
+# Bulk natal-chart computation: stream CSV/NDJSON births in chunks → columnar parts
+#
+#   python -m engine bulk births.csv out/ [--chunk 50000] [--format npz|parquet|arrow] [--workers N]
+#
+# Input columns/keys: dateISO, time, tzOffset (optional: id, lat, lon).
+# With --workers N > 1 the input is split into chunk-sized shards by byte offset
+# (one record per line), each worker reads and writes its own shard, and the
+# manifest advances in input order; lookup tables reach workers via shared memory.
+# Output directory layout:
+#   out/part-00000.npz ...  one file per chunk, columns below (np.load(..., allow_pickle=False))
+#   out/manifest.json       schema, parts, rows_done/rows_failed — rewritten atomically
+#                           after each part and doubling as the resume checkpoint
+# Columns (one entry per input row, in input order):
+#   row int64 (0-based input row) · id str (only if the input has ids) · ok bool (row parsed)
+#   utc int64 (unix seconds) · sun_lon float64 (deg) · sign int8 (index into SIGNS)
+#   degree/minute/second int8 · gate int8 (1..64) · line int8 (1..6)
+#   element int8 (index into manifest "elements")
+import argparse, csv, io, json, os, sys, time
+from itertools import islice
+from typing import Dict, Any, Iterator, List
+from .birthcalc import Birth, calc_birth_columns
+from .dataset import SIGNS
+from . import shared_tables
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+COLUMNS = {
+    "row": "int64", "id": "str", "ok": "bool", "utc": "int64", "sun_lon": "float64",
+    "sign": "int8", "degree": "int8", "minute": "int8", "second": "int8", "gate": "int8", "line": "int8",
+    "element": "int8",
+}
+MANIFEST = "manifest.json"
+
+def _float(x):
+    return float(x) if x not in (None, "") else None
+
+def _is_ndjson(path: str) -> bool:
+    return path.endswith((".ndjson", ".jsonl"))
+
+def _rows(path: str) -> Iterator[Dict[str,Any]]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if _is_ndjson(path):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+def _shards(path: str, chunk: int, skip: int):
+    """(csv header, [(byte offset, rows)]) for the rows after `skip`, one record per line."""
+    header, shards = None, []
+    with open(path, "rb") as f:
+        if not _is_ndjson(path):
+            header = next(csv.reader([f.readline().decode("utf-8-sig")]), [])
+        i, off, start, n = 0, f.tell(), None, 0
+        for line in iter(f.readline, b""):
+            if line.strip():
+                if i >= skip:
+                    if start is None:
+                        start = off
+                    n += 1
+                    if n == chunk:
+                        shards.append((start, n)); start, n = None, 0
+                i += 1
+            off += len(line)
+        if n:
+            shards.append((start, n))
+    return header, shards
+
+def _read_shard(path: str, header, offset: int, nrows: int) -> List[Dict[str,Any]]:
+    with open(path, "rb") as raw:
+        raw.seek(offset)
+        f = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        lines = (l for l in f if l.strip())
+        if header is None:
+            return [json.loads(l) for l in islice(lines, nrows)]
+        return list(csv.DictReader(islice(lines, nrows), fieldnames=header))
+
+def _work(task) -> Dict[str,Any]:
+    src, header, offset, nrows, first_row, idx, out_dir, fmt = task
+    rows = _read_shard(src, header, offset, nrows)
+    cols = compute_chunk(rows, first_row)
+    return _part(_write_part(out_dir, idx, cols, fmt), first_row, cols)
+
+def _part(name: str, first_row: int, cols: Dict[str,Any]) -> Dict[str,Any]:
+    """Manifest entry for a written part; `failed` counts rows that did not parse (ok == False)."""
+    n = len(cols["row"])
+    return {"file": name, "first_row": first_row, "rows": n, "failed": n - int(np.count_nonzero(cols["ok"]))}
+
+def _birth(r: Dict[str,Any]) -> Birth:
+    return Birth(dateISO=str(r.get("dateISO") or ""), time=r.get("time") or None,
+                 tzOffset=_float(r.get("tzOffset")), lat=_float(r.get("lat")), lon=_float(r.get("lon")))
+
+def compute_chunk(rows: List[Dict[str,Any]], first_row: int) -> Dict[str,Any]:
+    cols = calc_birth_columns([_birth(r) for r in rows])
+    cols["row"] = np.arange(first_row, first_row + len(rows), dtype=np.int64)
+    cols["element"] = shared_tables.tables()["gate_element"][cols["gate"]].astype(np.int8)
+    if rows and "id" in rows[0]:
+        cols["id"] = np.array([str(r.get("id") or "") for r in rows])
+    return cols
+
+def _write_part(out_dir: str, idx: int, cols: Dict[str,Any], fmt: str) -> str:
+    name = f"part-{idx:05d}.{fmt}"
+    tmp = os.path.join(out_dir, name + ".tmp")
+    if fmt == "npz":
+        with open(tmp, "wb") as f:
+            np.savez(f, **cols)
+    else:
+        import pyarrow as pa
+        table = pa.table(cols)
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(table, tmp)
+        else:
+            with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as w:
+                w.write_table(table)
+    os.replace(tmp, os.path.join(out_dir, name))
+    return name
+
+def _save_manifest(out_dir: str, manifest: Dict[str,Any]) -> None:
+    tmp = os.path.join(out_dir, MANIFEST + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST))
+
+def _load_manifest(out_dir: str) -> Dict[str,Any]:
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def run_bulk(src: str, out_dir: str, chunk: int = 50_000, fmt: str = "npz", resume: bool = True,
+             workers: int = 1, log=sys.stderr) -> Dict[str,Any]:
+    """
+    Stream `src` through `calc_birth_columns` chunk by chunk; memory is bounded by
+    `chunk` (times `workers` when sharding across processes).
+    """
+    if np is None:
+        raise RuntimeError("bulk mode needs numpy (pip install numpy)")
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = _load_manifest(out_dir) if resume else {}
+    if manifest and (manifest.get("input") != os.path.abspath(src) or manifest.get("format") != fmt):
+        raise RuntimeError(f"{out_dir} holds a checkpoint for another input/format; pass --no-resume")
+    manifest = manifest or {"input": os.path.abspath(src), "format": fmt, "columns": COLUMNS,
+                            "signs": SIGNS, "elements": shared_tables.ELEMENTS, "parts": [], "rows_done": 0, "complete": False}
+    manifest.setdefault("rows_failed", 0)   # checkpoints written before the count existed
+    done = manifest["rows_done"]
+    if done:
+        print(f"resuming after {done} rows", file=log)
+
+    t0 = time.perf_counter(); n = 0
+    def _done(part):
+        nonlocal done, n
+        manifest["parts"].append(part)
+        done += part["rows"]; n += part["rows"]
+        manifest["rows_done"] = done
+        manifest["rows_failed"] += part["failed"]
+        _save_manifest(out_dir, manifest)
+        print(f"{done} rows, {manifest['rows_failed']} failed ({n/(time.perf_counter() - t0):,.0f} rows/s)", file=log)
+
+    if workers > 1:
+        import multiprocessing as mp
+        header, shards = _shards(src, chunk, done)
+        tasks, first = [], done
+        for i, (off, nrows) in enumerate(shards):
+            tasks.append((src, header, off, nrows, first, len(manifest["parts"]) + i, out_dir, fmt))
+            first += nrows
+        shm, spec = shared_tables.share(shared_tables.tables())
+        try:
+            with mp.Pool(workers, initializer=shared_tables.attach, initargs=(spec,)) as pool:
+                for part in pool.imap(_work, tasks):   # ordered: the manifest only ever covers a prefix
+                    _done(part)
+        finally:
+            shm.close(); shm.unlink()
+    else:
+        rows = islice(_rows(src), done, None)
+        while True:
+            batch = list(islice(rows, chunk))
+            if not batch:
+                break
+            cols = compute_chunk(batch, done)
+            _done(_part(_write_part(out_dir, len(manifest["parts"]), cols, fmt), done, cols))
+
+    dt = time.perf_counter() - t0
+    manifest["complete"] = True
+    _save_manifest(out_dir, manifest)
+    summary = {"rows": n, "rows_total": done, "rows_failed": manifest["rows_failed"], "seconds": round(dt, 3),
+               "rows_per_sec": round(n / dt, 1) if dt > 0 else None, "parts": len(manifest["parts"]),
+               "workers": workers}
+    print(json.dumps(summary), file=log)
+    return summary
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m engine bulk", description="Batch natal charts → columnar files")
+    ap.add_argument("input", help="CSV (header row) or .ndjson/.jsonl of births")
+    ap.add_argument("out_dir")
+    ap.add_argument("--chunk", type=int, default=50_000, help="rows per part (bounds memory)")
+    ap.add_argument("--format", choices=["npz", "parquet", "arrow"], default="npz")
+    ap.add_argument("--workers", type=int, default=1, help="worker processes (shards the input)")
+    ap.add_argument("--no-resume", dest="resume", action="store_false", help="ignore an existing checkpoint")
+    a = ap.parse_args(argv)
+    try:
+        run_bulk(a.input, a.out_dir, a.chunk, a.format, a.resume, a.workers)
+    except RuntimeError as e:
+        ap.exit(2, f"error: {e}\n")
@@ -0,0 +1,147 @@
+# Composite / compatibility: rank how well one cohort's natal charts sit with
+# another's, with the same harmony as chart_interference_at (the other person's
+# chart plays the transit).
+#
+# For users a, b with body longitudes a_k, b_l and weights w_k, w_l the score is
+#
+#   H(a, b) = Σ_kl w_k w_l f(b_l - a_k) / Σ_kl w_k w_l,     f = _aspect_score
+#
+# f is an even 360°-periodic function, so with its cosine series
+# f(d) = c_0 + Σ_m c_m cos(m d) the double sum separates:
+#
+#   H(a, b) = c_0 + Σ_m c_m (C_m(a) C_m(b) + S_m(a) S_m(b))
+#
+# where C_m(a) = Σ_k w_k cos(m a_k) / Σ_k w_k (S_m likewise). Each chart becomes
+# one row of 2 * HARMONICS + 1 features, and the pairwise matrix is a plain
+# matrix product, evaluated block by block so only a block of scores and the
+# running top-k per user are ever held. With 48 harmonics the series matches
+# _aspect_score to ~1e-9 (bench/compat_bench.py checks it against the direct sum).
+# Needs NumPy.
+from __future__ import annotations
+from typing import Optional, Sequence, Tuple
+from .interference import BODY_WEIGHT, _aspect_score_array
+from . import planets
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HARMONICS = 48
+_SERIES = None
+
+def _series():
+    """Cosine coefficients c_0..c_HARMONICS of _aspect_score, from a 0.1° FFT."""
+    global _SERIES
+    if _SERIES is None:
+        if np is None:
+            raise RuntimeError("engine.composite needs NumPy")
+        n = 3600
+        spec = np.fft.rfft(_aspect_score_array(np.arange(n) * (360.0 / n))).real / n
+        _SERIES = np.concatenate([spec[:1], 2.0 * spec[1:HARMONICS + 1]])
+    return _SERIES
+
+def _scale():
+    c = _series()
+    return np.concatenate([c, c[1:]])
+
+def _lons_weights(lons, weights: Optional[Sequence[float]]):
+    """(n, K) longitudes and (n, K) weights; NaN longitudes (unknown bodies) get weight 0."""
+    lon = np.asarray(lons, dtype=np.float64)
+    if lon.ndim == 1:
+        lon = lon[:, None]
+    if weights is None:
+        weights = ([BODY_WEIGHT[n] for n in planets.BODIES] if lon.shape[1] == len(planets.BODIES)
+                   else np.ones(lon.shape[1]))
+    w = np.broadcast_to(np.asarray(weights, dtype=np.float64), lon.shape).copy()
+    missing = np.isnan(lon)
+    w[missing] = 0.0
+    return np.where(missing, 0.0, lon), w
+
+def features(lons, weights: Optional[Sequence[float]] = None, scaled: bool = False):
+    """
+    (n, 2 * HARMONICS + 1) chart features: [1, C_1..C_H, S_1..S_H]. `lons` is
+    (n,) Sun longitudes or (n, K) body longitudes (columns as planets.BODIES
+    get BODY_WEIGHT by default); rows with no known body are NaN. With `scaled` the series coefficients are
+    folded in, so scores = features(a, scaled=True) @ features(b).T.
+    """
+    lon, w = _lons_weights(lons, weights)
+    total = w.sum(axis=1, keepdims=True)
+    w = np.divide(w, total, out=np.zeros_like(w), where=total > 0)
+    m = np.arange(1, HARMONICS + 1)
+    out = np.empty((len(lon), 2 * HARMONICS + 1))
+    out[:, 0] = np.where(total[:, 0] > 0, 1.0, np.nan)                        # no known body: scores NaN
+    step = max(1, 2**20 // (lon.shape[1] * HARMONICS))          # bound the (rows, K, H) temporary to ~8 MB
+    for r0 in range(0, len(lon), step):
+        ang = np.radians(lon[r0:r0 + step])[:, :, None] * m                  # (rows, K, H)
+        out[r0:r0 + step, 1:HARMONICS + 1] = np.einsum("nk,nkh->nh", w[r0:r0 + step], np.cos(ang))
+        out[r0:r0 + step, HARMONICS + 1:] = np.einsum("nk,nkh->nh", w[r0:r0 + step], np.sin(ang))
+    if scaled:
+        out *= _scale()
+    return out
+
+def pair_scores(a_lons, b_lons, weights: Optional[Sequence[float]] = None):
+    """Full (n_a, n_b) harmony matrix by the direct double sum; for small inputs and checks."""
+    a, wa = _lons_weights(a_lons, weights)
+    b, wb = _lons_weights(b_lons, weights)
+    f = _aspect_score_array(b[None, :, None, :] - a[:, None, :, None])          # (n_a, n_b, K, L)
+    w = wa[:, None, :, None] * wb[None, :, None, :]
+    return (f * w).sum(axis=(2, 3)) / w.sum(axis=(2, 3))
+
+def top_k(a_lons, b_lons=None, k: int = 10, weights: Optional[Sequence[float]] = None,
+          block: int = 1024) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Best `k` partners in `b_lons` for every chart in `a_lons` → (index, score),
+    both (n_a, k), sorted by descending harmony. With `b_lons` None the cohort
+    is matched against itself and nobody is their own partner. Charts with
+    no known body score -inf. Scores are
+    computed `block` × `block` at a time; memory is O(block² + n_a · k).
+    """
+    same = b_lons is None
+    fb = features(a_lons if same else b_lons, weights)
+    fa = fb * _scale() if same else features(a_lons, weights, scaled=True)
+    n_a, n_b = len(fa), len(fb)
+    k = max(0, min(k, n_b - 1 if same else n_b))
+    idx = np.zeros((n_a, k), dtype=np.int64)
+    score = np.full((n_a, k), -np.inf)
+    if k == 0:
+        return idx, score
+    for i0 in range(0, n_a, block):
+        i1 = min(i0 + block, n_a)
+        best_i, best_s = idx[i0:i1], score[i0:i1]
+        for j0 in range(0, n_b, block):
+            s = fa[i0:i1] @ fb[j0:j0 + block].T
+            s[np.isnan(s)] = -np.inf
+            if same and j0 < i1 and i0 < j0 + s.shape[1]:                      # block holds the diagonal
+                r = np.arange(max(i0, j0), min(i1, j0 + s.shape[1]))
+                s[r - i0, r - j0] = -np.inf
+            cand_i = np.arange(j0, j0 + s.shape[1])[None, :].repeat(len(s), axis=0)
+            if s.shape[1] > k:                                                   # chunk top-k first, then merge
+                part = np.argpartition(-s, k - 1, axis=1)[:, :k]
+                s, cand_i = np.take_along_axis(s, part, axis=1), part + j0
+            cand_s = np.concatenate([best_s, s], axis=1)
+            cand_i = np.concatenate([best_i, cand_i], axis=1)
+            part = np.argpartition(-cand_s, k - 1, axis=1)[:, :k]
+            best_s = np.take_along_axis(cand_s, part, axis=1)
+            best_i = np.take_along_axis(cand_i, part, axis=1)
+        order = np.argsort(-best_s, axis=1, kind="stable")
+        idx[i0:i1] = np.take_along_axis(best_i, order, axis=1)
+        score[i0:i1] = np.take_along_axis(best_s, order, axis=1)
+    return idx, score
+
+def birth_longitudes(births, full: bool = False):
+    """(n,) natal Sun longitudes, or (n, len(BODIES)) with `full`, for Birth records; unparseable rows are NaN."""
+    from .birthcalc import calc_birth_columns
+    cols = calc_birth_columns(births)
+    lon = planets.body_longitudes(cols["utc"]) if full else cols["sun_lon"].copy()
+    lon[~cols["ok"]] = np.nan
+    return lon
+
+def rank(birth, others, k: int = 10, full: bool = False):
+    """Top-`k` matches for one Birth among `others` → [{index, harmony}], best first."""
+    lon = birth_longitudes([birth, *others], full)
+    if np.isnan(lon[0]).all():
+        raise ValueError("unparseable birth")
+    idx, score = top_k(lon[:1], lon[1:], k)
+    return [{"index": int(i), "harmony": round(float(s), 4)}
+            for i, s in zip(idx[0].tolist(), score[0].tolist()) if s > -np.inf]
@@ -1,5 +1,8 @@
 # 64 gates meta: name + periodic "element" + 1 keyword. (You can expand freely.)
-GATE_META: dict[int, dict] = {
+import sys
+from typing import Any, Iterator, Mapping, Optional
+
+_GATE_ROWS: dict[int, dict] = {
   1:{"name":"Creative","element":"Hydrogen","kw":"creation"},
   2:{"name":"Receptive","element":"Helium","kw":"receptivity"},
   3:{"name":"Ordering","element":"Lithium","kw":"mutation"},
@@ -65,4 +68,102 @@ GATE_META: dict[int, dict] = {
   63:{"name":"Completion","element":"Europium","kw":"settling"},
   64:{"name":"Before Completion","element":"Gadolinium","kw":"transition"},
 }
+
+class GateRecord:
+    """One gate's metadata; reads like the old `{"name","element","kw"}` dict."""
+    __slots__ = ("gate", "name", "element", "kw")
+    _KEYS = ("name", "element", "kw")
+
+    def __init__(self, gate: int, name: str, element: str, kw: str):
+        self.gate, self.name, self.element, self.kw = gate, name, element, kw
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._KEYS else default
+
+    def keys(self): return self._KEYS
+    def values(self): return tuple(getattr(self, k) for k in self._KEYS)
+    def items(self): return tuple((k, getattr(self, k)) for k in self._KEYS)
+    def __iter__(self): return iter(self._KEYS)
+    def __len__(self): return 3
+    def __contains__(self, key): return key in self._KEYS
+    def to_dict(self) -> dict: return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, GateRecord):
+            return self.gate == other.gate and self.values() == other.values()
+        return isinstance(other, dict) and other == self.to_dict()
+
+    def __repr__(self):
+        return f"GateRecord({self.gate}, {self.name!r}, {self.element!r}, {self.kw!r})"
+
+class GateTable(Mapping):
+    """
+    Gate metadata as parallel tuples indexed by gate number (index 0 unused), with
+    interned strings and one `GateRecord` per gate. Doubles as the read-only
+    `GATE_META` mapping; `columns()` gives NumPy arrays for vectorized joins.
+    """
+    __slots__ = ("names", "elements", "kws", "records", "element_names", "element_code", "_columns")
+
+    def __init__(self, rows: dict):
+        n = max(rows) + 1
+        self.names: tuple = tuple(sys.intern(rows[g]["name"]) if g in rows else None for g in range(n))
+        self.elements: tuple = tuple(sys.intern(rows[g]["element"]) if g in rows else None for g in range(n))
+        self.kws: tuple = tuple(sys.intern(rows[g]["kw"]) if g in rows else None for g in range(n))
+        self.records: tuple = tuple(GateRecord(g, self.names[g], self.elements[g], self.kws[g]) if g in rows else None
+                                    for g in range(n))
+        self.element_names: tuple = tuple(dict.fromkeys(e for e in self.elements if e))
+        idx = {e: i for i, e in enumerate(self.element_names)}
+        self.element_code: tuple = tuple(idx[e] if e else -1 for e in self.elements)
+        self._columns = None
+
+    def _lookup(self, gate: Any) -> Optional[GateRecord]:
+        try:
+            return self.records[gate] if gate > 0 else None
+        except (IndexError, TypeError):
+            return None
+
+    def __getitem__(self, gate: int) -> GateRecord:
+        try:
+            rec = self.records[gate]
+        except (IndexError, TypeError):
+            raise KeyError(gate) from None
+        if rec is None or gate < 0:
+            raise KeyError(gate)
+        return rec
+
+    def get(self, gate: Any, default: Any = None) -> Optional[GateRecord]:
+        try:
+            rec = self.records[gate]
+        except (IndexError, TypeError):
+            return default
+        return default if rec is None or gate < 0 else rec
+
+    def __contains__(self, gate: Any) -> bool:
+        return self._lookup(gate) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return (g for g, r in enumerate(self.records) if r is not None)
+
+    def __len__(self) -> int:
+        return sum(r is not None for r in self.records)
+
+    def columns(self) -> dict:
+        """NumPy columns indexed by gate: element_code int16 (into `element_names`, -1 = none)."""
+        if self._columns is None:
+            import numpy as np
+            self._columns = {"element_code": np.array(self.element_code, dtype=np.int16)}
+        return self._columns
+
+GATE_TABLE = GateTable(_GATE_ROWS)
+GATE_META: Mapping = GATE_TABLE       # dict-compatible view for existing callers
+GATE_NAME, GATE_ELEMENT, GATE_KW = GATE_TABLE.names, GATE_TABLE.elements, GATE_TABLE.kws
+PERIODIC = frozenset(GATE_TABLE.element_names)
+
 SIGNS = ["Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces"]
+PLANETS = ["Sun","Earth","Moon","North Node","South Node","Mercury","Venus","Mars","Jupiter","Saturn","Uranus","Neptune","Pluto","Chiron"]
+FIELDS = ["Mind","Heart","Body"]
@@ -0,0 +1,89 @@
+# Human Design "Design" moment: when the Sun stood 88° of arc before its birth
+# position (86-92 days earlier). Solved on the ephemeris Sun with a bracketed
+# secant iteration; the batch form runs the same iteration over whole arrays.
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict
+from . import ephemeris
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DESIGN_ARC = 88.0
+# the apparent Sun moves 0.953-1.020°/day, so 88° spans 86.3-92.4 days
+_LO_DAYS, _HI_DAYS = 93.0, 86.0
+_TOL = 1e-9   # degrees (~1e-4 s)
+
+def _gap(lon: float, target: float) -> float:
+    return (lon - target + 180.0) % 360.0 - 180.0
+
+@lru_cache(maxsize=65536)
+def design_jd(birth_jd: float) -> float:
+    """UT Julian day of the Design moment for a UT birth Julian day (cached per birth)."""
+    sun = ephemeris.sun_longitude_jd
+    target = (sun(birth_jd) - DESIGN_ARC) % 360.0
+    a, b = birth_jd - _LO_DAYS, birth_jd - _HI_DAYS
+    fa, fb = _gap(sun(a), target), _gap(sun(b), target)       # fa < 0 < fb: the Sun only moves forward
+    t0, f0 = a, fa
+    t1 = birth_jd - DESIGN_ARC / ephemeris.MEAN_RATE
+    f1 = _gap(sun(t1), target)
+    for _ in range(20):
+        if abs(f1) < _TOL:
+            break
+        if f1 < 0:
+            a, fa = t1, f1
+        else:
+            b = t1
+        t = t1 - f1 * (t1 - t0) / (f1 - f0) if f1 != f0 else 0.5 * (a + b)
+        if not a < t < b:                                     # secant left the bracket: bisect
+            t = 0.5 * (a + b)
+        t0, f0, t1 = t1, f1, t
+        f1 = _gap(sun(t1), target)
+    return t1
+
+def design_utc(birth_utc: datetime) -> datetime:
+    """Design moment for an aware UTC birth datetime (microsecond precision)."""
+    jd = design_jd(birth_utc.timestamp() / 86400.0 + ephemeris.JD_UNIX)
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(days=jd - ephemeris.JD_UNIX)
+
+def design_ts_array(birth_ts, iterations: int = 8):
+    """
+    Batch `design_utc` over UTC unix seconds (NumPy): every row runs the same
+    secant steps at once, clamped to its bracket. Returns unix seconds.
+    """
+    jd = np.asarray(birth_ts, dtype=np.float64) / 86400.0 + ephemeris.JD_UNIX
+    sun = lambda j: ephemeris.sun_longitude_ts_array((j - ephemeris.JD_UNIX) * 86400.0)
+    gap = lambda lon, tgt: np.mod(lon - tgt + 180.0, 360.0) - 180.0
+    target = np.mod(sun(jd) - DESIGN_ARC, 360.0)
+    lo, hi = jd - _LO_DAYS, jd - _HI_DAYS
+    t0 = lo
+    f0 = gap(sun(t0), target)
+    t1 = jd - DESIGN_ARC / ephemeris.MEAN_RATE
+    f1 = gap(sun(t1), target)
+    for _ in range(iterations):
+        denom = f1 - f0
+        step = np.divide(f1 * (t1 - t0), denom, out=np.zeros_like(t1), where=np.abs(denom) > 1e-15)
+        t0, f0 = t1, f1
+        t1 = np.clip(t1 - step, lo, hi)
+        f1 = gap(sun(t1), target)
+        if np.abs(f1).max() < _TOL:
+            break
+    return (t1 - ephemeris.JD_UNIX) * 86400.0
+
+def design_placements(birth_utc: datetime) -> Dict[str, Any]:
+    """{ utc, placements } of every body at the Design moment (needs NumPy)."""
+    from .planets import placements_at
+    when = design_utc(birth_utc)
+    return {"utc": when.isoformat(), "placements": placements_at(when)}
+
+def design_columns(birth_ts) -> Dict[str, Any]:
+    """Cohort Design Sun as NumPy columns: design_utc (unix s), design_sun_lon, design_gate, design_line."""
+    from .hd import sun_to_gate_line_array
+    utc = design_ts_array(birth_ts)
+    lon = ephemeris.sun_longitude_ts_array(utc)
+    gate, line = sun_to_gate_line_array(lon)
+    return {"design_utc": np.round(utc).astype(np.int64), "design_sun_lon": lon,
+            "design_gate": gate.astype(np.int8), "design_line": line.astype(np.int8)}
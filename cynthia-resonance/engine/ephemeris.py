@@ -0,0 +1,186 @@
+# Solar ephemeris: apparent geocentric ecliptic longitude of the Sun (of date).
+#
+# The model is Meeus, Astronomical Algorithms ch. 25 (equation of center +
+# nutation/aberration), ~0.01° over 1800-2200, with ΔT from the
+# Morrison-Stephenson parabola. For speed it is precomputed as Chebyshev
+# coefficients over 64-day segments (7 per segment, fit error < 1e-6°) and
+# stored in data/sun_cheb.bin:
+#
+#   header  "<4sHHddI"  magic b"SUNC", version, n_coef, jd0 (UT), seg_days, n_seg
+#   body    n_seg * n_coef little-endian float64, segment-major
+#
+# Coefficient 0 of each segment is reduced mod 360, so evaluation is one
+# Clenshaw recurrence + one mod. Times outside the table use the series directly.
+#
+#   python -m engine.ephemeris      # rebuild the table
+from __future__ import annotations
+import math, os, struct
+from array import array
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # scalar path only; the table is built without NumPy if needed
+    np = None
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sun_cheb.bin")
+_HEADER = struct.Struct("<4sHHddI")
+_MAGIC, _VERSION = b"SUNC", 1
+
+JD_UNIX = 2440587.5           # JD of 1970-01-01T00:00Z
+JD0 = 2378496.5               # 1800-01-01
+JD1 = 2524593.5               # 2200-01-01
+SEG_DAYS = 64.0
+N_COEF = 7                    # the scalar evaluator below is unrolled for 7
+MEAN_RATE = 0.9856474         # mean solar motion, deg/day
+
+def delta_t_days(jd: float) -> float:
+    u = (jd - 2385800.5) / 36524.25           # centuries from 1820.0
+    return (-20.0 + 32.0 * u * u) / 86400.0
+
+def series_longitude(jd_ut: float) -> float:
+    """Apparent solar longitude (deg, unwrapped) straight from the series; `jd_ut` is a UT Julian day."""
+    t = (jd_ut + delta_t_days(jd_ut) - 2451545.0) / 36525.0
+    l0 = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    m = math.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    c = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * math.sin(m)
+         + (0.019993 - 0.000101 * t) * math.sin(2 * m) + 0.000289 * math.sin(3 * m))
+    omega = math.radians(125.04 - 1934.136 * t)
+    return l0 + c - 0.00569 - 0.00478 * math.sin(omega)
+
+def _series_array(jd_ut):
+    u = (jd_ut - 2385800.5) / 36524.25
+    t = (jd_ut + (-20.0 + 32.0 * u * u) / 86400.0 - 2451545.0) / 36525.0
+    l0 = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    m = np.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    c = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * np.sin(m)
+         + (0.019993 - 0.000101 * t) * np.sin(2 * m) + 0.000289 * np.sin(3 * m))
+    return l0 + c - 0.00569 - 0.00478 * np.sin(np.radians(125.04 - 1934.136 * t))
+
+def build_table(jd0: float = JD0, jd1: float = JD1, seg_days: float = SEG_DAYS, n: int = N_COEF) -> array:
+    """Chebyshev coefficients (segment-major, coefficient 0 mod 360) fitted at the Chebyshev nodes."""
+    n_seg = int(math.ceil((jd1 - jd0) / seg_days))
+    nodes = [math.cos(math.pi * (k + 0.5) / n) for k in range(n)]
+    basis = [[math.cos(j * math.pi * (k + 0.5) / n) for k in range(n)] for j in range(n)]
+    if np is not None:
+        starts = jd0 + seg_days * np.arange(n_seg)
+        vals = _series_array(starts[:, None] + (np.array(nodes)[None, :] + 1.0) * (seg_days / 2.0))
+        coef = vals @ np.array(basis).T * (2.0 / n)
+        coef[:, 0] = np.mod(coef[:, 0] / 2.0, 360.0)
+        return array("d", coef.ravel().tolist())
+    out = array("d")
+    for s in range(n_seg):
+        start = jd0 + s * seg_days
+        vals = [series_longitude(start + (x + 1.0) * seg_days / 2.0) for x in nodes]
+        coef = [2.0 / n * sum(v * b for v, b in zip(vals, basis[j])) for j in range(n)]
+        coef[0] = (coef[0] / 2.0) % 360.0
+        out.extend(coef)
+    return out
+
+def save_table(path: str = TABLE_PATH) -> str:
+    coef = build_table()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, N_COEF, JD0, SEG_DAYS, len(coef) // N_COEF))
+        if coef.itemsize != 8 or struct.pack("=d", 1.0) != struct.pack("<d", 1.0):
+            raise RuntimeError("table writer expects little-endian float64")
+        coef.tofile(f)
+    os.replace(tmp, path)
+    return path
+
+def _load() -> Tuple[array, int]:
+    """(coefficients, n_seg) from TABLE_PATH, rebuilt in memory if missing or stale."""
+    try:
+        with open(TABLE_PATH, "rb") as f:
+            magic, ver, n, jd0, seg, n_seg = _HEADER.unpack(f.read(_HEADER.size))
+            if (magic, ver, n, jd0, seg) == (_MAGIC, _VERSION, N_COEF, JD0, SEG_DAYS):
+                coef = array("d")
+                coef.frombytes(f.read(n_seg * n * 8))
+                if len(coef) == n_seg * n:
+                    return coef, n_seg
+    except (OSError, struct.error):
+        pass
+    coef = build_table()
+    return coef, len(coef) // N_COEF
+
+_COEF: Optional[array] = None
+_SEGS: List[tuple] = []
+_NP_COEF = None
+
+def _segments() -> List[tuple]:
+    global _COEF, _SEGS
+    if not _SEGS:
+        _COEF, n_seg = _load()
+        _SEGS = [tuple(_COEF[i * N_COEF:(i + 1) * N_COEF]) for i in range(n_seg)]
+    return _SEGS
+
+def sun_longitude_jd(jd_ut: float) -> float:
+    """Apparent solar longitude in [0, 360) for a UT Julian day."""
+    segs = _SEGS or _segments()
+    d = jd_ut - JD0
+    i = int(d // SEG_DAYS)
+    if not 0 <= i < len(segs):
+        return series_longitude(jd_ut) % 360.0
+    c0, c1, c2, c3, c4, c5, c6 = segs[i]
+    x = (d - i * SEG_DAYS) * (2.0 / SEG_DAYS) - 1.0
+    x2 = x + x
+    b1 = c6
+    b1, b2 = x2 * b1 + c5, b1
+    b1, b2 = x2 * b1 - b2 + c4, b1
+    b1, b2 = x2 * b1 - b2 + c3, b1
+    b1, b2 = x2 * b1 - b2 + c2, b1
+    b1, b2 = x2 * b1 - b2 + c1, b1
+    return (x * b1 - b2 + c0) % 360.0
+
+def sun_longitude(dt_utc: datetime) -> float:
+    """Apparent solar longitude in [0, 360) for an aware UTC datetime."""
+    return sun_longitude_jd(dt_utc.timestamp() / 86400.0 + JD_UNIX)
+
+def coefficients():
+    """The table as an (n_seg, N_COEF) float64 array, as the NumPy evaluator reads it."""
+    global _NP_COEF
+    if _NP_COEF is None:
+        _segments()
+        _NP_COEF = np.frombuffer(_COEF, dtype=np.float64).reshape(-1, N_COEF)
+    return _NP_COEF
+
+def use_coefficients(coef) -> None:
+    """Evaluate arrays from `coef` (e.g. a shared-memory view) instead of loading a private copy."""
+    global _NP_COEF
+    _NP_COEF = coef
+
+def sun_longitude_ts_array(ts):
+    """`sun_longitude` over UTC unix seconds (NumPy array in, NumPy array out)."""
+    coef = coefficients()
+    jd = np.asarray(ts, dtype=np.float64) / 86400.0 + JD_UNIX
+    d = jd - JD0
+    i = np.floor_divide(d, SEG_DAYS).astype(np.int64)
+    inside = (i >= 0) & (i < len(coef))
+    ic = np.where(inside, i, 0)
+    c = coef[ic]
+    x = (d - ic * SEG_DAYS) * (2.0 / SEG_DAYS) - 1.0
+    x2 = x + x
+    b1, b2 = c[:, N_COEF - 1].copy(), np.zeros_like(x)
+    for j in range(N_COEF - 2, 0, -1):
+        b1, b2 = x2 * b1 - b2 + c[:, j], b1
+    lon = x * b1 - b2 + c[:, 0]
+    if not inside.all():
+        lon = np.where(inside, lon, _series_array(jd))
+    return np.mod(lon, 360.0)
+
+def sun_crossing(target_lon: float, after: datetime) -> datetime:
+    """First UTC moment >= `after` at which the apparent Sun reaches `target_lon` (the Sun never retrogrades)."""
+    jd = after.timestamp() / 86400.0 + JD_UNIX
+    ahead = (target_lon - sun_longitude_jd(jd)) % 360.0
+    t = jd + ahead / MEAN_RATE
+    for _ in range(8):   # the true rate is within ±3.5% of the mean, so each step gains > 1 decimal digit
+        err = (target_lon - sun_longitude_jd(t) + 180.0) % 360.0 - 180.0
+        t += err / MEAN_RATE
+        if abs(err) < 1e-9:
+            break
+    return after + timedelta(days=max(0.0, t - jd))
+
+if __name__ == "__main__":
+    print(save_table())
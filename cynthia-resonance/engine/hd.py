@@ -1,7 +1,62 @@
-# Fallback HD: map ecliptic longitude → gate/line deterministically
+# Fallback HD: map ecliptic longitude → gate/line/color/tone/base deterministically
+#
+# Resolution is fixed-point: longitudes are rounded once to integer
+# milli-arcseconds (mas), where every subdivision is an exact integer width
+#
+#   gate 5.625° = 20_250_000 mas   line 3_375_000   color 562_500
+#   tone 93_750                     base 18_750      (6 lines, 6 colors, 6 tones, 5 bases)
+#
+# so a boundary such as 3 * 5.625 resolves to the same gate whether the float
+# arrived as 16.875 or 16.874999999999996, and the wheel is 64 * 1080 equal
+# bases: the boundary table is an arithmetic progression, and its bisect is a
+# floor division.
+from typing import Dict
+
+GATE_ARC = 360.0 / 64       # 5.625° per gate
+LINE_ARC = GATE_ARC / 6     # 0.9375° per line
+
+MAS_PER_DEG = 3_600_000
+CIRCLE_MAS = 360 * MAS_PER_DEG
+LINES, COLORS, TONES, BASES = 6, 6, 6, 5
+BASE_MAS = CIRCLE_MAS // (64 * LINES * COLORS * TONES * BASES)     # 18_750
+TONE_MAS = BASE_MAS * BASES
+COLOR_MAS = TONE_MAS * TONES
+LINE_MAS = COLOR_MAS * COLORS
+GATE_MAS = LINE_MAS * LINES
+assert GATE_MAS * 64 == CIRCLE_MAS
+
+def lon_to_mas(ecl_lon_deg: float) -> int:
+    """Longitude in degrees → integer milli-arcseconds in [0, CIRCLE_MAS)."""
+    return round(ecl_lon_deg * MAS_PER_DEG) % CIRCLE_MAS
+
 def sun_to_gate_line(ecl_lon_deg: float) -> tuple[int, int]:
     # 360 / 64 = 5.625° per gate; 6 lines per gate → 0.9375° per line
-    gate = max(1, min(64, int(ecl_lon_deg / 5.625) + 1))
-    within = ecl_lon_deg % 5.625
-    line = max(1, min(6, int(within / (5.625/6.0)) + 1))
-    return gate, line
+    g, r = divmod(round(ecl_lon_deg * MAS_PER_DEG) % CIRCLE_MAS, GATE_MAS)
+    return g + 1, r // LINE_MAS + 1
+
+def resolve(ecl_lon_deg: float) -> Dict[str, int]:
+    """{gate, line, color, tone, base} for a longitude (same keys as parse_hd_text)."""
+    g, r = divmod(round(ecl_lon_deg * MAS_PER_DEG) % CIRCLE_MAS, GATE_MAS)
+    line, r = divmod(r, LINE_MAS)
+    color, r = divmod(r, COLOR_MAS)
+    tone, r = divmod(r, TONE_MAS)
+    return {"gate": g + 1, "line": line + 1, "color": color + 1, "tone": tone + 1, "base": r // BASE_MAS + 1}
+
+def next_line_boundary(ecl_lon_deg: float) -> float:
+    """Longitude of the next gate/line boundary strictly ahead of `ecl_lon_deg` (mod 360)."""
+    return ((lon_to_mas(ecl_lon_deg) // LINE_MAS + 1) * LINE_MAS % CIRCLE_MAS) / MAS_PER_DEG
+
+def _mas_array(ecl_lon_deg):
+    import numpy as np
+    return np.mod(np.rint(np.asarray(ecl_lon_deg, dtype=np.float64) * MAS_PER_DEG).astype(np.int64), CIRCLE_MAS)
+
+def sun_to_gate_line_array(ecl_lon_deg):
+    """`sun_to_gate_line` over a NumPy array → (gate, line) int arrays."""
+    mas = _mas_array(ecl_lon_deg)
+    return mas // GATE_MAS + 1, mas % GATE_MAS // LINE_MAS + 1
+
+def resolve_array(ecl_lon_deg):
+    """`resolve` over a NumPy array → (gate, line, color, tone, base) int64 arrays."""
+    mas = _mas_array(ecl_lon_deg)
+    return (mas // GATE_MAS + 1, mas % GATE_MAS // LINE_MAS + 1, mas % LINE_MAS // COLOR_MAS + 1,
+            mas % COLOR_MAS // TONE_MAS + 1, mas % TONE_MAS // BASE_MAS + 1)
@@ -0,0 +1,114 @@
+# Incremental field evaluation: cache each user's field until the transit Sun
+# crosses the next gate/line boundary, and emit change events only on transitions.
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Dict, Any, List, Optional, Tuple
+from .astro import sun_longitude, sun_crossing_utc
+from .birthcalc import Birth, calc_birth
+from .hd import next_line_boundary
+from .interference import interference_at
+
+# step past the analytic crossing so float noise never lands us just short of it
+_EPS = timedelta(seconds=1)
+
+def next_transit_change(now: datetime) -> datetime:
+    """UTC moment of the next transit gate/line change (or model re-anchor) after `now`."""
+    return sun_crossing_utc(next_line_boundary(sun_longitude(now)), now) + _EPS
+
+def _key(b: Birth) -> Tuple:
+    return (b.dateISO, b.time, b.tzOffset)
+
+@dataclass
+class _UserField:
+    birth: Birth
+    astro: Dict[str,Any]
+    hd: Dict[str,Any]
+    auric: Dict[str,Any]
+    field: Dict[str,Any]
+    gate: int
+    line: int
+    since: datetime
+    valid_until: datetime
+    events: List[Dict[str,Any]] = field(default_factory=list)
+
+class FieldTracker:
+    """
+    Per-user last state for `interference_at`. `tick` serves the cached field
+    until `valid_until` and only recomputes (and emits an event) once the transit
+    Sun has moved to a new gate/line.
+    """
+    def __init__(self, max_users: int = 10_000, max_events: int = 64):
+        self.max_users = max_users
+        self.max_events = max_events
+        self._users: "OrderedDict[str, _UserField]" = OrderedDict()
+        self._lock = Lock()
+
+    def tick(self, user_id: str, b: Birth, now: Optional[datetime] = None) -> Dict[str,Any]:
+        now = now or datetime.now(timezone.utc)
+        key = _key(b)
+        with self._lock:
+            st = self._users.get(user_id)
+            if st and _key(st.birth) == key and st.since <= now < st.valid_until:
+                self._users.move_to_end(user_id)
+                return self._packet(user_id, st, cached=True, events=[])
+            if st is None or _key(st.birth) != key:
+                astro, hd, auric = calc_birth(b)
+                prev = None
+            else:
+                astro, hd, auric = st.astro, st.hd, st.auric
+                prev = (st.gate, st.line)
+            inter = interference_at(astro, now)
+            t = inter["aspects"]["transit"]
+            nst = _UserField(b, astro, hd, auric, inter, t["gate"], t["line"], now, next_transit_change(now),
+                             st.events if st else [])
+            events = []
+            if prev is not None and prev != (nst.gate, nst.line):
+                events.append({
+                    "type": "transit_gate" if prev[0] != nst.gate else "transit_line",
+                    "user": user_id,
+                    "at": now.isoformat(),
+                    "from": {"gate": prev[0], "line": prev[1]},
+                    "to": {"gate": nst.gate, "line": nst.line},
+                })
+                nst.events = (nst.events + events)[-self.max_events:]
+            self._users[user_id] = nst
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+            return self._packet(user_id, nst, cached=False, events=events)
+
+    def refresh(self, user_id: str, now: Optional[datetime] = None) -> Optional[Dict[str,Any]]:
+        """`tick` with the birth remembered from the user's last call (None if unknown)."""
+        st = self._users.get(user_id)
+        return self.tick(user_id, st.birth, now) if st else None
+
+    def valid_until(self, user_id: str) -> Optional[datetime]:
+        st = self._users.get(user_id)
+        return st.valid_until if st else None
+
+    def drain_events(self, user_id: str) -> List[Dict[str,Any]]:
+        """Pop the change events recorded for `user_id` since the last drain."""
+        with self._lock:
+            st = self._users.get(user_id)
+            if not st:
+                return []
+            out, st.events = st.events, []
+            return out
+
+    def forget(self, user_id: str) -> None:
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    @staticmethod
+    def _packet(user_id: str, st: _UserField, cached: bool, events: List[Dict[str,Any]]) -> Dict[str,Any]:
+        return {
+            "user": user_id,
+            "field": st.field,
+            "cached": cached,
+            "changed": bool(events),
+            "events": events,
+            "valid_until": st.valid_until.isoformat(),
+        }
@@ -2,9 +2,15 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 import math
-from .astro import sun_longitude_approx, lon_to_sign_dms
+from .astro import sun_longitude, lon_to_sign_dms
 from .hd import sun_to_gate_line
-from .dataset import GATE_META
+from .dataset import GATE_TABLE
+from . import planets
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 def _today(dt_iso: Optional[str]) -> datetime:
     return datetime.fromisoformat(dt_iso).replace(tzinfo=timezone.utc) if dt_iso else datetime.now(timezone.utc)
@@ -23,6 +29,20 @@ def _aspect_score(delta_deg: float) -> float:
     # squash to -1..+1
     return max(-1.0, min(1.0, harm))
 
+def _aspect_score_array(delta_deg):
+    """`_aspect_score` over a sequence of angles (NumPy array in, array out)."""
+    if np is None:
+        return [_aspect_score(d) for d in delta_deg]
+    d = np.abs(np.mod(np.asarray(delta_deg, dtype=np.float64) + 180, 360) - 180)
+    harm = (
+        np.exp(- (d/20)**2 )      * 1.0 +
+        np.exp(- ((d-60)/12)**2 ) * 0.6 +
+        np.exp(- ((d-120)/12)**2) * 0.6 -
+        np.exp(- ((d-90)/10)**2 ) * 0.8 -
+        np.exp(- ((d-180)/10)**2) * 0.5
+    )
+    return np.clip(harm, -1.0, 1.0)
+
 def _triad_weights(harm: float) -> Dict[str, float]:
     """
     Turn harmony (-1..+1) into Mind/Heart/Body weights.
@@ -39,14 +59,31 @@ def _triad_weights(harm: float) -> Dict[str, float]:
         "Body":  round(body/s,3)
     }
 
-def calc_interference(astro: Dict[str,Any], hd: Dict[str,Any], auric: Dict[str,Any], date_today_iso: Optional[str]) -> Dict[str,Any]:
+def _triad_weights_array(harm):
+    """`_triad_weights` over an array of harmonies → (mind, heart, body) arrays, rounded."""
+    if np is None:
+        ws = [_triad_weights(h) for h in harm]
+        return [w["Mind"] for w in ws], [w["Heart"] for w in ws], [w["Body"] for w in ws]
+    h = np.asarray(harm, dtype=np.float64)
+    heart = np.maximum(0.05, 0.5 + 0.4*h)
+    body  = np.maximum(0.05, 0.35 + 0.3*h)
+    mind  = np.maximum(0.05, 0.45 - 0.6*h)
+    s = heart + body + mind
+    return np.round(mind/s, 3), np.round(heart/s, 3), np.round(body/s, 3)
+
+def natal_sun_lon(astro: Dict[str,Any]) -> float:
     natal = astro["placements"][0]
     # natal Sun longitude from sign + deg
     sign_index = ["Aries","Taurus","Gemini","Cancer","Leo","Virgo","Libra","Scorpio","Sagittarius","Capricorn","Aquarius","Pisces"].index(natal["sign"])
-    natal_lon = sign_index*30 + natal["degree"] + (natal.get("minute",0)/60.0) + (natal.get("second",0)/3600.0)
+    return sign_index*30 + natal["degree"] + (natal.get("minute",0)/60.0) + (natal.get("second",0)/3600.0)
 
-    now = _today(date_today_iso)
-    trans_lon = sun_longitude_approx(now)
+def calc_interference(astro: Dict[str,Any], hd: Dict[str,Any], auric: Dict[str,Any], date_today_iso: Optional[str]) -> Dict[str,Any]:
+    return interference_at(astro, _today(date_today_iso))
+
+def interference_at(astro: Dict[str,Any], now: datetime) -> Dict[str,Any]:
+    """`calc_interference` for an explicit UTC moment."""
+    natal_lon = natal_sun_lon(astro)
+    trans_lon = sun_longitude(now)
     delta = (trans_lon - natal_lon + 360.0) % 360.0
     harm = _aspect_score(delta)
     weights = _triad_weights(harm)
@@ -69,14 +106,62 @@ def calc_interference(astro: Dict[str,Any], hd: Dict[str,Any], auric: Dict[str,A
         "interference_index": idx
     }
 
+# per-body weight in the chart-level harmony: luminaries lead, outer bodies and nodes trail
+BODY_WEIGHT = {"Sun": 2.0, "Earth": 1.0, "Moon": 2.0, "North Node": 0.5, "South Node": 0.5, "Mercury": 1.5,
+               "Venus": 1.5, "Mars": 1.5, "Jupiter": 1.0, "Saturn": 1.0, "Uranus": 0.5, "Neptune": 0.5, "Pluto": 0.5}
+
+def aspect_matrix(natal_lons, transit_lons):
+    """N×M harmony (-1..+1) of every transit body against every natal body, in one vectorized pass."""
+    natal = np.asarray(natal_lons, dtype=np.float64)
+    transit = np.asarray(transit_lons, dtype=np.float64)
+    return _aspect_score_array(transit[None, :] - natal[:, None])
+
+def chart_interference_at(astro: Dict[str,Any], now: datetime, top: int = 5) -> Dict[str,Any]:
+    """
+    Full-chart `interference_at`: natal placements (with "lon", see birthcalc.calc_chart)
+    against all transit bodies. The harmony is the weighted mean of the aspect matrix;
+    "transit" is the transit Sun as in `interference_at` (rows/columns of the matrix
+    are "natal"/"transit_bodies"), so `plan_from_interference` works on either result.
+    """
+    names = [p["planet"] for p in astro["placements"]]
+    natal = np.array([p["lon"] for p in astro["placements"]])
+    transit = planets.transit_longitudes(now)
+    mat = aspect_matrix(natal, transit)
+    w_n = np.array([BODY_WEIGHT.get(n, 1.0) for n in names])
+    w_t = np.array([BODY_WEIGHT[n] for n in planets.BODIES])
+    w = w_n[:, None] * w_t[None, :]
+    harm = float((mat * w).sum() / w.sum())
+    weights = _triad_weights(harm)
+    strength = (np.abs(mat) * w).ravel()
+    pairs = []
+    for k in np.argsort(-strength)[:top].tolist():
+        i, j = divmod(k, len(planets.BODIES))
+        pairs.append({"natal": names[i], "transit": planets.BODIES[j], "harmony": round(float(mat[i, j]), 3)})
+    idx = round((weights["Heart"]*1.2 + weights["Body"]*1.0 + weights["Mind"]*0.8),3)
+    sun_lon = float(transit[planets.INDEX["Sun"]])
+    sign, deg, minute, second = lon_to_sign_dms(sun_lon)
+    t_gate, t_line = sun_to_gate_line(sun_lon)
+    return {
+        "triad": weights,
+        "aspects": {
+            "harmony": round(harm, 3),
+            "transit": {"sign":sign,"deg":deg,"min":minute,"sec":second,"gate":t_gate,"line":t_line},
+            "natal": names,
+            "transit_bodies": list(planets.BODIES),
+            "matrix": np.round(mat, 3).tolist(),
+            "strongest": pairs,
+        },
+        "interference_index": idx
+    }
+
 def plan_from_interference(inter: Dict[str,Any], auric: Dict[str,Any]) -> Dict[str,Any]:
     """
     Deterministic coaching skeleton (works without LLM).
     """
     w = inter["triad"]; harm = inter["aspects"]["harmony"]
-    gate = auric["archetype"]["gate"]; meta = GATE_META.get(gate, {})
-    head = f"Gate {gate} · {meta.get('name','Gate')}"
-    theme = meta.get("kw","pattern")
+    gate = auric["archetype"]["gate"]; meta = GATE_TABLE.get(gate)
+    head = f"Gate {gate} · {meta.name if meta else 'Gate'}"
+    theme = meta.kw if meta else "pattern"
     # Pick a tone
     if harm >= 0.6:
         tone = "high_flow"
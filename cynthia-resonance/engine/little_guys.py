@@ -1,26 +1,143 @@
-from typing import Dict, Any, List
-from .dataset import GATE_META
-
-def _city(name: str) -> List[Dict[str,Any]]:
-    out=[]
-    for g in range(1,65):
-        meta = GATE_META[g]
-        out.append({
-            "id": f"{name}-{g}",
-            "gate": g,
-            "city": name,
-            "name": meta["name"],
-            "element": meta["element"],
-            "state": "dormant" if g%4==0 else "unlocked",
-            "level": 1 + (g % 3)
-        })
-    return out
-
-ROSTER = {
-    "Mind":  _city("Mind"),
-    "Heart": _city("Heart"),
-    "Body":  _city("Body"),
-}
+from array import array
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from collections.abc import Mapping
+from hashlib import blake2b
+from threading import Lock
+from typing import Dict, Any, List, Optional, Tuple
+import json
+from .dataset import GATE_NAME, GATE_ELEMENT, FIELDS
+
+STATES = ("unlocked", "dormant", "locked")
+
+class CityRoster:
+    """One city's 64 agents as two byte arrays (state index, level); dicts only on demand."""
+    __slots__ = ("name", "state", "level")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = array("B", (1 if g % 4 == 0 else 0 for g in range(65)))
+        self.level = array("B", (1 + (g % 3) for g in range(65)))
+
+    def state_of(self, g: int) -> int:
+        return self.state[g]
+
+    def level_of(self, g: int) -> int:
+        return self.level[g]
+
+    def agent(self, g: int) -> Dict[str,Any]:
+        return _agent(self, g)
+
+def _agent(r, g: int) -> Dict[str,Any]:
+    """Agent dict for gate `g` of any city roster exposing name/state_of/level_of."""
+    return {"id": f"{r.name}-{g}", "gate": g, "city": r.name, "name": GATE_NAME[g],
+            "element": GATE_ELEMENT[g], "state": STATES[r.state_of(g)], "level": r.level_of(g)}
+
+def _encode_cursor(ci: int, g: int) -> str:
+    return urlsafe_b64encode(f"{ci}.{g}".encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        ci, g = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split(".")
+        return int(ci), int(g)
+    except Exception:
+        raise ValueError("bad cursor")
+
+class RosterService:
+    """
+    Lazy roster: cities are materialized on first use, filtered server side and
+    paged with an opaque cursor. Serialized pages are cached by ETag until
+    `invalidate()` bumps the version.
+    """
+    def __init__(self, cities=FIELDS, cache_size: int = 256, source=None):
+        self.cities = list(cities)
+        self._source = source or CityRoster     # name → roster exposing state_of/level_of/agent
+        self._rosters: Dict[str, CityRoster] = {}
+        self._bytes: "OrderedDict[tuple, Tuple[str, bytes]]" = OrderedDict()
+        self.cache_size = cache_size
+        self.version = 0
+        self._lock = Lock()
+
+    def city(self, name: str) -> CityRoster:
+        r = self._rosters.get(name)
+        if r is None:
+            if name not in self.cities:
+                raise KeyError(name)
+            r = self._rosters.setdefault(name, self._source(name))
+        return r
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._bytes.clear()
+
+    def _matches(self, r: CityRoster, g: int, state, element, level) -> bool:
+        return ((state is None or STATES[r.state_of(g)] == state)
+                and (element is None or GATE_ELEMENT[g] == element)
+                and (level is None or r.level_of(g) == level))
+
+    def query(self, city: Optional[str] = None, state: Optional[str] = None, element: Optional[str] = None,
+              level: Optional[int] = None, cursor: Optional[str] = None, limit: int = 64) -> Dict[str,Any]:
+        """One page of agents matching the filters: { items, next_cursor }."""
+        names = [city] if city else self.cities
+        start_ci, start_g = _decode_cursor(cursor) if cursor else (0, 0)
+        items: List[Dict[str,Any]] = []
+        last = (0, 0)
+        for ci, name in enumerate(self.cities):
+            if name not in names or ci < start_ci:
+                continue
+            r = self.city(name)
+            for g in range(start_g + 1 if ci == start_ci else 1, 65):
+                if self._matches(r, g, state, element, level):
+                    if len(items) == limit:   # there is more: resume after the last item returned
+                        return {"items": items, "next_cursor": _encode_cursor(*last)}
+                    items.append(r.agent(g))
+                    last = (ci, g)
+        return {"items": items, "next_cursor": None}
+
+    def dump(self) -> Dict[str, List[Dict[str,Any]]]:
+        """Full roster in the original { city: [agent, ...] } shape."""
+        return {name: [self.city(name).agent(g) for g in range(1, 65)] for name in self.cities}
+
+    def render(self, **params) -> Tuple[str, bytes]:
+        """
+        (etag, JSON bytes) for `query(**params)`, or for `dump()` with no params.
+        Repeat calls for an unchanged roster return the cached bytes.
+        """
+        params = {k: v for k, v in params.items() if v is not None}   # absent filters/limit keep query()'s defaults
+        key = (self.version,) + tuple(sorted(params.items()))
+        with self._lock:
+            hit = self._bytes.get(key)
+            if hit:
+                self._bytes.move_to_end(key)
+                return hit
+        body = self.query(**params) if len(key) > 1 else self.dump()
+        raw = json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode()
+        etag = '"' + blake2b(raw, digest_size=12).hexdigest() + '"'
+        with self._lock:
+            if key[0] == self.version:
+                self._bytes[key] = (etag, raw)
+                while len(self._bytes) > self.cache_size:
+                    self._bytes.popitem(last=False)
+        return etag, raw
+
+class _LazyRoster(Mapping):
+    """`ROSTER` compatibility view: city → agent list, built on first access."""
+    def __init__(self, svc: RosterService):
+        self._svc = svc
+        self._lists: Dict[str, List[Dict[str,Any]]] = {}
+    def __getitem__(self, name):
+        if name not in self._lists:
+            r = self._svc.city(name)
+            self._lists[name] = [r.agent(g) for g in range(1, 65)]
+        return self._lists[name]
+    def __iter__(self):
+        return iter(self._svc.cities)
+    def __len__(self):
+        return len(self._svc.cities)
+
+ROSTERS = RosterService()
+ROSTER = _LazyRoster(ROSTERS)
 
 def roster_dump():
-    return ROSTER
+    return ROSTERS.dump()
@@ -1,9 +1,27 @@
 # Unified text parser (astro & HD strings) → packet
 import re
-from typing import Optional, Dict, Any
-from .dataset import SIGNS, GATE_META
+from typing import Optional, Dict, Any, Iterable, Iterator, List
+from .dataset import SIGNS, GATE_NAME, GATE_ELEMENT, GATE_KW, PERIODIC, PLANETS, FIELDS
 
-PERIODIC = {m["element"] for m in GATE_META.values()}
+_ABBR = {"Ar":"Aries","Ta":"Taurus","Ge":"Gemini","Cn":"Cancer","Le":"Leo","Vi":"Virgo","Li":"Libra","Sc":"Scorpio","Sg":"Sagittarius","Cp":"Capricorn","Aq":"Aquarius","Pi":"Pisces"}
+_SIGN_INDEX = {name.lower(): i for i, name in enumerate(SIGNS)}
+
+# One tokenizer pass per string. Only the house/tag alternatives peek at their
+# digits (lookahead) so they never swallow digits another token needs; each
+# alternative is the same pattern the individual searches used.
+_ASTRO_TOKENS = re.compile(
+    r"(?P<deg>(\d{1,2})\s*°\s*(\d{1,2})?\s*'?\s*(\d{1,2})?\"?)"      # 15° 32' 10"
+    r"|\b(?P<sign>" + "|".join(SIGNS) + r")\b"                          # Leo
+    r"|\b(?P<abbr>" + "|".join(_ABBR) + r")\b"                          # Le
+    r"|\bH\s*(?=(?P<house>\d{1,2})\b)",                                 # H7
+    re.I)
+_HD_TOKENS = re.compile(
+    r"(?P<gl>\b(?:gate\s*)?(\d{1,2})\s*\.\s*(\d)\b)"                    # Gate 6.3
+    r"|\b(?P<tag>color|tone|base)\s*(?=(?P<tagv>\d)\b)"                 # Color 4
+    r"|(?P<ctb>\bC\s*=?\s*(?=\d\b))",                                   # C4 T2 B6 (hint)
+    re.I)
+_HD_GATE = re.compile(r"\bgate\s*(\d{1,2})\b", re.I)
+_HD_CTB = re.compile(r"\bC\s*=?\s*(\d)\b.*?\bT\s*=?\s*(\d)\b.*?\bB\s*=?\s*(\d)\b", re.I)
 
 def _int(x:str, lo:int, hi:int) -> Optional[int]:
     try:
@@ -13,60 +31,112 @@ def _int(x:str, lo:int, hi:int) -> Optional[int]:
         return None
 
 def parse_astro_text(s: str) -> Dict[str, Any]:
-    s = (s or "").strip().replace("deg","°").replace("degrees","°")
-    s = re.sub(r"\s+", " ", s)
     # 15° 32' 10" Leo H7   OR   23° Aquarius H11
-    d = re.search(r"(\d{1,2})\s*°\s*(\d{1,2})?\s*'?\s*(\d{1,2})?\"?", s)
-    sign = None
-    for name in SIGNS:
-        if re.search(rf"\b{name}\b", s, re.I):
-            sign = name; break
-    if not sign:
-        abbr = {"Ar":"Aries","Ta":"Taurus","Ge":"Gemini","Cn":"Cancer","Le":"Leo","Vi":"Virgo","Li":"Libra","Sc":"Scorpio","Sg":"Sagittarius","Cp":"Capricorn","Aq":"Aquarius","Pi":"Pisces"}
-        m = re.search(r"\b(Ar|Ta|Ge|Cn|Le|Vi|Li|Sc|Sg|Cp|Aq|Pi)\b", s, re.I)
-        if m: sign = abbr[m.group(1)]
-    house = None
-    hm = re.search(r"\bH\s*(\d{1,2})\b", s, re.I)
-    if hm: house = _int(hm.group(1),1,12)
-    deg = int(d.group(1)) if d else None
-    minute = int(d.group(2)) if (d and d.group(2)) else None
-    second = int(d.group(3)) if (d and d.group(3)) else None
+    s = (s or "").replace("deg","°")
+    d = sign_i = abbr = hm = None
+    for m in _ASTRO_TOKENS.finditer(s):
+        kind = m.lastgroup
+        if kind == "deg":
+            if d is None: d = m
+        elif kind == "sign":
+            i = _SIGN_INDEX[m.group("sign").lower()]   # earliest in SIGNS wins, not earliest in text
+            if sign_i is None or i < sign_i: sign_i = i
+        elif kind == "abbr":
+            if abbr is None: abbr = m.group("abbr")
+        elif hm is None:
+            hm = m.group("house")
+    sign = SIGNS[sign_i] if sign_i is not None else (_ABBR[abbr.capitalize()] if abbr else None)
+    house = _int(hm,1,12) if hm else None
+    deg = int(d.group(2)) if d else None
+    minute = int(d.group(3)) if (d and d.group(3)) else None
+    second = int(d.group(4)) if (d and d.group(4)) else None
     return {k:v for k,v in dict(sign=sign, degree=deg, minute=minute, second=second, house=house).items() if v is not None}
 
 def parse_hd_text(s: str) -> Dict[str, Any]:
-    s = (s or "").strip()
-    gate = line = color = tone = base = None
-    m = re.search(r"\b(?:gate\s*)?(\d{1,2})\s*\.\s*(\d)\b", s, re.I)
-    if m: gate, line = _int(m.group(1),1,64), _int(m.group(2),1,6)
-    if gate is None:
-        m = re.search(r"\bgate\s*(\d{1,2})\b", s, re.I)
-        if m: gate = _int(m.group(1),1,64)
-    for tag,key in (("color","color"),("tone","tone"),("base","base")):
-        m = re.search(rf"\b{tag}\s*(\d)\b", s, re.I)
-        if m:
-            val = _int(m.group(1),1,6)
-            if key=="color": color=val
-            elif key=="tone": tone=val
-            else: base=val
-    if (m := re.search(r"\bC\s*=?\s*(\d)\b.*?\bT\s*=?\s*(\d)\b.*?\bB\s*=?\s*(\d)\b", s, re.I)):
+    s = s or ""
+    gate = line = None
+    gl = None; tags = {}; ctb = False
+    for m in _HD_TOKENS.finditer(s):
+        kind = m.lastgroup
+        if kind == "gl":
+            if gl is None: gl = m
+        elif kind == "tagv":
+            tags.setdefault(m.group("tag").lower(), m.group("tagv"))
+        else:
+            ctb = True
+    if gl: gate, line = _int(gl.group(2),1,64), _int(gl.group(3),1,6)
+    if gate is None and (m := _HD_GATE.search(s)):
+        gate = _int(m.group(1),1,64)
+    color, tone, base = (_int(tags[t],1,6) if t in tags else None for t in ("color","tone","base"))
+    if ctb and (m := _HD_CTB.search(s)):
         color, tone, base = _int(m.group(1),1,6), _int(m.group(2),1,6), _int(m.group(3),1,6)
     return {k:v for k,v in dict(gate=gate,line=line,color=color,tone=tone,base=base).items() if v is not None}
 
 def parse_unified(field: Optional[str], planet: Optional[str], astro_text: Optional[str], hd_text: Optional[str]) -> Dict[str, Any]:
     astro = parse_astro_text(astro_text or "")
     hd = parse_hd_text(hd_text or "")
-    gate = hd.get("gate")
-    meta = GATE_META.get(gate or -1)
-    element = meta.get("element") if meta else None
+    gate = hd.get("gate")     # parse_hd_text only returns 1..64
+    element = GATE_ELEMENT[gate] if gate else None
     return {
         "field": field,
         "planet": planet,
         "astro": astro,
         "hd": hd,
         "meta": {
-            "gate_name": meta.get("name") if meta else None,
+            "gate_name": GATE_NAME[gate] if gate else None,
             "element": element,
             "element_is_real": bool(element and element in PERIODIC),
-            "keyword": meta.get("kw") if meta else None
+            "keyword": GATE_KW[gate] if gate else None
         }
     }
+
+def parse_many(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Batch `parse_unified` over dicts shaped like /api/parse bodies (field, planet, astro, hd)."""
+    return [parse_unified(it.get("field"), it.get("planet"), it.get("astro"), it.get("hd")) for it in items]
+
+# Printout lines: optional field heading/prefix, optional planet, astro text, then HD text.
+#   Body
+#   Sun  15° 32' Leo H7   Gate 6.3 Color 4 Tone 2 Base 6
+#   Mind: Moon 2° Aries 41.5
+_LINE_FIELD = re.compile(r"^\s*(" + "|".join(FIELDS) + r")(?:\s+field)?\b\s*[:\-–]?\s*", re.I)
+_LINE_PLANET = re.compile(r"^\s*(" + "|".join(sorted(PLANETS, key=len, reverse=True)) + r")\b\s*[:\-–]?\s*", re.I)
+_LINE_HD = re.compile(r"\b(?:gate\s*)?\d{1,2}\s*\.\s*\d\b|\bgate\b", re.I)
+_FIELD_NAME = {f.lower(): f for f in FIELDS}
+_PLANET_NAME = {p.lower(): p for p in PLANETS}
+
+class LineParser:
+    """
+    Stateful per-line parser for pasted chart printouts: a bare field heading
+    sets the field for the lines that follow; other lines become packets.
+    """
+    def __init__(self, field: Optional[str] = None):
+        self.field = field
+        self.lineno = 0
+
+    def feed(self, line: str) -> Optional[Dict[str, Any]]:
+        self.lineno += 1
+        field = self.field
+        if (m := _LINE_FIELD.match(line)):
+            field = _FIELD_NAME[m.group(1).lower()]
+            line = line[m.end():]
+            if not line.strip():
+                self.field = field
+                return None
+        planet = None
+        if (m := _LINE_PLANET.match(line)):
+            planet = _PLANET_NAME[m.group(1).lower()]
+            line = line[m.end():]
+        h = _LINE_HD.search(line)
+        astro_text, hd_text = (line[:h.start()], line[h.start():]) if h else (line, "")
+        pkt = parse_unified(field, planet, astro_text, hd_text)
+        if not (pkt["astro"] or pkt["hd"]):
+            return None
+        pkt["line"] = self.lineno
+        return pkt
+
+def parse_lines(lines: Iterable[str], field: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Lazily parse a printout line by line (see `LineParser`)."""
+    lp = LineParser(field)
+    for line in lines:
+        if (pkt := lp.feed(line)) is not None:
+            yield pkt
@@ -0,0 +1,164 @@
+# Multi-body placements: Sun through Pluto plus Earth and the lunar nodes, for
+# one or many timestamps, all evaluated from one shared time argument.
+#
+#   Sun            engine.ephemeris (Chebyshev table)
+#   Earth          Sun + 180° (Human Design convention)
+#   Moon           Meeus ch. 47, main periodic terms (~0.01°)
+#   Nodes          mean lunar node; South = North + 180°
+#   Mercury..Pluto JPL/Standish Keplerian elements (valid 1800-2050, slowly
+#                  degrading outside), geocentric via the Earth-Moon barycenter,
+#                  precessed from J2000 to the ecliptic of date
+#
+# Everything is a (timestamps × bodies) NumPy array: the planets' Kepler solve
+# is one vectorized pass over all of them, and the Moon's series is one matrix
+# product. Needs NumPy.
+from __future__ import annotations
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence
+from . import ephemeris
+from .astro import lon_to_sign_dms
+from .hd import resolve
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BODIES = ("Sun", "Earth", "Moon", "North Node", "South Node", "Mercury", "Venus", "Mars",
+          "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+INDEX = {name: i for i, name in enumerate(BODIES)}
+_KEPLER = ("Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Uranus", "Neptune", "Pluto")
+
+# a (au), e, I, L, long. perihelion, long. asc. node (deg) at J2000, then rates per Julian century
+_ELEMENTS = {
+    "Mercury": ((0.38709927, 0.20563593, 7.00497902, 252.25032350, 77.45779628, 48.33076593),
+                (0.00000037, 0.00001906, -0.00594749, 149472.67411175, 0.16047689, -0.12534081)),
+    "Venus":   ((0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255),
+                (0.00000390, -0.00004107, -0.00078890, 58517.81538729, 0.00268329, -0.27769418)),
+    "EMB":     ((1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0),
+                (0.00000562, -0.00004392, -0.01294668, 35999.37244981, 0.32327364, 0.0)),
+    "Mars":    ((1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891),
+                (0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343)),
+    "Jupiter": ((5.20288700, 0.04838624, 1.30439695, 34.39644051, 14.72847983, 100.47390909),
+                (-0.00011607, -0.00013253, -0.00183714, 3034.74612775, 0.21252668, 0.20469106)),
+    "Saturn":  ((9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448),
+                (-0.00125060, -0.00050991, 0.00193609, 1222.49362201, -0.41897216, -0.28867794)),
+    "Uranus":  ((19.18916464, 0.04725744, 0.77263783, 313.23810451, 170.95427630, 74.01692503),
+                (-0.00196176, -0.00004397, -0.00242939, 428.48202785, 0.40805281, 0.04240589)),
+    "Neptune": ((30.06992276, 0.00859048, 1.77004347, -55.12002969, 44.96476227, 131.78422574),
+                (0.00026291, 0.00005105, 0.00035372, 218.45945325, -0.32241464, -0.00508664)),
+    "Pluto":   ((39.48211675, 0.24882730, 17.14001206, 238.92903833, 224.06891629, 110.30393684),
+                (-0.00031596, 0.00005170, 0.00004818, 145.20780515, -0.04062942, -0.01183482)),
+}
+
+# Moon longitude terms: multiples of (D, M, M', F) and coefficient in 1e-6 deg
+_MOON_TERMS = (
+    (0, 0, 1, 0, 6288774), (2, 0, -1, 0, 1274027), (2, 0, 0, 0, 658314), (0, 0, 2, 0, 213618),
+    (0, 1, 0, 0, -185116), (0, 0, 0, 2, -114332), (2, 0, -2, 0, 58793), (2, -1, -1, 0, 57066),
+    (2, 0, 1, 0, 53322), (2, -1, 0, 0, 45758), (0, 1, -1, 0, -40923), (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383), (2, 0, 0, -2, 15327), (0, 0, 1, 2, -12528), (0, 0, 1, -2, 10980),
+    (4, 0, -1, 0, 10675), (0, 0, 3, 0, 10034), (4, 0, -2, 0, 8548), (2, 1, -1, 0, -7888),
+    (2, 1, 0, 0, -6766), (1, 0, -1, 0, -5163), (1, 1, 0, 0, 4987), (2, -1, 1, 0, 4036),
+    (2, 0, 2, 0, 3994),
+)
+
+PRECESSION = 1.396971   # general precession in longitude, deg per Julian century
+
+_ARRAYS: Dict[str, Any] = {}
+
+def _arrays() -> Dict[str, Any]:
+    if not _ARRAYS:
+        if np is None:
+            raise RuntimeError("engine.planets needs NumPy")
+        names = _KEPLER + ("EMB",)
+        _ARRAYS["el0"] = np.array([_ELEMENTS[n][0] for n in names])        # (9, 6)
+        _ARRAYS["el1"] = np.array([_ELEMENTS[n][1] for n in names])
+        terms = np.array(_MOON_TERMS, dtype=np.float64)
+        _ARRAYS["moon_mult"] = terms[:, :4]                                   # (25, 4)
+        _ARRAYS["moon_coef"] = terms[:, 4] * 1e-6
+        _ARRAYS["moon_epow"] = np.abs(terms[:, 1])                            # E^|M multiple|
+    return _ARRAYS
+
+def _heliocentric(t):
+    """(x, y) heliocentric J2000 ecliptic coordinates (au), shape (n, 9): planets then EMB."""
+    a = _arrays()
+    el = a["el0"][None, :, :] + a["el1"][None, :, :] * t[:, None, None]      # (n, 9, 6)
+    sma, e = el[..., 0], el[..., 1]
+    inc, mean_lon, peri, node = (np.radians(el[..., k]) for k in (2, 3, 4, 5))
+    m = np.mod(mean_lon - peri + np.pi, 2 * np.pi) - np.pi
+    w = peri - node
+    ecc = m + e * np.sin(m)
+    for _ in range(6):   # Newton on Kepler's equation; e < 0.25 converges to 1e-12 in a few steps
+        ecc = ecc - (ecc - e * np.sin(ecc) - m) / (1 - e * np.cos(ecc))
+    xp = sma * (np.cos(ecc) - e)
+    yp = sma * np.sqrt(1 - e * e) * np.sin(ecc)
+    cw, sw, cn, sn, ci = np.cos(w), np.sin(w), np.cos(node), np.sin(node), np.cos(inc)
+    x = (cw * cn - sw * sn * ci) * xp + (-sw * cn - cw * sn * ci) * yp
+    y = (cw * sn + sw * cn * ci) * xp + (-sw * sn + cw * cn * ci) * yp
+    return x, y
+
+def _moon(t, nutation):
+    a = _arrays()
+    t2 = t * t
+    lp = 218.3164477 + 481267.88123421 * t - 0.0015786 * t2
+    fund = np.radians(np.stack([
+        297.8501921 + 445267.1114034 * t - 0.0018819 * t2,      # D
+        357.5291092 + 35999.0502909 * t - 0.0001536 * t2,       # M
+        134.9633964 + 477198.8675055 * t + 0.0087414 * t2,      # M'
+        93.2720950 + 483202.0175233 * t - 0.0036539 * t2,       # F
+    ], axis=1))                                                  # (n, 4)
+    e = 1.0 - 0.002516 * t - 0.0000074 * t2
+    terms = np.sin(fund @ a["moon_mult"].T) * a["moon_coef"] * e[:, None] ** a["moon_epow"]
+    a1 = np.radians(119.75 + 131.849 * t)
+    a2 = np.radians(53.09 + 479264.290 * t)
+    extra = 0.003958 * np.sin(a1) + 0.001962 * np.sin(np.radians(lp) - fund[:, 3]) + 0.000318 * np.sin(a2)
+    return lp + terms.sum(axis=1) + extra + nutation
+
+def body_longitudes(ts) -> "np.ndarray":
+    """
+    Apparent ecliptic longitudes (deg, [0, 360)) for UTC unix seconds `ts`.
+    Returns shape (len(ts), len(BODIES)); columns follow BODIES.
+    """
+    ts = np.atleast_1d(np.asarray(ts, dtype=np.float64))
+    jd = ts / 86400.0 + ephemeris.JD_UNIX
+    t = (jd + ephemeris.delta_t_days(jd) - 2451545.0) / 36525.0               # shared time argument (TT centuries)
+    omega = 125.04452 - 1934.136261 * t + 0.0020708 * t * t                   # mean ascending lunar node
+    nutation = -0.00478 * np.sin(np.radians(omega))
+
+    out = np.empty((len(ts), len(BODIES)))
+    if len(ts) < 8:   # the scalar table lookup beats NumPy's per-call overhead here
+        sun = np.array([ephemeris.sun_longitude_jd(j) for j in jd.tolist()])
+    else:
+        sun = ephemeris.sun_longitude_ts_array(ts)
+    out[:, 0], out[:, 1] = sun, sun + 180.0
+    out[:, 2] = _moon(t, nutation)
+    out[:, 3], out[:, 4] = omega, omega + 180.0
+    x, y = _heliocentric(t)
+    geo = np.degrees(np.arctan2(y[:, :-1] - y[:, -1:], x[:, :-1] - x[:, -1:]))
+    out[:, 5:] = geo + (PRECESSION * t + nutation)[:, None]
+    return np.mod(out, 360.0)
+
+def placements_at(dt_utc: datetime, bodies: Sequence[str] = BODIES) -> List[Dict[str, Any]]:
+    """Placement dicts (same shape as calc_birth's Sun placement, plus lon and gate..base) for one moment."""
+    lons = body_longitudes([dt_utc.timestamp()])[0]
+    out = []
+    for name in bodies:
+        lon = float(lons[INDEX[name]])
+        sign, deg, minute, second = lon_to_sign_dms(lon)
+        out.append({"planet": name, "sign": sign, "degree": deg, "minute": minute, "second": second,
+                    "house": None, "lon": round(lon, 6), **resolve(lon)})
+    return out
+
+@lru_cache(maxsize=1024)
+def _transit_row(minute: int):
+    row = body_longitudes([minute * 60.0])[0]
+    row.flags.writeable = False
+    return row
+
+def transit_longitudes(now: datetime) -> "np.ndarray":
+    """
+    `body_longitudes` for `now`, rounded down to the minute and cached: every
+    user's interference at the same moment shares one evaluation.
+    """
+    return _transit_row(int(now.timestamp() // 60))
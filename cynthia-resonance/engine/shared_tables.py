@@ -0,0 +1,59 @@
+# Read-only numeric lookup tables for batch paths, shareable with worker
+# processes through one shared-memory block instead of being pickled per task
+# or loaded again by every worker: the gate columns and the solar Chebyshev
+# table that `ephemeris.sun_longitude_ts_array` evaluates.
+from typing import Dict, Any, Tuple
+from .dataset import GATE_TABLE
+from . import ephemeris
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ELEMENTS = list(GATE_TABLE.element_names)
+
+_LOCAL: Dict[str, Any] = {}
+_ATTACHED: Dict[str, Any] = {}
+_SHM = None
+
+def build_tables() -> Dict[str, Any]:
+    """name → array. Index 0 of per-gate tables is unused (gates are 1-based)."""
+    return {"gate_element": GATE_TABLE.columns()["element_code"].copy(),
+            "sun_cheb": ephemeris.coefficients()}
+
+def tables() -> Dict[str, Any]:
+    """Attached shared views inside a worker, else lazily built local copies."""
+    if _ATTACHED:
+        return _ATTACHED
+    if not _LOCAL:
+        _LOCAL.update(build_tables())
+    return _LOCAL
+
+def share(tables_: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Copy tables into a new SharedMemory block. Returns (shm, spec); pass `spec`
+    to `attach` in each worker and `shm.close(); shm.unlink()` when done.
+    """
+    from multiprocessing import shared_memory
+    layout, off = {}, 0
+    for name, arr in tables_.items():
+        off = (off + 63) & ~63   # cache-line align each table
+        layout[name] = (off, arr.dtype.str, arr.shape)
+        off += arr.nbytes
+    shm = shared_memory.SharedMemory(create=True, size=max(off, 1))
+    for name, arr in tables_.items():
+        o, dt, shape = layout[name]
+        np.ndarray(shape, dtype=dt, buffer=shm.buf, offset=o)[...] = arr
+    return shm, {"name": shm.name, "layout": layout}
+
+def attach(spec: Dict[str, Any]) -> None:
+    """Worker initializer: map the shared block read-only into `tables()` and the ephemeris."""
+    global _SHM
+    from multiprocessing import shared_memory
+    _SHM = shared_memory.SharedMemory(name=spec["name"])   # the parent owns and unlinks it
+    for name, (o, dt, shape) in spec["layout"].items():
+        v = np.ndarray(tuple(shape), dtype=dt, buffer=_SHM.buf, offset=o)
+        v.flags.writeable = False
+        _ATTACHED[name] = v
+    ephemeris.use_coefficients(_ATTACHED["sun_cheb"])
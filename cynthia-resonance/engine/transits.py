@@ -0,0 +1,76 @@
+# Date-range transit scan for calendar views: gate/line change points + a
+# downsampled harmony/triad curve, evaluated in one vectorized pass.
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
+from .astro import sun_longitude_array
+from .hd import sun_to_gate_line
+from .incremental import next_transit_change
+from .interference import natal_sun_lon, _aspect_score_array, _triad_weights_array
+
+MAX_DAYS = 3660
+MAX_POINTS = 2000
+
+def _tolist(x):
+    return x.tolist() if hasattr(x, "tolist") else list(x)
+
+def scan_interference(astro: Dict[str,Any], start: Optional[datetime] = None, days: float = 90,
+                      points: int = 96) -> Dict[str,Any]:
+    """
+    Transit harmony over [start, start+days) (at most MAX_DAYS, MAX_POINTS samples).
+    Change points are solved analytically (one per gate/line crossing), and the
+    curve has a fixed number of samples, so the work does not scale with the
+    number of days you would otherwise poll.
+    """
+    start = start or datetime.now(timezone.utc)
+    days = max(0.0, min(float(days), MAX_DAYS))
+    end = start + timedelta(days=days)
+    points = max(2, min(int(points), MAX_POINTS))
+
+    # change points: walk the analytic crossings instead of sampling
+    times = [start]
+    t = next_transit_change(start)
+    while t < end:
+        times.append(t)
+        t = next_transit_change(t)
+    n_changes = len(times)
+
+    step = (end - start).total_seconds() / (points - 1)
+    t0 = start.timestamp()
+    ts = [tt.timestamp() for tt in times] + [t0 + i*step for i in range(points)]
+
+    natal = natal_sun_lon(astro)
+    lon = sun_longitude_array(ts)
+    harm = _aspect_score_array([l - natal for l in lon] if isinstance(lon, list) else lon - natal)
+    mind, heart, body = _triad_weights_array(harm)
+    lon, harm, mind, heart, body = (_tolist(x) for x in (lon, harm, mind, heart, body))
+
+    states = []
+    prev = None
+    for i in range(n_changes):
+        gate, line = sun_to_gate_line(lon[i])
+        if (gate, line) == prev:
+            continue   # New Year re-anchor without a visible change
+        prev = (gate, line)
+        states.append({
+            "at": times[i].isoformat(),
+            "gate": gate, "line": line,
+            "harmony": round(harm[i], 3),
+            "triad": {"Mind": mind[i], "Heart": heart[i], "Body": body[i]},
+        })
+
+    return {
+        "natal_sun_lon": round(natal, 3),
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "initial": states[0],        # gate/line in effect at `start`
+        "changes": states[1:],       # every crossing after it
+        "curve": {
+            "start": start.isoformat(),
+            "step_hours": round(step / 3600.0, 4),
+            "harmony": [round(h, 3) for h in harm[n_changes:]],
+            "Mind": mind[n_changes:],
+            "Heart": heart[n_changes:],
+            "Body": body[n_changes:],
+        },
+    }
@@ -0,0 +1,22 @@
+# One call through every hot engine path, so imports, compiled patterns and
+# lookup tables are loaded before the first request (or in a fresh pool worker).
+import os
+from datetime import datetime, timezone
+from .birthcalc import Birth, calc_birth, calc_chart
+from .composite import rank
+from .dataset import GATE_TABLE
+from .interference import calc_interference, chart_interference_at, plan_from_interference
+from .parsers import parse_unified
+from .transits import scan_interference
+
+def warm() -> int:
+    """Run a sample Sun chart, full chart, plan, short scan, compat rank and parse. Returns the pid (to count warmed workers)."""
+    astro, hd, auric = calc_birth(Birth(dateISO="2000-01-01", time="12:00", tzOffset=0))
+    plan_from_interference(calc_interference(astro, hd, auric, None), auric)
+    scan_interference(astro, None, 30, 8)
+    chart, _ = calc_chart(Birth(dateISO="2000-01-01", time="12:00", tzOffset=0))
+    chart_interference_at(chart, datetime.now(timezone.utc))
+    rank(Birth(dateISO="2000-01-01"), [Birth(dateISO="1990-06-15")], 1)
+    parse_unified("Mind", "Sun", "15° 32' Leo H7", "Gate 6.3, Color 4 Tone 2 Base 6")
+    GATE_TABLE.columns()
+    return os.getpid()
@@ -0,0 +1,62 @@
+# Opt-in fast JSON responses for server.py (FAST_JSON=1)
+#
+# Handlers keep returning plain dicts/lists. With FAST_JSON on, FastJSONRoute
+# wraps each endpoint so its result is serialized straight to bytes (orjson when
+# installed) instead of going through jsonable_encoder + json.dumps. Endpoints
+# that already return a Response are passed through untouched. The root
+# assistant_api.py loads this same module, so there is one implementation.
+import functools, inspect, json, os
+from typing import Any, Callable, Dict, Optional
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ENABLED = os.getenv("FAST_JSON", "").lower() in ("1", "true", "yes", "on")
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content if isinstance(content, (bytes, bytearray)) else dumps(content)
+
+def _wrap(endpoint: Callable, status_code: Optional[int] = None) -> Callable:
+    status = status_code or 200   # the route's status_code=, which a returned Response would otherwise drop
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            out = await endpoint(*args, **kwargs)
+            return out if isinstance(out, Response) else FastJSONResponse(out, status_code=status)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            out = endpoint(*args, **kwargs)
+            return out if isinstance(out, Response) else FastJSONResponse(out, status_code=status)
+    return wrapper
+
+class FastJSONRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _wrap(endpoint, kwargs.get("status_code")), **kwargs)
+
+_STATIC: Dict[str, bytes] = {}
+
+def static_json(key: str, build: Callable[[], Any]) -> Response:
+    """Serialize `build()` once and serve the same bytes for every later call."""
+    raw = _STATIC.get(key)
+    if raw is None:
+        raw = _STATIC[key] = dumps(build())
+    return FastJSONResponse(raw)
+
+def install(app) -> bool:
+    """Route every endpoint declared after this call through FastJSONRoute (if enabled)."""
+    if ENABLED:
+        app.router.route_class = FastJSONRoute
+    return ENABLED
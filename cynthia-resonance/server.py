@@ -1,75 +1,129 @@
 import os
-from fastapi import FastAPI
-from pydantic import BaseModel, Field
-from engine.birthcalc import Birth, calc_birth
-from engine.interference import calc_interference, plan_from_interference
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from engine.birthcalc import calc_birth, calc_chart, calc_design
+from engine.incremental import FieldTracker
+from engine.transits import scan_interference
+from engine.interference import plan_from_interference
 from engine.adapters import maybe_narrate
-from engine.parsers import parse_unified
-from engine.little_guys import roster_dump
+from engine.parsers import parse_unified, parse_many, LineParser
+from engine.little_guys import ROSTERS
+from api_common import (BirthIn, InterfIn, PlanIn, RangeIn, FieldIn, AgentChange, ParseIn, CompatIn, to_birth,
+                        when_utc, interference_for, compat_for, health_payload, roster_response, agent_store, close_agent_store, field_events, duplex_ndjson, body_lines)
+import fastjson
 
 PORT = int(os.getenv("PORT", "8787"))
 app = FastAPI(title="Cynthia Resonance", version="0.1.0")
+fastjson.install(app)                 # FAST_JSON=1 → orjson bytes, no jsonable_encoder
+FIELDS = FieldTracker()
 
-# ----- Schemas -----
-class BirthIn(BaseModel):
-    dateISO: str
-    time: str | None = None
-    tzOffset: float | None = None
-    lat: float | None = None
-    lon: float | None = None
-
-class InterfIn(BirthIn):
-    dateTodayISO: str | None = None   # if you want a different transit date than "now"
-
-class PlanIn(InterfIn):
-    narrate: bool = False
-    mode: str | None = None           # Venom / Echo / Prime / Dream / Softcore (affects style for narration)
-
-class ParseIn(BaseModel):
-    field: str | None = None          # "Mind"|"Heart"|"Body"
-    planet: str | None = None
-    astro: str | None = None          # e.g. "15° 32' Leo H7"
-    hd: str | None = None             # e.g. "Gate 6.3, Color 4 Tone 2 Base 6"
+@app.on_event("shutdown")
+def _flush_agents():
+    close_agent_store()
 
 # ----- Endpoints -----
 @app.get("/health")
 def health():
-    return {
-        "ok": True,
-        "ollama": os.getenv("OLLAMA_BASE", None),
-        "models": {
-            "coach": os.getenv("COACH_MODEL","phi"),
-            "mind":  os.getenv("MIND_MODEL","mistral"),
-            "heart": os.getenv("HEART_MODEL","tinyllama"),
-            "body":  os.getenv("BODY_MODEL","tinyllama"),
-        }
-    }
+    return fastjson.static_json("health", health_payload) if fastjson.ENABLED else health_payload()
 
 @app.post("/api/birth")
 def api_birth(inp: BirthIn):
-    astro, hd, auric = calc_birth(Birth(**inp.model_dump()))
+    astro, hd, auric = calc_birth(to_birth(inp))
     return {"astro": astro, "hd": hd, "auric": auric}
 
+@app.post("/api/chart")
+def api_chart(inp: BirthIn):
+    """Personality (birth) and Design (88° solar arc earlier) placements for every body, with gate/line."""
+    b = to_birth(inp)
+    astro, hd = calc_chart(b)
+    d_utc, d_astro, d_hd = calc_design(b)
+    return {"astro": astro, "hd": hd, "design": {"utc": d_utc, "astro": d_astro, "hd": d_hd}}
+
 @app.post("/api/interference")
 def api_interf(inp: InterfIn):
-    astro, hd, auric = calc_birth(Birth(**inp.model_dump()))
-    inter = calc_interference(astro, hd, auric, inp.dateTodayISO)
-    return inter
+    return interference_for(inp, to_birth(inp))
+
+@app.post("/api/interference/range")
+def api_interf_range(inp: RangeIn):
+    astro, hd, auric = calc_birth(to_birth(inp))
+    return scan_interference(astro, when_utc(inp.startISO), inp.days, inp.points)
 
 @app.post("/api/plan")
 def api_plan(inp: PlanIn):
-    astro, hd, auric = calc_birth(Birth(**inp.model_dump()))
-    inter = calc_interference(astro, hd, auric, inp.dateTodayISO)
+    b = to_birth(inp)
+    astro, hd, auric = calc_birth(b)
+    inter = interference_for(inp, b, astro)
     plan = plan_from_interference(inter, auric)
     out = {"plan": plan, "astro": astro, "hd": hd, "auric": auric}
     if inp.narrate:
         out["narration"] = maybe_narrate(plan, mode=inp.mode or "Prime")
     return out
 
+@app.post("/api/compat")
+def api_compat(inp: CompatIn):
+    return compat_for(inp)
+
+@app.post("/api/field")
+def api_field(inp: FieldIn):
+    """Incremental interference: cached until the transit Sun changes gate/line."""
+    return FIELDS.tick(inp.userId, to_birth(inp), when_utc(inp.dateTodayISO))
+
+@app.get("/api/field/{user_id}/events")
+async def api_field_events(user_id: str, request: Request):
+    """SSE push of transit gate/line changes for a user registered via /api/field."""
+    if FIELDS.valid_until(user_id) is None:
+        raise HTTPException(404, "unknown user; POST /api/field first")
+    return StreamingResponse(field_events(FIELDS, user_id, request), media_type="text/event-stream")
+
 @app.get("/api/agents")
-def api_agents():
-    return roster_dump()
+def api_agents(request: Request, city: str | None = None, state: str | None = None, element: str | None = None,
+               level: int | None = None, cursor: str | None = None, limit: int | None = None):
+    """
+    No query params → the full { city: [agent] } roster. Any filter, cursor or
+    limit → one page { items, next_cursor }. ETag/If-None-Match → 304.
+    """
+    return roster_response(ROSTERS, request, city=city, state=state, element=element, level=level,
+                            cursor=cursor, limit=limit)
+
+@app.get("/api/users/{user_id}/agents")
+def api_user_agents(user_id: str, request: Request, city: str | None = None, state: str | None = None,
+                    element: str | None = None, level: int | None = None, cursor: str | None = None,
+                    limit: int | None = None):
+    """Same contract as /api/agents, over this user's unlocked/dormant/level state."""
+    return roster_response(agent_store().roster(user_id), request, city=city, state=state, element=element,
+                            level=level, cursor=cursor, limit=limit)
+
+@app.get("/api/users/{user_id}/agents/state")
+def api_user_agent_state(user_id: str):
+    """Compact state: per-city 64-bit unlocked/dormant masks (hex, bit g-1 = gate g) + level lists."""
+    return agent_store().get(user_id).compact()
+
+@app.post("/api/users/{user_id}/agents")
+def api_user_agents_update(user_id: str, changes: list[AgentChange]):
+    """Unlock / make dormant / lock / level agents; persisted in batches."""
+    try:
+        ua = agent_store().apply(user_id, (c.model_dump() for c in changes))
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return ua.compact()
 
 @app.post("/api/parse")
 def api_parse(inp: ParseIn):
     return parse_unified(field=inp.field, planet=inp.planet, astro_text=inp.astro, hd_text=inp.hd)
+
+@app.post("/api/parse/many")
+def api_parse_many(items: list[ParseIn]):
+    return parse_many(it.model_dump() for it in items)
+
+@app.post("/api/parse/stream")
+async def api_parse_stream(request: Request, field: str | None = None):
+    """
+    Bulk printout ingestion: text/plain (or multipart) body in, one NDJSON packet
+    out per parsed line, emitted as the upload streams in.
+    """
+    lp = LineParser(field)
+    async def packets():
+        async for line in body_lines(request):
+            if (pkt := lp.feed(line)) is not None:
+                yield fastjson.dumps(pkt) + b"\n"
+    return await duplex_ndjson(packets())
@@ -0,0 +1,182 @@
+# Async-native variant of server.py (same routes and payloads)
+#
+#   uvicorn server_async:app --loop uvloop --port 8787
+#
+# CPU-light handlers are `async def` and run on the event loop (no threadpool
+# hop); large batches (/api/interference/range over long spans, big
+# /api/parse/many bodies) go to a spawn-context process pool. The lifespan hook
+# warms the engine, roster bytes and every pool worker before the app reports
+# ready on /ready, so the first real request doesn't pay for imports and caches.
+import os, time, asyncio, multiprocessing
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from engine.birthcalc import calc_birth, calc_chart, calc_design
+from engine.incremental import FieldTracker
+from engine.transits import scan_interference
+from engine.interference import plan_from_interference
+from engine import adapters
+from engine.parsers import parse_unified, parse_many, LineParser
+from engine.little_guys import ROSTERS
+from engine.warmup import warm
+from api_common import (BirthIn, InterfIn, PlanIn, RangeIn, FieldIn, AgentChange, ParseIn, CompatIn, to_birth,
+                        when_utc, interference_for, compat_for, health_payload, roster_response, agent_store, close_agent_store, field_events, duplex_ndjson, body_lines)
+import fastjson
+
+POOL_WORKERS = int(os.getenv("POOL_WORKERS", str(min(4, os.cpu_count() or 1))))   # 0 → threadpool only
+RANGE_POOL_DAYS = 366                 # /api/interference/range spans above this run in the pool (~3 ms/year)
+PARSE_POOL_ITEMS = 500                # /api/parse/many bodies above this run in the pool (~13 µs/item)
+COMPAT_POOL_ITEMS = 2000              # /api/compat candidate lists above this run in the pool
+
+FIELDS = FieldTracker()
+POOL: ProcessPoolExecutor | None = None
+READY = {"ready": False, "warmup_ms": None, "pool_workers": 0}
+
+async def _offload(fn, *args):
+    """Run `fn(*args)` in the process pool, or a worker thread when the pool is disabled."""
+    if POOL is None:
+        return await run_in_threadpool(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(POOL, fn, *args)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global POOL
+    t = time.perf_counter()
+    warm()
+    ROSTERS.render()                  # full roster bytes + ETag
+    if POOL_WORKERS > 0:
+        POOL = ProcessPoolExecutor(POOL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(POOL, warm) for _ in range(POOL_WORKERS)))
+        READY["pool_workers"] = len(set(pids))
+    READY.update(ready=True, warmup_ms=round((time.perf_counter() - t) * 1000, 1))
+    try:
+        yield
+    finally:
+        READY["ready"] = False
+        if POOL is not None:
+            POOL.shutdown(cancel_futures=True)
+            POOL = None
+        await adapters.aclose()
+        close_agent_store()
+
+app = FastAPI(title="Cynthia Resonance", version="0.1.0", lifespan=lifespan)
+fastjson.install(app)
+
+# ----- Endpoints -----
+@app.get("/health")
+async def health():
+    return fastjson.static_json("health", health_payload) if fastjson.ENABLED else health_payload()
+
+@app.get("/ready")
+async def ready():
+    """503 until the lifespan warmup has finished; load balancers should gate on this."""
+    if not READY["ready"]:
+        raise HTTPException(503, "warming up")
+    return READY
+
+@app.post("/api/birth")
+async def api_birth(inp: BirthIn):
+    astro, hd, auric = calc_birth(to_birth(inp))
+    return {"astro": astro, "hd": hd, "auric": auric}
+
+@app.post("/api/chart")
+async def api_chart(inp: BirthIn):
+    """Personality (birth) and Design (88° solar arc earlier) placements for every body, with gate/line."""
+    b = to_birth(inp)
+    astro, hd = calc_chart(b)
+    d_utc, d_astro, d_hd = calc_design(b)
+    return {"astro": astro, "hd": hd, "design": {"utc": d_utc, "astro": d_astro, "hd": d_hd}}
+
+@app.post("/api/interference")
+async def api_interf(inp: InterfIn):
+    return interference_for(inp, to_birth(inp))
+
+@app.post("/api/interference/range")
+async def api_interf_range(inp: RangeIn):
+    astro, hd, auric = calc_birth(to_birth(inp))
+    if inp.days > RANGE_POOL_DAYS:
+        return await _offload(scan_interference, astro, when_utc(inp.startISO), inp.days, inp.points)
+    return scan_interference(astro, when_utc(inp.startISO), inp.days, inp.points)
+
+@app.post("/api/plan")
+async def api_plan(inp: PlanIn):
+    b = to_birth(inp)
+    astro, hd, auric = calc_birth(b)
+    inter = interference_for(inp, b, astro)
+    plan = plan_from_interference(inter, auric)
+    out = {"plan": plan, "astro": astro, "hd": hd, "auric": auric}
+    if inp.narrate:
+        out["narration"] = await adapters.maybe_narrate_async(plan, mode=inp.mode or "Prime")
+    return out
+
+@app.post("/api/compat")
+async def api_compat(inp: CompatIn):
+    if len(inp.others) > COMPAT_POOL_ITEMS:
+        return await _offload(compat_for, inp)
+    return await run_in_threadpool(compat_for, inp)   # still up to 2000 ephemeris evaluations: keep it off the loop
+
+@app.post("/api/field")
+async def api_field(inp: FieldIn):
+    """Incremental interference: cached until the transit Sun changes gate/line."""
+    return FIELDS.tick(inp.userId, to_birth(inp), when_utc(inp.dateTodayISO))
+
+@app.get("/api/field/{user_id}/events")
+async def api_field_events(user_id: str, request: Request):
+    """SSE push of transit gate/line changes for a user registered via /api/field."""
+    if FIELDS.valid_until(user_id) is None:
+        raise HTTPException(404, "unknown user; POST /api/field first")
+    return StreamingResponse(field_events(FIELDS, user_id, request), media_type="text/event-stream")
+
+@app.get("/api/agents")
+async def api_agents(request: Request, city: str | None = None, state: str | None = None, element: str | None = None,
+                     level: int | None = None, cursor: str | None = None, limit: int | None = None):
+    """Same contract as server.py: full roster, or one filtered page; ETag/If-None-Match → 304."""
+    return roster_response(ROSTERS, request, city=city, state=state, element=element, level=level,
+                           cursor=cursor, limit=limit)
+
+@app.get("/api/users/{user_id}/agents")
+async def api_user_agents(user_id: str, request: Request, city: str | None = None, state: str | None = None,
+                          element: str | None = None, level: int | None = None, cursor: str | None = None,
+                          limit: int | None = None):
+    svc = await run_in_threadpool(agent_store().roster, user_id)   # a cold user is one SQLite point read
+    return roster_response(svc, request, city=city, state=state, element=element,
+                           level=level, cursor=cursor, limit=limit)
+
+@app.get("/api/users/{user_id}/agents/state")
+async def api_user_agent_state(user_id: str):
+    # a cold user is one SQLite point read
+    ua = await run_in_threadpool(agent_store().get, user_id)
+    return ua.compact()
+
+@app.post("/api/users/{user_id}/agents")
+async def api_user_agents_update(user_id: str, changes: list[AgentChange]):
+    """Mutations may trigger a batched SQLite flush, so they stay off the event loop."""
+    try:
+        ua = await run_in_threadpool(agent_store().apply, user_id, [c.model_dump() for c in changes])
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return ua.compact()
+
+@app.post("/api/parse")
+async def api_parse(inp: ParseIn):
+    return parse_unified(field=inp.field, planet=inp.planet, astro_text=inp.astro, hd_text=inp.hd)
+
+@app.post("/api/parse/many")
+async def api_parse_many(items: list[ParseIn]):
+    rows = [it.model_dump() for it in items]
+    if len(rows) > PARSE_POOL_ITEMS:
+        return await _offload(parse_many, rows)
+    return parse_many(rows)
+
+@app.post("/api/parse/stream")
+async def api_parse_stream(request: Request, field: str | None = None):
+    """Bulk printout ingestion: one NDJSON packet per parsed line, emitted as the upload streams in."""
+    lp = LineParser(field)
+    async def packets():
+        async for line in body_lines(request):
+            if (pkt := lp.feed(line)) is not None:
+                yield fastjson.dumps(pkt) + b"\n"
+    return await duplex_ndjson(packets())
@@ -1,5 +1,5 @@
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 from pathlib import Path
 import os
 
@@ -13,25 +13,70 @@ _CANDIDATE_DIRS = [
     Path(__file__).resolve().parent,                # repo root with loose templates
 ]
 
+# Environments are long-lived and shared: one per template directory per
+# process, so a template is parsed once and every later build (and every
+# builder worker process) reuses it. Compiled templates also go to a bytecode
+# cache on disk, so even a fresh process skips Jinja's compile step. Templates
+# are re-checked on every lookup only in dev mode (BUILDER_DEV=1); otherwise the
+# builder calls reset_templates() when it sees the template files change.
+DEV_MODE = os.getenv("BUILDER_DEV", "0") not in ("0", "false", "")
+BYTECODE_CACHE_DIR = os.getenv("JINJA_CACHE_DIR",
+                               str(Path(__file__).resolve().parent / ".build_cache" / "jinja"))
+_ENVS = {}
+
+class _BytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache whose directory is created on the first compile, not at import."""
+
+    def dump_bytecode(self, bucket):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            super().dump_bytecode(bucket)
+        except OSError:  # read-only checkout: templates still work, just compiled per process
+            pass
+
+def get_env(searchpath) -> Environment:
+    """Shared Environment for a template directory (created on first use)."""
+    key = os.path.abspath(searchpath)
+    if key not in _ENVS:
+        _ENVS[key] = Environment(loader=FileSystemLoader(str(searchpath)), auto_reload=DEV_MODE,
+                                 bytecode_cache=_BytecodeCache(BYTECODE_CACHE_DIR))
+    return _ENVS[key]
+
+def reset_templates():
+    """Drop parsed templates (after the template files changed); bytecode stays valid, it is keyed by source."""
+    for e in _ENVS.values():
+        e.cache.clear()
+
 for _path in _CANDIDATE_DIRS:
     if _path.exists():
-        env = Environment(loader=FileSystemLoader(str(_path)))
+        env = get_env(_path)
         break
 else:  # pragma: no cover - defensive fallback
-    env = Environment(loader=FileSystemLoader("."))
+    env = get_env(".")
+
+def _content(spec):
+    """Inline content, or ``{"ref": ...}`` for specs extracted in streaming mode (see spec_extractor.content_ref)."""
+    return spec["content"] if "content" in spec else {"ref": spec["content_ref"]}
 
 def generate_layout(specs):
     layout = {
         "folders": [],
         "files": {}
     }
+    templates = {}
+
+    def template(name):
+        # looked up once per call, on first use (a missing template only fails specs that need it)
+        if name not in templates:
+            templates[name] = env.get_template(name)
+        return templates[name]
 
     for spec in specs:
         if spec["type"] == "text":
             module = spec.get("module", "UnknownModule")
             if spec.get("pairs"):
                 layout["folders"].append("charts")
-                chart_template = env.get_template("chart.html.j2")
+                chart_template = template("chart.html.j2")
                 chart_html = chart_template.render(title=module + " Chart", pairs=spec["pairs"])
                 layout["files"][f"charts/{module}_chart.html"] = chart_html
 
@@ -40,8 +85,8 @@ def generate_layout(specs):
 
             elif spec.get("intents"):
                 layout["folders"].append("store")
-                store_template = env.get_template("store.html.j2")
-                logic_template = env.get_template("store_logic.py.j2")
+                store_template = template("store.html.j2")
+                logic_template = template("store_logic.py.j2")
 
                 store_html = store_template.render(store_name=module, assignments=spec["intents"])
                 logic_py = logic_template.render(store_name=module, assignments=spec["intents"])
@@ -56,10 +101,10 @@ def generate_layout(specs):
 
         elif spec["type"] == "template":
             layout["folders"].append("custom_html")
-            layout["files"][f"custom_html/manual_upload.html"] = spec["content"]
+            layout["files"][f"custom_html/manual_upload.html"] = _content(spec)
 
         elif spec["type"] == "code":
             layout["folders"].append("scripts")
-            layout["files"][f"scripts/manual_upload.py"] = spec["content"]
+            layout["files"][f"scripts/manual_upload.py"] = _content(spec)
 
     return layout
@@ -1,6 +1,10 @@
 import os
-from flask import Flask, request, jsonify, render_template_string
-from builder_engine import run_builder
+import queue
+import threading
+from flask import Flask, Response, abort, request, jsonify, send_file
+from werkzeug.security import safe_join
+from builder_engine import run_builder, manifest_path
+from build_watcher import events, build_event, format_sse, start_watch
 
 app = Flask(__name__)
 
@@ -12,24 +16,62 @@ LOG_DIR = "logs"
 for folder in [UPLOAD_DIR, GENERATED_DIR, LOG_DIR]:
     os.makedirs(folder, exist_ok=True)
 
-@app.route("/")
-def home():
-    return "🧠 YOU-N-I-VERSE Builder is live! Drop files in /uploads and go to /preview."
+# Watch mode: uploads/ changes trigger incremental builds, announced on /events.
+# Started with the first preview/events request (so only the serving process
+# watches, also under the debug reloader); BUILDER_WATCH=0 turns it off.
+WATCH = os.getenv("BUILDER_WATCH", "1") not in ("0", "false")
+SSE_KEEPALIVE = 15.0
+_watch_lock = threading.Lock()
+_watcher = None
 
-@app.route("/build", methods=["POST", "GET"])
-def build():
-    run_builder()
-    return "✅ Builder ran successfully."
+def _ensure_watcher():
+    global _watcher
+    if not WATCH:
+        return
+    with _watch_lock:
+        if _watcher is None or not _watcher[0].is_alive():
+            _watcher = start_watch(UPLOAD_DIR, GENERATED_DIR)
 
-@app.route("/preview")
-def preview():
-    file_links = []
-    for root, _, files in os.walk(GENERATED_DIR):
-        for file in files:
-            rel_path = os.path.relpath(os.path.join(root, file), GENERATED_DIR)
-            file_links.append(rel_path)
+# ── preview index ──────────────────────────────────────────────
+# The file list is walked once and reused until a build event arrives (or the
+# builder manifest changes, for builds run outside this process). Precompressed
+# .gz/.br siblings written by the builder are served, not listed.
+_index_lock = threading.Lock()
+_index = {"key": None, "files": []}
+_SIDECARS = (".gz", ".br")
+_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _index_key():
+    return events.seq, _mtime_ns(manifest_path(GENERATED_DIR)), _mtime_ns(GENERATED_DIR)
+
+def _generated_files():
+    key = _index_key()
+    with _index_lock:
+        if _index["key"] != key:
+            found = set()
+            for root, _, files in os.walk(GENERATED_DIR):
+                for file in files:
+                    found.add(os.path.relpath(os.path.join(root, file), GENERATED_DIR).replace(os.sep, "/"))
+            _index["files"] = sorted(f for f in found if not (f.endswith(_SIDECARS) and f[:-3] in found))
+            _index["key"] = key
+        return _index["files"]
+
+_PREVIEW = None
 
-    return render_template_string("""
+def _preview_template():
+    """The listing page template, compiled once."""
+    global _PREVIEW
+    if _PREVIEW is None:
+        _PREVIEW = app.jinja_env.from_string(PREVIEW_HTML)
+    return _PREVIEW
+
+PREVIEW_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -43,6 +85,7 @@ def preview():
     </head>
     <body>
         <h1>🔍 Generated Files</h1>
+        <div id="files">
         {% if file_links %}
             {% for file in file_links %}
                 <a href="#" onclick="loadFile('{{ file }}'); return false;">{{ file }}</a>
@@ -50,14 +93,37 @@ def preview():
         {% else %}
             <p class="no-files">No generated files yet. Upload to /uploads/ and trigger a build!</p>
         {% endif %}
+        </div>
         <h2>File Content</h2>
         <div id="content">Click a file to view its content.</div>
         <script>
+            let current = null;
+            function renderFiles(files) {
+                const box = document.getElementById('files');
+                box.replaceChildren();
+                if (!files.length) {
+                    box.innerHTML = '<p class="no-files">No generated files yet. Upload to /uploads/ and trigger a build!</p>';
+                }
+                for (const file of files) {
+                    const a = document.createElement('a');
+                    a.href = '#';
+                    a.textContent = file;
+                    a.onclick = () => { loadFile(file); return false; };
+                    box.appendChild(a);
+                }
+            }
+            // Builds (watch mode or /build) are pushed here; refresh the list and the open file in place.
+            new EventSource('/events').addEventListener('build', async (e) => {
+                const ev = JSON.parse(e.data);
+                if (ev.error || !ev.changed.length) return;
+                renderFiles(await (await fetch('/preview/files')).json());
+                if (current && ev.changed.includes(current)) loadFile(current);
+            });
             async function loadFile(path) {
+                current = path;
                 try {
-                    const response = await fetch(`/file_content?path=${encodeURIComponent(path)}`);
-                    const data = await response.json();
-                    document.getElementById('content').innerText = data.content || 'Error loading file.';
+                    const response = await fetch(`/preview/file/${path.split('/').map(encodeURIComponent).join('/')}`);
+                    document.getElementById('content').innerText = response.ok ? await response.text() : 'Error loading file.';
                 } catch (error) {
                     document.getElementById('content').innerText = 'Failed to load file: ' + error.message;
                 }
@@ -65,7 +131,72 @@ def preview():
         </script>
     </body>
     </html>
-    """, file_links=file_links)
+"""
+
+@app.route("/")
+def home():
+    return "🧠 YOU-N-I-VERSE Builder is live! Drop files in /uploads and go to /preview."
+
+@app.route("/build", methods=["POST", "GET"])
+def build():
+    summary = run_builder(incremental=request.args.get("full") not in ("1", "true"))
+    events.publish(build_event(summary))
+    if "error" in summary:
+        return f"❌ Builder failed: {summary['error']}", 500
+    return f"✅ Builder ran successfully ({len(summary['changed'])} files changed)."
+
+@app.route("/preview")
+def preview():
+    _ensure_watcher()
+    file_links = _generated_files()
+    return _preview_template().render(file_links=file_links)
+
+@app.route("/preview/files")
+def preview_files():
+    return jsonify(_generated_files())
+
+@app.route("/events")
+def build_events():
+    """Server-sent build notifications (one `build` event per finished build)."""
+    _ensure_watcher()
+
+    def stream(q):
+        try:
+            yield "retry: 2000\n\n"
+            while True:
+                try:
+                    yield format_sse(q.get(timeout=SSE_KEEPALIVE))
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        finally:
+            events.unsubscribe(q)
+
+    return Response(stream(events.subscribe()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route("/preview/file/<path:rel>")
+def preview_file(rel):
+    """
+    A generated file, with ETag/Last-Modified revalidation and Range requests.
+    Whole-file requests get the prebuilt .br/.gz sibling when the client
+    accepts it; ranges are always served from the uncompressed file.
+    """
+    full_path = safe_join(os.path.abspath(GENERATED_DIR), rel)
+    if full_path is None or not os.path.isfile(full_path):
+        abort(404)
+    accepted = request.accept_encodings
+    if "Range" not in request.headers:
+        for coding, suffix in _ENCODINGS:
+            if accepted[coding] and os.path.isfile(full_path + suffix):
+                response = send_file(full_path + suffix, download_name=os.path.basename(rel), conditional=True)
+                response.headers["Content-Encoding"] = coding
+                response.headers["Vary"] = "Accept-Encoding"
+                response.headers["Cache-Control"] = "no-cache"
+                return response
+    response = send_file(full_path, conditional=True)
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 @app.route("/file_content")
 def file_content():
@@ -78,4 +209,4 @@ def file_content():
         return jsonify({"content": f"Error: {e}"})
 
 if __name__ == "__main__":
-    app.run(debug=True, port=3000)
+    app.run(debug=True, port=3000, threaded=True)
@@ -1,11 +1,14 @@
-
+import codecs
+import os
 import re
-from typing import Iterable, Union
+from typing import Iterable, Iterator, Union
 
 EncodingSelector = Union[str, Iterable[str]]
 
+CHUNK_SIZE = 1 << 20  # bytes per read in streaming mode
 
-def _read_file_with_encodings(file_path, encodings: EncodingSelector) -> str:
+
+def _encoding_list(encodings: EncodingSelector) -> list:
     if isinstance(encodings, str):
         encodings_to_try = [encodings]
     else:
@@ -13,6 +16,11 @@ def _read_file_with_encodings(file_path, encodings: EncodingSelector) -> str:
 
     if not encodings_to_try:
         raise ValueError("At least one encoding must be provided")
+    return encodings_to_try
+
+
+def _read_file_with_encodings(file_path, encodings: EncodingSelector) -> str:
+    encodings_to_try = _encoding_list(encodings)
 
     last_error = None
     for encoding in encodings_to_try:
@@ -27,7 +35,116 @@ def _read_file_with_encodings(file_path, encodings: EncodingSelector) -> str:
     )
 
 
-def extract_specs(file_path, file_type, encodings: EncodingSelector = "utf-8"):
+def detect_encoding(file_path, encodings: EncodingSelector, chunk_size: int = CHUNK_SIZE) -> str:
+    """First of ``encodings`` that decodes the whole file, found in one chunked read.
+
+    Every candidate gets an incremental decoder fed the same chunks; a candidate
+    drops out at its first decode error, so the file is read once however many
+    encodings are tried and never held in memory whole.
+    """
+    encodings_to_try = _encoding_list(encodings)
+    if len(encodings_to_try) == 1:
+        return encodings_to_try[0]  # nothing to choose; errors surface while streaming
+
+    decoders = {enc: codecs.getincrementaldecoder(enc)() for enc in encodings_to_try}
+    last_error = None
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            for enc, dec in list(decoders.items()):
+                try:
+                    dec.decode(chunk)
+                except UnicodeDecodeError as exc:
+                    last_error = exc
+                    del decoders[enc]
+            if not decoders:
+                raise last_error
+    for enc, dec in list(decoders.items()):
+        try:
+            dec.decode(b"", final=True)
+        except UnicodeDecodeError as exc:
+            last_error = exc
+            del decoders[enc]
+    for enc in encodings_to_try:
+        if enc in decoders:
+            return enc
+    raise last_error
+
+
+def iter_lines(file_path, encoding: str = "utf-8", chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Lines of a file (without line endings, like ``str.splitlines``), decoded incrementally."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    tail = ""
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            lines = (tail + decoder.decode(chunk)).splitlines(keepends=True)
+            # the last piece may be an unfinished line (or a "\r" whose "\n" is in the next chunk)
+            tail = lines.pop() if lines else ""
+            for line in lines:
+                yield line.splitlines()[0]
+        tail += decoder.decode(b"", final=True)
+    for line in tail.splitlines():
+        yield line
+
+
+def content_ref(file_path, encoding: str, root=None) -> dict:
+    """
+    Reference to a file's content (path relative to ``root``, default its
+    directory + byte range + encoding) instead of the text itself. Refs end up
+    in layout.json, so they never carry absolute paths.
+    """
+    st = os.stat(file_path)
+    offset = len(codecs.BOM_UTF8) if encoding.lower().replace("_", "-") == "utf-8-sig" else 0
+    path = os.path.relpath(file_path, root) if root else os.path.basename(file_path)
+    return {"path": path.replace(os.sep, "/"), "offset": offset, "length": st.st_size - offset,
+            "encoding": encoding, "mtime_ns": st.st_mtime_ns}
+
+
+def iter_ref_chunks(ref: dict, root=".", chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Decoded text of a ``content_ref`` (resolved against ``root``) in bounded
+    chunks, with newlines translated to "\n" like a text-mode read, so output
+    does not depend on whether the upload was streamed.
+    """
+    decoder = codecs.getincrementaldecoder(ref["encoding"])()
+    pending = ""   # a trailing "\r" may be the first half of a "\r\n" split across chunks
+    with open(os.path.join(root, ref["path"]), "rb") as f:
+        f.seek(ref["offset"])
+        left = ref["length"]
+        while left > 0:
+            chunk = f.read(min(chunk_size, left))
+            if not chunk:
+                break
+            left -= len(chunk)
+            text = pending + decoder.decode(chunk)
+            pending = "\r" if text.endswith("\r") else ""
+            text = text[:-1] if pending else text
+            if text:
+                yield text.replace("\r\n", "\n").replace("\r", "\n")
+        text = (pending + decoder.decode(b"", final=True)).replace("\r\n", "\n").replace("\r", "\n")
+        if text:
+            yield text
+
+
+def extract_specs(file_path, file_type, encodings: EncodingSelector = "utf-8", stream: bool = False):
+    """Spec for one upload.
+
+    With ``stream`` the file is never read whole: the encoding is detected in
+    one pass, text specs are parsed line by line, and raw/content fields are
+    replaced by ``raw_ref``/``content_ref`` (see ``content_ref``).
+    """
+    if stream:
+        encoding = detect_encoding(file_path, encodings)
+        ref = content_ref(file_path, encoding)
+        if file_type == "text":
+            spec = extract_from_lines(iter_lines(file_path, encoding))
+            spec["raw_ref"] = ref
+            return spec
+        if file_type == "python":
+            return {"type": "code", "language": "python", "content_ref": ref}
+        elif file_type == "html":
+            return {"type": "template", "language": "html", "content_ref": ref}
+        return {"type": "unknown", "content_ref": ref}
+
     content = _read_file_with_encodings(file_path, encodings)
 
     if file_type == "text":
@@ -39,8 +156,8 @@ def extract_specs(file_path, file_type, encodings: EncodingSelector = "utf-8"):
     else:
         return {"type": "unknown", "content": content}
 
-def extract_from_text(text):
-    lines = text.splitlines()
+def extract_from_lines(lines: Iterable[str]):
+    """Module / pairs / intents from an iterable of lines (no ``raw``)."""
     module = None
     pairs = []
     intents = []
@@ -64,5 +181,9 @@ def extract_from_text(text):
         "module": module,
         "pairs": pairs,
         "intents": intents,
-        "raw": text
     }
+
+def extract_from_text(text):
+    spec = extract_from_lines(text.splitlines())
+    spec["raw"] = text
+    return spec
@@ -28,15 +28,22 @@ except ImportError:
     get_gate_line_info = None
 
 
-def _cmd_build(_args: argparse.Namespace) -> None:
+def _cmd_build(args: argparse.Namespace) -> None:
     """Run the universe builder on the current uploads directory."""
     if run_builder is None:
         print("Error: builder_engine module not available.", file=sys.stderr)
         sys.exit(1)
     
     try:
-        run_builder()
+        run_builder(incremental=not args.full)
         print("Universe builder completed successfully.")
+        if args.watch:
+            from build_watcher import watch
+            print("Watching uploads/ for changes (Ctrl+C to stop)...")
+            try:
+                watch()
+            except KeyboardInterrupt:
+                pass
     except Exception as e:
         print(f"Error running universe builder: {e}", file=sys.stderr)
         sys.exit(1)
@@ -153,7 +160,9 @@ def build_parser() -> argparse.ArgumentParser:
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  %(prog)s build                    # Run universe builder
+  %(prog)s build                    # Run universe builder (changed uploads only)
+  %(prog)s build --full             # Rebuild everything
+  %(prog)s build --watch            # Rebuild whenever uploads/ changes
   %(prog)s oracle "Psalm 23:1;"     # Decode punctuation
   %(prog)s oracle "22.3"            # Decode gate.line
   %(prog)s oracle "22.3" --json     # JSON output
@@ -173,6 +182,16 @@ Examples:
         "build", 
         help="Run the universe builder on the uploads directory"
     )
+    build.add_argument(
+        "--full",
+        action="store_true",
+        help="Rebuild every upload instead of only the ones that changed"
+    )
+    build.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and rebuild (incrementally) whenever uploads/ changes"
+    )
     build.set_defaults(func=_cmd_build)
 
     # Oracle command